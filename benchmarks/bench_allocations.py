@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals,
+)
+from builtins import *                  # noqa
+from future.builtins.disabled import *  # noqa
+
+import gc
+import tracemalloc
+
+# usage: PYTHONPATH=. python benchmarks/bench_allocations.py
+#
+# Python 3.4+. Per call:
+# 1. peak: bytes allocated at the high-water mark of the call, traced from
+#    the start of the call, i.e. the transient allocations.
+# 2. retained: bytes and blocks still allocated by magic_constraints after
+#    RETAINED_CALLS calls, i.e. leaks. Should be 0.
+#
+# Allocations served by the free lists of CPython (tuples, frames, ...) are
+# not traced.
+
+from magic_constraints import (
+    function_constraints,
+    method_constraints,
+    class_initialization_constraints,
+    Parameter,
+    ReturnType,
+    MagicError,
+    Sequence, Mapping, Iterator, Optional,
+)
+
+REPEAT = 21
+RETAINED_CALLS = 1000
+VALUES = list(range(1000))
+MAPPING = dict((str(i), i) for i in range(1000))
+
+
+@function_constraints(int, float, return_type=float)
+def positional(a, b=1.0):
+    return b
+
+
+@function_constraints(
+    Parameter('a', int),
+    Parameter('b', float, default=1.0),
+    ReturnType(float),
+)
+def compound(args):
+    return args.b
+
+
+def inspection(a, b=1.0):
+    return b
+
+
+# annotations, without the Python 3 syntax.
+inspection.__annotations__ = {'a': int, 'b': float, 'return': float}
+inspection = function_constraints(inspection)
+
+
+@function_constraints(Ellipsis, return_type=float)
+def return_only(a, b=1.0):
+    return b
+
+
+@function_constraints(Iterator[int])
+def deferred(iterator):
+    return iterator
+
+
+class Example(object):
+
+    @method_constraints(int, float, return_type=float)
+    def method(self, a, b=1.0):
+        return b
+
+
+@class_initialization_constraints
+class Initialized(object):
+
+    INIT_PARAMETERS = [
+        Parameter('a', int),
+        Parameter('b', float, default=1.0),
+    ]
+
+
+def failing(function, *args):
+
+    def call():
+        try:
+            function(*args)
+        except MagicError:
+            pass
+
+    return call
+
+
+EXAMPLE = Example()
+EMPTY = ()
+
+# (name, call).
+CASES = [
+    ('positional', lambda: positional(1, 1.0)),
+    ('positional/keyword', lambda: positional(1, b=1.0)),
+    ('positional/default', lambda: positional(1)),
+    ('positional/fail', failing(positional, 1.0, 1.0)),
+    ('compound', lambda: compound(1, 1.0)),
+    ('inspection', lambda: inspection(1, 1.0)),
+    ('return_only', lambda: return_only(1, 1.0)),
+    ('method', lambda: EXAMPLE.method(1, 1.0)),
+    ('class_initialization', lambda: Initialized(1, 1.0)),
+    ('deferred', lambda: deferred(iter(EMPTY))),
+    ('isinstance/Sequence[int]/1000', lambda: isinstance(
+        VALUES, Sequence[int],
+    )),
+    ('isinstance/Mapping[str, int]/1000', lambda: isinstance(
+        MAPPING, Mapping[str, int],
+    )),
+    ('isinstance/Optional[int]', lambda: isinstance(None, Optional[int])),
+]
+
+
+def peak_bytes(call):
+    # median of REPEAT calls.
+    peaks = []
+    for _ in range(REPEAT):
+        tracemalloc.start()
+        call()
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return sorted(peaks)[REPEAT // 2]
+
+
+def retained(call):
+    only_magic_constraints = [
+        tracemalloc.Filter(True, '*magic_constraints*'),
+    ]
+
+    # a full collection also clears the free lists, which hold blocks
+    # allocated while traced.
+    tracemalloc.start()
+    gc.collect()
+    before = tracemalloc.take_snapshot().filter_traces(only_magic_constraints)
+    for _ in range(RETAINED_CALLS):
+        call()
+    gc.collect()
+    after = tracemalloc.take_snapshot().filter_traces(only_magic_constraints)
+    tracemalloc.stop()
+
+    size = blocks = 0
+    for stat in after.compare_to(before, 'filename'):
+        size += stat.size_diff
+        blocks += stat.count_diff
+    return size, blocks
+
+
+def main():
+    row = '{0:<40} {1:>12} {2:>16} {3:>16}'
+    print(row.format(
+        'case', 'peak bytes',
+        'retained bytes', 'retained blocks',
+    ))
+
+    for name, call in CASES:
+        # warm up the caches.
+        call()
+        call()
+        size, blocks = retained(call)
+        print(row.format(name, peak_bytes(call), size, blocks))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals,
+)
+from builtins import *                  # noqa
+from future.builtins.disabled import *  # noqa
+
+import timeit
+
+# usage: PYTHONPATH=. python benchmarks/bench_compile.py
+
+from magic_constraints import (
+    compile_type,
+    Sequence, Mapping, Optional, Union,
+)
+from magic_constraints.types import BasicMetaMagicType
+
+
+# (name, type, value).
+CASES = [
+    (
+        'Sequence[int]',
+        Sequence[int],
+        list(range(1000)),
+    ),
+    (
+        'Sequence[Sequence[int]]',
+        Sequence[Sequence[int]],
+        [list(range(10)) for _ in range(100)],
+    ),
+    (
+        'Mapping[str, Sequence[int]]',
+        Mapping[str, Sequence[int]],
+        dict((str(i), list(range(10))) for i in range(100)),
+    ),
+    (
+        'Sequence[Mapping[str, Optional[int]]]',
+        Sequence[Mapping[str, Optional[int]]],
+        [{'a': 1, 'b': None, 'c': 3} for _ in range(300)],
+    ),
+    (
+        'Sequence[Union[int, Sequence[float]]]',
+        Sequence[Union[int, Sequence[float]]],
+        [1, [1.0, 2.0]] * 300,
+    ),
+]
+
+
+def magic_types_of(type_):
+    if not isinstance(type_, BasicMetaMagicType):
+        return
+    yield type_
+
+    partial_cls = type_.partial_cls
+    if partial_cls is None:
+        return
+    if not isinstance(partial_cls, tuple):
+        partial_cls = (partial_cls,)
+    for T in partial_cls:
+        for magic_type in magic_types_of(T):
+            yield magic_type
+
+
+def interpret(type_):
+    # route isinstance through the per-level interpreter (check_instance),
+    # which is how every level was checked before compilation.
+    for magic_type in magic_types_of(type_):
+        magic_type.checker_cache = magic_type.check_instance
+
+
+def restore(type_):
+    for magic_type in magic_types_of(type_):
+        magic_type.checker_cache = None
+
+
+def best_of(function, number, repeat=5):
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number
+
+
+def main():
+    row = '{0:<40} {1:>14} {2:>14} {3:>9}'
+    print(row.format('type', 'interpreted', 'compiled', 'speedup'))
+
+    for name, type_, value in CASES:
+        checker = compile_type(type_)
+        assert checker(value)
+
+        interpret(type_)
+        interpreted = best_of(lambda: isinstance(value, type_), 100)
+        restore(type_)
+        compiled = best_of(lambda: checker(value), 100)
+
+        print(row.format(
+            name,
+            '{0:.1f}us'.format(interpreted * 1e6),
+            '{0:.1f}us'.format(compiled * 1e6),
+            '{0:.1f}x'.format(interpreted / compiled),
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals,
+)
+from builtins import *                  # noqa
+from future.builtins.disabled import *  # noqa
+
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import compileall
+import subprocess
+
+# usage: PYTHONPATH=. python benchmarks/bench_decoration.py
+#            [--sizes 1000,10000,50000] [--lazy] [--output results.json]
+#
+# Python 3. For each N, generates a package of synthetic modules holding N
+# decorated functions and N classes decorated by
+# class_initialization_constraints, spread over modules of
+# FUNCTIONS_PER_MODULE, plus the same package without the decorators.
+# Both are imported in fresh processes from precompiled bytecode. The
+# difference is the cost of the decoration. With --lazy, the decorators
+# return trampolines, the cost is deferred to the first calls.
+
+from magic_constraints.metadata import VERSION
+
+SIZES = [1000, 10000, 50000]
+FUNCTIONS_PER_MODULE = 1000
+# module-level classes per module, element types of the specializations.
+RECORDS_PER_MODULE = 20
+
+HEADER = '''\
+from magic_constraints import *
+
+
+def function_constraints_off(*args, **kwargs):
+    return lambda function: function
+
+
+def class_initialization_constraints_off(cls):
+    return cls
+'''
+
+RECORD_TEMPLATE = '''
+class Record{0}(object):
+    pass
+'''
+
+# decorator modes in turn, index and record are substituted.
+FUNCTION_TEMPLATES = [
+    # inspection.
+    '''
+@function_constraints
+def function{index}(a: int, b: Sequence[Record{record}],
+                    c: Optional[float] = None) -> Mapping[str, Record{record}]:
+    return {{}}
+''',
+    # positional.
+    '''
+@function_constraints(
+    int, Mapping[str, Sequence[Record{record}]],
+    return_type=Optional[Record{record}],
+)
+def function{index}(a, b):
+    return None
+''',
+    # compound.
+    '''
+@function_constraints(
+    Parameter('a', int),
+    Parameter('b', Sequence[Union[int, Record{record}]], default=()),
+    ReturnType(Iterator[Record{record}]),
+)
+def function{index}(args):
+    return iter(args.b)
+''',
+]
+
+CLASS_TEMPLATE = '''
+@class_initialization_constraints
+class Initialized{index}(object):
+
+    INIT_PARAMETERS = [
+        Parameter('a', int),
+        Parameter('b', Set[Record{record}], default=frozenset()),
+    ]
+'''
+
+# the undecorated twins keep the annotations, default values and the
+# arguments of the decorators.
+PLAIN_REPLACEMENTS = [
+    ('@function_constraints\n', ''),
+    ('@function_constraints(', '@function_constraints_off('),
+    ('@class_initialization_constraints\n',
+     '@class_initialization_constraints_off\n'),
+]
+
+# runs in the fresh process, prints JSON.
+PROBE = '''\
+import sys, time, json, resource
+sys.path.insert(0, sys.argv[1])
+
+def maxrss():
+    # kilobytes on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+started = time.perf_counter()
+import magic_constraints
+library = time.perf_counter()
+rss = maxrss()
+import {package}
+finished = time.perf_counter()
+print(json.dumps({{
+    'library_seconds': library - started,
+    'import_seconds': finished - library,
+    'rss_bytes': maxrss() - rss,
+}}))
+'''
+
+
+def module_source(module_index, functions, decorated):
+    lines = [HEADER]
+    for record in range(RECORDS_PER_MODULE):
+        lines.append(RECORD_TEMPLATE.format(record))
+
+    for i in range(functions):
+        index = module_index * FUNCTIONS_PER_MODULE + i
+        template = FUNCTION_TEMPLATES[index % len(FUNCTION_TEMPLATES)]
+        lines.append(template.format(
+            index=index, record=index % RECORDS_PER_MODULE,
+        ))
+        lines.append(CLASS_TEMPLATE.format(
+            index=index, record=index % RECORDS_PER_MODULE,
+        ))
+
+    source = ''.join(lines)
+    if not decorated:
+        for old, new in PLAIN_REPLACEMENTS:
+            source = source.replace(old, new)
+    return source
+
+
+def write_package(root, package, size, decorated):
+    directory = os.path.join(root, package)
+    os.mkdir(directory)
+
+    # the last module holds the remainder.
+    modules = -(-size // FUNCTIONS_PER_MODULE)
+    init_lines = []
+    for module_index in range(modules):
+        functions = min(
+            FUNCTIONS_PER_MODULE, size - module_index * FUNCTIONS_PER_MODULE,
+        )
+        name = 'module{0}'.format(module_index)
+        init_lines.append('from . import {0}\n'.format(name))
+        with io.open(
+            os.path.join(directory, name + '.py'), 'w', encoding='utf-8',
+        ) as fout:
+            fout.write(module_source(module_index, functions, decorated))
+
+    with io.open(
+        os.path.join(directory, '__init__.py'), 'w', encoding='utf-8',
+    ) as fout:
+        fout.write(''.join(init_lines))
+
+    # import from bytecode, compiling is not the concern here.
+    compileall.compile_dir(directory, quiet=1)
+    return modules
+
+
+def probe(root, package, lazy):
+    environ = dict(os.environ)
+    environ['MAGIC_CONSTRAINTS_LAZY'] = '1' if lazy else '0'
+    output = subprocess.check_output(
+        [sys.executable, '-c', PROBE.format(package=package), root],
+        env=environ,
+    )
+    return json.loads(output.decode('utf-8'))
+
+
+def measure(size, repeat, lazy):
+    root = tempfile.mkdtemp(prefix='magic_constraints_bench_')
+    try:
+        modules = write_package(root, 'decorated', size, True)
+        write_package(root, 'plain', size, False)
+
+        decorated = min(
+            (probe(root, 'decorated', lazy) for _ in range(repeat)),
+            key=lambda result: result['import_seconds'],
+        )
+        plain = min(
+            (probe(root, 'plain', lazy) for _ in range(repeat)),
+            key=lambda result: result['import_seconds'],
+        )
+    finally:
+        shutil.rmtree(root)
+
+    decorations = 2 * size
+    decoration_seconds = decorated['import_seconds'] - plain['import_seconds']
+    return {
+        'functions': size,
+        'classes': size,
+        'modules': modules,
+        'library_seconds': decorated['library_seconds'],
+        'import_seconds': decorated['import_seconds'],
+        'plain_import_seconds': plain['import_seconds'],
+        'decoration_seconds': decoration_seconds,
+        'seconds_per_decoration': decoration_seconds / decorations,
+        'rss_bytes': decorated['rss_bytes'],
+        'plain_rss_bytes': plain['rss_bytes'],
+        'rss_bytes_per_decoration':
+            (decorated['rss_bytes'] - plain['rss_bytes']) / decorations,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--sizes', default=','.join(map(str, SIZES)),
+        help='comma separated numbers of functions (and classes).',
+    )
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--lazy', action='store_true')
+    parser.add_argument('--output')
+    args = parser.parse_args(argv)
+    sizes = list(map(int, args.sizes.split(',')))
+    if min(sizes) < 1:
+        parser.error('sizes must be positive.')
+
+    row = '{0:>8} {1:>12} {2:>12} {3:>16} {4:>12} {5:>14}'
+    print(row.format(
+        'N', 'import', 'undecorated', 'per decoration', 'rss', 'rss per deco',
+    ))
+
+    results = {}
+    for size in sizes:
+        result = results[str(size)] = measure(size, args.repeat, args.lazy)
+        print(row.format(
+            size,
+            '{0:.2f}s'.format(result['import_seconds']),
+            '{0:.2f}s'.format(result['plain_import_seconds']),
+            '{0:.1f}us'.format(result['seconds_per_decoration'] * 1e6),
+            '{0:.1f}MB'.format(result['rss_bytes'] / 2 ** 20),
+            '{0:.0f}B'.format(result['rss_bytes_per_decoration']),
+        ))
+
+    if args.output:
+        with io.open(args.output, 'w', encoding='utf-8') as fout:
+            fout.write(json.dumps({
+                'meta': {
+                    'magic_constraints': VERSION,
+                    'python': platform.python_version(),
+                    'implementation': platform.python_implementation(),
+                    'platform': platform.platform(),
+                    'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                    'lazy': args.lazy,
+                },
+                'results': results,
+            }, indent=2, sort_keys=True))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals,
+)
+from builtins import *                  # noqa
+from future.builtins.disabled import *  # noqa
+
+import timeit
+
+# usage: PYTHONPATH=. python benchmarks/bench_homogeneous.py
+
+from magic_constraints import (
+    compile_type,
+    Sequence, Set, Mapping,
+)
+from magic_constraints.compiler import lower_element_loop
+
+SIZE = 10 ** 6
+
+
+def loop_checker(type_):
+    # the per-element isinstance loop, used before the fast path.
+    if type_.main_cls is Mapping.main_cls:
+        key_loop = lower_element_loop((type_.partial_cls[0],))
+        val_loop = lower_element_loop((type_.partial_cls[1],))
+
+        def check_loop_items(mapping):
+            return key_loop(mapping.keys()) and val_loop(mapping.values())
+
+        check_content = check_loop_items
+    else:
+        check_content = lower_element_loop((type_.partial_cls,))
+
+    def check(instance):
+        return isinstance(instance, type_.main_cls) and check_content(instance)
+
+    return check
+
+
+# (name, type, value).
+CASES = [
+    ('Sequence[int]', Sequence[int], list(range(SIZE))),
+    ('Sequence[float]', Sequence[float], [float(i) for i in range(SIZE)]),
+    ('Set[str]', Set[str], set(str(i) for i in range(SIZE))),
+    (
+        'Mapping[str, float]',
+        Mapping[str, float],
+        dict((str(i), float(i)) for i in range(SIZE)),
+    ),
+]
+
+
+def best_of(function, number=3, repeat=5):
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number
+
+
+def main():
+    row = '{0:<24} {1:>12} {2:>12} {3:>9}'
+    print(row.format('type (10^6 elements)', 'loop', 'type-set', 'speedup'))
+
+    for name, type_, value in CASES:
+        loop = loop_checker(type_)
+        fast = compile_type(type_)
+        assert loop(value) and fast(value)
+
+        loop_time = best_of(lambda: loop(value))
+        fast_time = best_of(lambda: fast(value))
+
+        print(row.format(
+            name,
+            '{0:.1f}ms'.format(loop_time * 1e3),
+            '{0:.1f}ms'.format(fast_time * 1e3),
+            '{0:.2f}x'.format(loop_time / fast_time),
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals,
+)
+from builtins import *                  # noqa
+from future.builtins.disabled import *  # noqa
+
+import timeit
+
+# usage: PYTHONPATH=. python benchmarks/bench_levels.py
+
+from magic_constraints import (
+    function_constraints,
+    set_checking_level,
+    reset_checking_levels,
+    Sequence,
+)
+
+LEVELS = ['off', 'boundary', 'sampled', 'full']
+VALUES = list(range(10000))
+
+
+def mean(values):
+    return values[0]
+
+
+def decorate(level):
+    set_checking_level(level, __name__)
+    try:
+        return function_constraints(Sequence[int])(mean)
+    finally:
+        reset_checking_levels()
+
+
+def best_of(function, number=1000, repeat=5):
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number
+
+
+def main():
+    # level off returns the function itself, no wrapper frame at all.
+    assert decorate('off') is mean
+
+    row = '{0:<12} {1:>12} {2:>12}'
+    print(row.format('level', 'per call', 'overhead'))
+
+    baseline = best_of(lambda: mean(VALUES))
+    print(row.format('undecorated', '{0:.2f}us'.format(baseline * 1e6), '-'))
+
+    for level in LEVELS:
+        function = decorate(level)
+        elapsed = best_of(lambda: function(VALUES))
+        print(row.format(
+            level,
+            '{0:.2f}us'.format(elapsed * 1e6),
+            '{0:+.2f}us'.format((elapsed - baseline) * 1e6),
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals,
+)
+from builtins import *                  # noqa
+from future.builtins.disabled import *  # noqa
+
+import io
+import sys
+import json
+import time
+import timeit
+import argparse
+import platform
+
+# usage: PYTHONPATH=. python benchmarks/bench_suite.py [--quick]
+#            [--output results.json] [--compare baseline.json]
+#
+# Seconds per operation of every case, written as JSON so that releases
+# could be compared with --compare.
+
+from magic_constraints import (
+    function_constraints,
+    method_constraints,
+    class_initialization_constraints,
+    Parameter,
+    ReturnType,
+    MagicError,
+
+    Sequence, MutableSequence, ImmutableSequence,
+    Set, MutableSet, ImmutableSet,
+    Mapping, MutableMapping, ImmutableMapping,
+    Iterator, Iterable,
+    Callable,
+    Any, Union, Optional,
+    First,
+)
+from magic_constraints.metadata import VERSION
+
+SIZES = [10, 1000, 100000]
+QUICK_SIZES = [10, 1000]
+# elements in total of the nested containers.
+NESTED_SIZE = 4096
+DEPTHS = [1, 2, 3, 4]
+
+
+def increment(a):
+    return a + 1
+
+
+def isinstance_cases(size):
+    ints = list(range(size))
+    mapping = dict((str(i), i) for i in range(size))
+    mixed = [i if i % 2 else None for i in range(size)]
+
+    # (name, type, value), repr of immutable types is ambiguous.
+    return [
+        ('Sequence[int]', Sequence[int], ints),
+        ('MutableSequence[int]', MutableSequence[int], ints),
+        ('ImmutableSequence[int]', ImmutableSequence[int], tuple(ints)),
+        ('Set[int]', Set[int], set(ints)),
+        ('MutableSet[int]', MutableSet[int], set(ints)),
+        ('ImmutableSet[int]', ImmutableSet[int], frozenset(ints)),
+        ('Mapping[str, int]', Mapping[str, int], mapping),
+        ('MutableMapping[str, int]', MutableMapping[str, int], mapping),
+        (
+            'ImmutableMapping[str, int]',
+            ImmutableMapping[str, int],
+            ImmutableMappingValue(mapping),
+        ),
+        (
+            'Sequence[Union[int, float]]',
+            Sequence[Union[int, float]],
+            ints,
+        ),
+        ('Sequence[Optional[int]]', Sequence[Optional[int]], mixed),
+        ('Sequence[Any]', Sequence[Any], ints),
+        (
+            'Sequence[int].sampled(First(10))',
+            Sequence[int].sampled(First(10)),
+            ints,
+        ),
+    ]
+
+
+def constant_cases():
+    return [
+        (Iterator, iter([])),
+        (Iterable, []),
+        (Callable, increment),
+        (Union[int, float], 1.0),
+        (Optional[int], None),
+        (Any, 1),
+    ]
+
+
+class ImmutableMappingValue(Mapping.main_cls):
+
+    def __init__(self, mapping):
+        self.mapping = mapping
+
+    def __getitem__(self, key):
+        return self.mapping[key]
+
+    def __iter__(self):
+        return iter(self.mapping)
+
+    def __len__(self):
+        return len(self.mapping)
+
+
+def nested(depth):
+    # Sequence[...Sequence[int]] of depth, NESTED_SIZE ints in total.
+    type_ = int
+    for _ in range(depth):
+        type_ = Sequence[type_]
+
+    width = int(round(NESTED_SIZE ** (1.0 / depth)))
+    value = list(range(width))
+    for _ in range(depth - 1):
+        value = [value] * width
+    return type_, value
+
+
+def decorator_cases():
+
+    @function_constraints(int, float, return_type=float)
+    def positional(a, b):
+        return b
+
+    @function_constraints(
+        Parameter('a', int),
+        Parameter('b', float),
+        ReturnType(float),
+    )
+    def compound(args):
+        return args.b
+
+    def inspection(a, b):
+        return b
+    # annotations, without the Python 3 syntax.
+    inspection.__annotations__ = {'a': int, 'b': float, 'return': float}
+    inspection = function_constraints(inspection)
+
+    @function_constraints(Ellipsis, return_type=float)
+    def return_only(a, b):
+        return b
+
+    class Example(object):
+
+        @method_constraints(int, float, return_type=float)
+        def method(self, a, b):
+            return b
+
+    @class_initialization_constraints
+    class Initialized(object):
+
+        INIT_PARAMETERS = [
+            Parameter('a', int),
+            Parameter('b', float),
+        ]
+
+    example = Example()
+    return [
+        ('positional', positional),
+        ('compound', compound),
+        ('inspection', inspection),
+        ('return_only', return_only),
+        ('method', example.method),
+        ('class_initialization', Initialized),
+    ]
+
+
+def expect_failure(function, *args):
+
+    def call():
+        try:
+            function(*args)
+        except MagicError:
+            return
+        raise AssertionError('should fail.')
+
+    return call
+
+
+def collect_cases(quick):
+    # name -> callable, measured per call.
+    cases = []
+
+    for size in (QUICK_SIZES if quick else SIZES):
+        for name, type_, value in isinstance_cases(size):
+            assert isinstance(value, type_), name
+            cases.append((
+                'isinstance/{0}/{1}'.format(name, size),
+                lambda type_=type_, value=value: isinstance(value, type_),
+            ))
+
+    for type_, value in constant_cases():
+        assert isinstance(value, type_), type_
+        cases.append((
+            'isinstance/{0!r}'.format(type_),
+            lambda type_=type_, value=value: isinstance(value, type_),
+        ))
+
+    for depth in DEPTHS:
+        type_, value = nested(depth)
+        assert isinstance(value, type_), type_
+        cases.append((
+            'nested/depth-{0}/{1}'.format(depth, NESTED_SIZE),
+            lambda type_=type_, value=value: isinstance(value, type_),
+        ))
+
+    cases.extend([
+        ('specialize/Sequence[int]', lambda: Sequence[int]),
+        (
+            'specialize/Mapping[str, Sequence[int]]',
+            lambda: Mapping[str, Sequence[int]],
+        ),
+        (
+            'specialize/Sequence[int].sampled(First(10))',
+            lambda: Sequence[int].sampled(First(10)),
+        ),
+    ])
+
+    for name, function in decorator_cases():
+        cases.append((
+            'decorator/{0}/pass'.format(name),
+            lambda function=function: function(1, 1.0),
+        ))
+        if name == 'return_only':
+            failing = expect_failure(function, 1, 1)
+        else:
+            failing = expect_failure(function, 1.0, 1.0)
+        cases.append(('decorator/{0}/fail'.format(name), failing))
+
+    return cases
+
+
+def measure(function, min_time, repeat):
+    # the number of calls grows until a run takes min_time.
+    number = 1
+    while True:
+        elapsed = timeit.timeit(function, number=number)
+        if elapsed >= min_time:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    best = min(timeit.repeat(function, number=number, repeat=repeat))
+    return best / number, number
+
+
+def run(quick):
+    min_time = 0.02 if quick else 0.2
+    repeat = 3 if quick else 5
+
+    results = {}
+    for name, function in collect_cases(quick):
+        seconds, number = measure(function, min_time, repeat)
+        results[name] = {'seconds': seconds, 'number': number}
+        print('{0:<64} {1:>12}'.format(name, format_seconds(seconds)))
+    return {
+        'meta': {
+            'magic_constraints': VERSION,
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'quick': quick,
+        },
+        'results': results,
+    }
+
+
+def format_seconds(seconds):
+    for unit, scale in [('s', 1), ('ms', 1e-3), ('us', 1e-6)]:
+        if seconds >= scale:
+            return '{0:.2f}{1}'.format(seconds / scale, unit)
+    return '{0:.0f}ns'.format(seconds / 1e-9)
+
+
+def compare(baseline, current):
+    row = '{0:<64} {1:>12} {2:>12} {3:>8}'
+    print(row.format('case', 'baseline', 'current', 'ratio'))
+    for name, result in sorted(current['results'].items()):
+        base = baseline['results'].get(name)
+        if base is None:
+            continue
+        print(row.format(
+            name,
+            format_seconds(base['seconds']),
+            format_seconds(result['seconds']),
+            '{0:.2f}x'.format(result['seconds'] / base['seconds']),
+        ))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--quick', action='store_true')
+    parser.add_argument('--output')
+    parser.add_argument('--compare')
+    args = parser.parse_args(argv)
+
+    current = run(args.quick)
+
+    if args.output:
+        with io.open(args.output, 'w', encoding='utf-8') as fout:
+            fout.write(json.dumps(current, indent=2, sort_keys=True))
+
+    if args.compare:
+        with io.open(args.compare, encoding='utf-8') as fin:
+            compare(json.load(fin), current)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
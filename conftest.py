@@ -4,5 +4,12 @@ collect_ignore = []
 if sys.version_info.major < 3:
     collect_ignore.append("tests/test_py3_annotation.py")
     collect_ignore.append("tests/test_py3_constraint.py")
+    collect_ignore.append("tests/test_py3_signature.py")
     collect_ignore.append("tests/test_py3_types.py")
     collect_ignore.append("tests/test_py3_usage.py")
+# async def, Python 3.5+.
+if sys.version_info < (3, 5):
+    collect_ignore.append("tests/test_py3_async.py")
+# tracemalloc, Python 3.4+.
+if sys.version_info < (3, 4):
+    collect_ignore.append("tests/test_py3_allocations.py")
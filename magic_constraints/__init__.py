@@ -8,6 +8,8 @@ from __future__ import (
 from builtins import *                  # noqa
 from future.builtins.disabled import *  # noqa
 
+import sys
+
 from magic_constraints.exception import (
     MagicError,
     MagicSyntaxError,
@@ -27,6 +29,54 @@ from magic_constraints.decorator import (
     class_initialization_constraints,
 )
 
+from magic_constraints.compiler import (
+    compile_type,
+)
+
+from magic_constraints.sampling import (
+    Full,
+    First,
+    Random,
+    Stride,
+
+    get_default_sampling_policy,
+    set_default_sampling_policy,
+)
+
+from magic_constraints.levels import (
+    set_checking_level,
+    get_checking_level,
+    reset_checking_levels,
+)
+
+from magic_constraints.memo import (
+    get_memo_stats,
+    set_memo_max_size,
+    clear_memo,
+)
+
+from magic_constraints.metrics import (
+    set_metrics_enabled,
+    get_metrics_snapshot,
+    reset_metrics,
+    write_prometheus_metrics,
+)
+
+from magic_constraints.batch import (
+    check_batch,
+    map_checked,
+)
+
+from magic_constraints.trampoline import (
+    set_lazy_decoration,
+    warmup,
+)
+
+from magic_constraints.parallel import (
+    get_parallel_failure,
+    shutdown_parallel_executors,
+)
+
 from magic_constraints.types import (
     Sequence,
     MutableSequence,
@@ -51,6 +101,9 @@ from magic_constraints.types import (
     NoneType,
 )
 
+# not in __all__, shadowing the builtin compile on star import is evil.
+compile = compile_type
+
 __all__ = [
     'MagicError',
     'MagicSyntaxError',
@@ -65,6 +118,38 @@ __all__ = [
     'method_constraints',
     'class_initialization_constraints',
 
+    'compile_type',
+
+    'Full',
+    'First',
+    'Random',
+    'Stride',
+
+    'get_default_sampling_policy',
+    'set_default_sampling_policy',
+
+    'set_checking_level',
+    'get_checking_level',
+    'reset_checking_levels',
+
+    'get_memo_stats',
+    'set_memo_max_size',
+    'clear_memo',
+
+    'set_metrics_enabled',
+    'get_metrics_snapshot',
+    'reset_metrics',
+    'write_prometheus_metrics',
+
+    'check_batch',
+    'map_checked',
+
+    'set_lazy_decoration',
+    'warmup',
+
+    'get_parallel_failure',
+    'shutdown_parallel_executors',
+
     'Sequence',
     'MutableSequence',
     'ImmutableSequence',
@@ -87,3 +172,13 @@ __all__ = [
     'Optional',
     'NoneType',
 ]
+
+if sys.version_info >= (3, 5):
+    from magic_constraints.async_types import (
+        AsyncIterator,
+        AsyncIterable,
+    )
+    __all__ += [
+        'AsyncIterator',
+        'AsyncIterable',
+    ]
@@ -5,7 +5,7 @@ from __future__ import (
 from builtins import *                  # noqa
 from future.builtins.disabled import *  # noqa
 
-from magic_constraints.exception import MagicSyntaxError, MagicTypeError
+from magic_constraints.exception import MagicSyntaxError
 
 
 def transform_to_slots(constraints_package, *args, **kwargs):
@@ -73,29 +73,3 @@ def transform_to_slots(constraints_package, *args, **kwargs):
         )
 
     return slots
-
-
-def check_and_bind_arguments(parameters, slots, bind_callback):
-
-    plen = len(parameters)
-
-    for i in range(plen):
-        arg = slots[i]
-        parameter = parameters[i]
-
-        wrapper = parameter.wrapper_for_deferred_checking()
-
-        # defer checking by wrapping the element of slot.
-        if wrapper:
-            slots[i] = wrapper(arg)
-
-        # check now.
-        elif not parameter.check_instance(arg):
-            raise MagicTypeError(
-                'argument unmatched.',
-                parameter=parameter,
-                argument=arg,
-            )
-
-        # bind.
-        bind_callback(parameter.name, arg)
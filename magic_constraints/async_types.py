@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals,
+)
+from builtins import *                  # noqa
+from future.builtins.disabled import *  # noqa
+
+# `async def` and collections.abc.AsyncIterator, Python 3.5+ only.
+import collections.abc as abc
+from collections import deque
+
+from magic_constraints.types import (
+    MagicTypeGenerator,
+    check_type_of_instance,
+    derive_specialization,
+    name_well_known_types,
+)
+from magic_constraints.compiler import (
+    compile_type,
+    lower_container,
+    lower_elements,
+    lower_type,
+)
+from magic_constraints.sampling import raise_on_invalid_count
+from magic_constraints.exception import MagicTypeError, MagicIndexError
+from magic_constraints.utils import (
+    type_object,
+    nontype_object,
+    return_false,
+)
+
+
+def check_getitem_type_decl(cls, type_decl):
+    # 1. [T, ...]
+    if isinstance(type_decl, tuple):
+        for T in type_decl:
+            if nontype_object(T):
+                return False
+        return True
+
+    # 2. [T]
+    return type_object(type_decl)
+
+
+def check_unspecialized_instance(cls, instance):
+    if cls.partial_cls or not check_type_of_instance(cls, instance):
+        return False
+    else:
+        # is AsyncIterator and not AsyncIterator[...].
+        return True
+
+
+def lower_unspecialized(cls, sampling_policy=None):
+    if cls.partial_cls:
+        return return_false
+    else:
+        return lower_container(cls, None)
+
+
+def batched(cls, batch_size):
+    # elements are read ahead and checked in chunks of batch_size.
+    raise_on_invalid_count('batch_size', batch_size, 1)
+    return derive_specialization(cls, batch_size=batch_size)
+
+
+class AsyncIteratorGenerator(MagicTypeGenerator):
+
+    _class_batch_size = None
+
+    _metaclass_check_getitem_type_decl = check_getitem_type_decl
+    _metaclass_check_instance = check_unspecialized_instance
+    _metaclass_lower = lower_unspecialized
+    _metaclass_batched = batched
+
+    def _class___init__(self, async_iterator):
+        if self.partial_cls is None:
+            raise MagicTypeError(
+                'AsyncIterator should be specified.'
+            )
+
+        if not isinstance(async_iterator, self.main_cls):
+            raise MagicTypeError(
+                'require AsyncIterator.',
+                async_iterator=async_iterator,
+            )
+
+        if isinstance(self.partial_cls, tuple):
+            # AsyncIterator[T, ...], check the number of elements and the
+            # type of each element.
+            self.checkers = tuple(map(compile_type, self.partial_cls))
+            self.check_chunk = None
+        else:
+            # AsyncIterator[T], no limitation on the length.
+            self.checkers = None
+            self.check_element = compile_type(self.partial_cls)
+            self.check_chunk = lower_elements(lower_type(self.partial_cls))
+
+        self.async_iterator = async_iterator
+        self.position = 0
+        self.buffer = deque()
+        self.exhausted = False
+
+    def _class_check(self, element):
+        if self.checkers is None:
+            type_ = self.partial_cls
+            passed = self.check_element(element)
+        else:
+            if self.position >= len(self.checkers):
+                raise MagicIndexError(
+                    'iterator contains more elements declared in type.',
+                    type_=self,
+                    last_element=element,
+                )
+            type_ = self.partial_cls[self.position]
+            passed = self.checkers[self.position](element)
+
+        if not passed:
+            raise MagicTypeError(
+                'type unmatched.',
+                element=element,
+                type_=type_,
+            )
+        self.position += 1
+        return element
+
+    def _class_check_stop(self):
+        if self.checkers is not None and self.position != len(self.checkers):
+            raise MagicIndexError(
+                'iterator contains less elements declared in type.',
+                type_=self,
+            )
+
+    def _class___aiter__(self):
+        return self
+
+    async def _class___anext__(self):
+        if self.buffer:
+            return self.buffer.popleft()
+        if self.exhausted:
+            raise StopAsyncIteration
+
+        if self.batch_size is None:
+            try:
+                element = await self.async_iterator.__anext__()
+            except StopAsyncIteration:
+                self.exhausted = True
+                self.check_stop()
+                raise
+            return self.check(element)
+
+        # read ahead a chunk.
+        chunk = []
+        try:
+            while len(chunk) < self.batch_size:
+                chunk.append(await self.async_iterator.__anext__())
+        except StopAsyncIteration:
+            self.exhausted = True
+
+        if self.check_chunk is not None and self.check_chunk(chunk):
+            self.position += len(chunk)
+        else:
+            # find the element in error.
+            for element in chunk:
+                self.check(element)
+
+        if self.exhausted:
+            self.check_stop()
+        if not chunk:
+            raise StopAsyncIteration
+
+        self.buffer.extend(chunk)
+        return self.buffer.popleft()
+
+
+class AsyncIterableGenerator(MagicTypeGenerator):
+
+    _class_batch_size = None
+
+    _metaclass_check_getitem_type_decl = check_getitem_type_decl
+    _metaclass_check_instance = check_unspecialized_instance
+    _metaclass_lower = lower_unspecialized
+    _metaclass_batched = batched
+
+    def _class___init__(self, async_iterable):
+        if self.partial_cls is None:
+            raise MagicTypeError(
+                'require T on AsyncIterable[T].'
+            )
+
+        if not isinstance(async_iterable, self.main_cls):
+            raise MagicTypeError(
+                'require AsyncIterable.',
+                async_iterable=async_iterable,
+            )
+
+        self.async_iterable = async_iterable
+
+    def _class___aiter__(self):
+        iterator_type = AsyncIterator[self.partial_cls]
+        if self.batch_size is not None:
+            iterator_type = iterator_type.batched(self.batch_size)
+        return iterator_type(self.async_iterable.__aiter__())
+
+
+AsyncIterator = AsyncIteratorGenerator(abc.AsyncIterator)
+AsyncIterable = AsyncIterableGenerator(abc.AsyncIterable)
+
+name_well_known_types(__name__, globals())
@@ -0,0 +1,288 @@
+# -*- coding: utf-8 -*-
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals,
+)
+from builtins import *                  # noqa
+from future.builtins.disabled import *  # noqa
+
+from magic_constraints.exception import MagicTypeError, MagicSyntaxError
+
+from magic_constraints.compiler import lower_elements
+
+from magic_constraints.codegen import (
+    BIND_COMPOUND,
+    generate_attributes_lines,
+    build_function,
+    coroutine_function,
+)
+
+from magic_constraints.utils import CompoundArgument
+
+
+# Batch entry points attached to the decorated functions:
+# 1. wrapper.check_batch(rows), returns the indices of the failing rows.
+# 2. wrapper.map_checked(rows), checks the rows, then calls the undecorated
+#    function on every row and returns the list of results.
+#
+# A row is a tuple of positional arguments, starting with self_or_cls for
+# methods. The rows are checked column by column, every column with a
+# single pass of the element checker, i.e. the homogeneous fast path.
+#
+# Most decorated functions never see a batch, the entry points are built on
+# their first call and reuse the binder of the wrapper.
+#
+# check_batch(function, rows) and map_checked(function, rows) work on any
+# function, including the ones returned unchanged at level off.
+def lower_plan_elements(plan):
+    if plan.classes is not None:
+        classes = plan.classes
+        return lower_elements(
+            classes if isinstance(classes, tuple) else (classes,),
+        )
+    return lower_elements(plan.checker)
+
+
+def lower_column(plan):
+    # returns callable (column, failures) -> None, None if no checking is
+    # needed. Deferred columns return the wrapped values, which replace the
+    # column.
+    if plan.deferred_wrapper:
+        wrap = plan.deferred_wrapper
+
+        # only the top-level checking can fail here.
+        def check_deferred_column(column, failures):
+            wrapped = []
+            for index, value in enumerate(column):
+                try:
+                    wrapped.append(wrap(value))
+                except MagicTypeError:
+                    failures.add(index)
+                    wrapped.append(value)
+            return wrapped
+
+        return check_deferred_column
+
+    if plan.checker is None:
+        return None
+
+    check_elements = lower_plan_elements(plan)
+    checker = plan.checker
+
+    def check_column(column, failures):
+        if check_elements(column):
+            return
+        # locate the failing rows.
+        for index, value in enumerate(column):
+            if not checker(value):
+                failures.add(index)
+
+    return check_column
+
+
+def bind_rows(rows, size, leading_argument, bind):
+    # returns the rows of exactly `size` arguments, and the indices of rows
+    # can not be bound.
+    rows = list(rows)
+    leading_size = size + 1 if leading_argument else size
+    unbound = set()
+
+    if set(map(len, rows)) <= {leading_size}:
+        # 1. common case, the defaults are not involved. C-level pass.
+        return rows, unbound
+
+    # 2. fill the defaults.
+    bound_rows = []
+    for index, row in enumerate(rows):
+        if len(row) == leading_size:
+            bound_rows.append(row)
+            continue
+
+        leading, args = row[:leading_size - size], row[leading_size - size:]
+        try:
+            bound_rows.append(tuple(leading) + bind(args, {}))
+        except (TypeError, MagicSyntaxError):
+            unbound.add(index)
+            bound_rows.append(None)
+    return bound_rows, unbound
+
+
+def generate_compound_caller(function, constraints_package,
+                             leading_argument):
+    parameters = constraints_package.parameters
+    arguments = ['a{0}'.format(i) for i in range(len(parameters))]
+    leading = ['self_or_cls'] if leading_argument else []
+
+    namespace = {
+        'function': function,
+        'CompoundArgument': CompoundArgument,
+    }
+    lines = [
+        'def call_compound({0}):'.format(', '.join(leading + arguments)),
+        '    compound_args = CompoundArgument()',
+    ]
+    lines.extend(generate_attributes_lines(
+        'compound_args', parameters, arguments, namespace,
+    ))
+    lines.append('    return function({0})'.format(
+        ', '.join(leading + ['compound_args']),
+    ))
+    return build_function(
+        'call_compound', lines, namespace, '<magic_constraints batch caller>',
+    )
+
+
+def generate_batch_functions(function, constraints_package,
+                             leading_argument, binding, bind):
+    parameters = constraints_package.parameters
+    size = len(parameters)
+    offset = 1 if leading_argument else 0
+    column_checkers = [
+        (offset + i, lower_column(plan))
+        for i, plan in enumerate(constraints_package.parameter_plans)
+    ]
+    column_checkers = [
+        (position, checker)
+        for position, checker in column_checkers
+        if checker is not None
+    ]
+
+    def check_bound_rows(rows):
+        # the bound rows hold the wrapped values of the deferred columns.
+        bound_rows, failures = bind_rows(rows, size, leading_argument, bind)
+        if not bound_rows:
+            return bound_rows, []
+
+        if failures:
+            checked_rows = [row for row in bound_rows if row is not None]
+            row_indices = [
+                index
+                for index, row in enumerate(bound_rows) if row is not None
+            ]
+        else:
+            checked_rows = bound_rows
+            row_indices = None
+
+        if column_checkers and checked_rows:
+            columns = list(zip(*checked_rows))
+            column_failures = set()
+            wrapped = False
+            for position, check_column in column_checkers:
+                wrapped_column = check_column(
+                    columns[position], column_failures,
+                )
+                if wrapped_column is not None:
+                    columns[position] = wrapped_column
+                    wrapped = True
+
+            if wrapped:
+                checked_rows = list(zip(*columns))
+                if row_indices is None:
+                    bound_rows = checked_rows
+                else:
+                    for index, row in zip(row_indices, checked_rows):
+                        bound_rows[index] = row
+
+            if row_indices is None:
+                failures = column_failures
+            else:
+                failures.update(row_indices[i] for i in column_failures)
+
+        return bound_rows, sorted(failures)
+
+    def check_batch(rows):
+        return check_bound_rows(rows)[1]
+
+    if coroutine_function(function):
+        # the results are coroutines, there's nothing to map.
+        return check_batch, None
+
+    if binding == BIND_COMPOUND:
+        call = generate_compound_caller(
+            function, constraints_package, leading_argument,
+        )
+    else:
+        call = function
+
+    return_type = constraints_package.return_type
+    return_plan = constraints_package.return_plan
+    check_returns = lower_column(return_plan)
+
+    def map_checked(rows):
+        bound_rows, failures = check_bound_rows(rows)
+        if failures:
+            raise MagicTypeError(
+                'rows unmatched.',
+                indices=failures,
+            )
+
+        results = [call(*row) for row in bound_rows]
+
+        if return_plan.deferred_wrapper:
+            wrap = return_plan.deferred_wrapper
+            return [wrap(ret) for ret in results]
+
+        if check_returns is not None:
+            failures = set()
+            check_returns(results, failures)
+            if failures:
+                raise MagicTypeError(
+                    'return values unmatched.',
+                    return_type=return_type,
+                    indices=sorted(failures),
+                )
+        return results
+
+    return check_batch, map_checked
+
+
+def attach_batch_functions(wrapper, function, constraints_package,
+                           leading_argument, binding, bind):
+    built = []
+
+    def get():
+        if not built:
+            built.append(generate_batch_functions(
+                function, constraints_package, leading_argument, binding,
+                bind,
+            ))
+            wrapper.check_batch, wrapper.map_checked = built[0]
+        return built[0]
+
+    def check_batch(rows):
+        return get()[0](rows)
+
+    def map_checked(rows):
+        return get()[1](rows)
+
+    wrapper.check_batch = check_batch
+    # the results are coroutines, there's nothing to map.
+    wrapper.map_checked = None if coroutine_function(function) else\
+        map_checked
+
+
+def batch_entry_point(function, name):
+    # bound methods forward the attributes of the decorated function.
+    return getattr(function, name, None)
+
+
+def check_batch(function, rows):
+    entry_point = batch_entry_point(function, 'check_batch')
+    if entry_point is None:
+        # nothing to check.
+        return []
+    return entry_point(rows)
+
+
+def map_checked(function, rows):
+    if coroutine_function(function):
+        raise MagicSyntaxError(
+            'map_checked does not support coroutine function.',
+            function=function,
+        )
+
+    entry_point = batch_entry_point(function, 'map_checked')
+    if entry_point is None:
+        # rows start with self_or_cls, as the entry points.
+        function = getattr(function, '__func__', function)
+        return [function(*row) for row in rows]
+    return entry_point(rows)
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals,
+)
+from builtins import *                  # noqa
+from future.builtins.disabled import *  # noqa
+
+import array
+import sys
+
+
+# class of the elements produced by iterating a buffer, indexed by struct
+# format code (array.array typecodes are a subset).
+FORMAT_CLASSES = dict(
+    [(code, int) for code in 'bBhHiIlLqQnNP'] +
+    [(code, float) for code in 'efd'] +
+    [('?', bool), ('c', bytes), ('u', str)]
+)
+
+BYTE_ORDER_PREFIXES = '@=<>!'
+
+BYTES_CLASSES = (bytes, bytearray)
+
+# iterating buffers yields str in Python 2.
+BUFFER_SUPPORTED = sys.version_info.major > 2
+
+
+def buffer_element_class(instance):
+    # returns the class of every element of a 1-d buffer, None if unknown.
+    if not BUFFER_SUPPORTED:
+        return None
+
+    # exact types only, subclasses could override __iter__.
+    instance_type = type(instance)
+
+    if instance_type is array.array:
+        return FORMAT_CLASSES.get(instance.typecode)
+
+    elif instance_type is memoryview:
+        try:
+            if instance.ndim != 1:
+                return None
+            format_ = instance.format
+        except ValueError:
+            # released.
+            return None
+
+        if format_[:1] in BYTE_ORDER_PREFIXES:
+            format_ = format_[1:]
+        return FORMAT_CLASSES.get(format_)
+
+    elif instance_type in BYTES_CLASSES:
+        return int
+
+    return None
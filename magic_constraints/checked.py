@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals,
+)
+from builtins import *                  # noqa
+from future.builtins.disabled import *  # noqa
+
+from magic_constraints.exception import MagicTypeError, MagicSyntaxError
+
+
+# Containers validating the elements on write, created by
+# MutableSequence[T].checked(...), MutableSet[T].checked(...) and
+# MutableMapping[K, V].checked(...). Since every element has been checked,
+# the instance check of the same element types accepts them in O(1).
+#
+# Writes through the methods of the base class, i.e. list.append(obj, e),
+# bypass the checking.
+def make_checked(checked_type, elements):
+    # the checkers are rebuilt, hence pickle and copy ship only the type.
+    return checked_type.checked(elements)
+
+
+def raise_element_unmatched(checked_type, element):
+    raise MagicTypeError(
+        'element unmatched.',
+        checked_type=checked_type,
+        element=element,
+    )
+
+
+class CheckedList(list):
+
+    def __init__(self, checked_type, checkers, iterable=()):
+        self.checked_type = checked_type
+        self.checkers = checkers
+        super().__init__(self.check_elements(iterable))
+
+    def check_elements(self, iterable):
+        check_element, = self.checkers
+        elements = list(iterable)
+        for element in elements:
+            if not check_element(element):
+                raise_element_unmatched(self.checked_type, element)
+        return elements
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = self.check_elements(value)
+        else:
+            value, = self.check_elements((value,))
+        super().__setitem__(index, value)
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+    def append(self, value):
+        super().append(*self.check_elements((value,)))
+
+    def extend(self, iterable):
+        super().extend(self.check_elements(iterable))
+
+    def insert(self, index, value):
+        super().insert(index, *self.check_elements((value,)))
+
+    def __reduce__(self):
+        return make_checked, (self.checked_type, list(self))
+
+
+class CheckedSet(set):
+
+    def __init__(self, checked_type, checkers, iterable=()):
+        self.checked_type = checked_type
+        self.checkers = checkers
+        super().__init__(self.check_elements(iterable))
+
+    def check_elements(self, iterable):
+        check_element, = self.checkers
+        elements = list(iterable)
+        for element in elements:
+            if not check_element(element):
+                raise_element_unmatched(self.checked_type, element)
+        return elements
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __ixor__(self, other):
+        self.symmetric_difference_update(other)
+        return self
+
+    def add(self, value):
+        super().add(*self.check_elements((value,)))
+
+    def update(self, *others):
+        for other in others:
+            super().update(self.check_elements(other))
+
+    def symmetric_difference_update(self, other):
+        super().symmetric_difference_update(self.check_elements(other))
+
+    def __reduce__(self):
+        return make_checked, (self.checked_type, list(self))
+
+
+class CheckedDict(dict):
+
+    def __init__(self, checked_type, checkers, *args, **kwargs):
+        self.checked_type = checked_type
+        self.checkers = checkers
+        super().__init__(self.check_items(dict(*args, **kwargs)))
+
+    def check_items(self, mapping):
+        check_key, check_val = self.checkers
+        for key, val in mapping.items():
+            if not (check_key(key) and check_val(val)):
+                raise_element_unmatched(self.checked_type, (key, val))
+        return mapping
+
+    def __setitem__(self, key, val):
+        self.check_items({key: val})
+        super().__setitem__(key, val)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        super().update(self.check_items(dict(*args, **kwargs)))
+
+    @classmethod
+    def fromkeys(cls, iterable, value=None):
+        # the class alone doesn't know the checked type.
+        raise MagicSyntaxError(
+            'fromkeys is not supported by checked dict, '
+            'use MutableMapping[K, V].checked(dict.fromkeys(...)).',
+            iterable=iterable,
+            value=value,
+        )
+
+    def __reduce__(self):
+        return make_checked, (self.checked_type, dict(self))
+
+
+CHECKED_CONTAINER_TYPES = frozenset([CheckedList, CheckedSet, CheckedDict])
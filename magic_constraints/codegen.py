@@ -0,0 +1,378 @@
+# -*- coding: utf-8 -*-
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals,
+)
+from builtins import *                  # noqa
+from future.builtins.disabled import *  # noqa
+
+import re
+import keyword
+try:
+    from inspect import iscoroutinefunction
+except ImportError:  # pragma: no cover
+    # Python < 3.5.
+    iscoroutinefunction = None
+
+from magic_constraints.exception import MagicError, MagicTypeError
+
+from magic_constraints.argument import transform_to_slots
+
+from magic_constraints.parallel import parallel_details
+
+from magic_constraints.metrics import clock
+
+from magic_constraints.utils import CompoundArgument
+
+
+# how the checked arguments are passed to the wrapped function.
+# 1. function(a, b, ...)
+BIND_POSITIONAL = 'positional'
+# 2. function(compound_args), with compound_args.a, compound_args.b, ...
+BIND_COMPOUND = 'compound'
+# 3. self.a, self.b, ... then function(self). Used by __init__.
+BIND_ATTRIBUTES = 'attributes'
+
+IDENTIFIER_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+def valid_identifier(name):
+    return bool(IDENTIFIER_PATTERN.match(name)) and\
+        not keyword.iskeyword(name)
+
+
+def build_function(name, lines, namespace, filename):
+    code = compile('\n'.join(lines), filename, 'exec')
+    exec(code, namespace)
+    return namespace[name]
+
+
+def failure_details(sampling_policy, value):
+    details = parallel_details(value)
+    if sampling_policy is not None:
+        details['sampling_policy'] = sampling_policy
+        details['inspected'] = sampling_policy.inspected(value)
+    return details
+
+
+def raise_argument_unmatched(parameter, argument, sampling_policy=None):
+    raise MagicTypeError(
+        'argument unmatched.',
+        parameter=parameter,
+        argument=argument,
+        **failure_details(sampling_policy, argument)
+    )
+
+
+def raise_return_unmatched(return_type, ret, sampling_policy=None):
+    raise MagicTypeError(
+        'return value unmatched.',
+        return_type=return_type,
+        ret=ret,
+        **failure_details(sampling_policy, ret)
+    )
+
+
+def generate_binder(constraints_package):
+    # let Python bind the arguments by calling a function with exactly the
+    # same parameter list and defaults.
+    parameters = constraints_package.parameters
+    names = [parameter.name for parameter in parameters]
+
+    # binders return a tuple.
+    def bind_by_slots(args, kwargs):
+        return tuple(
+            transform_to_slots(constraints_package, *args, **kwargs),
+        )
+
+    if not all(map(valid_identifier, names)):
+        return bind_by_slots
+
+    namespace = {}
+    signature = []
+    for i, parameter in enumerate(parameters):
+        if parameter.with_default:
+            namespace['default_{0}'.format(i)] = parameter.default
+            signature.append('{0}=default_{1}'.format(parameter.name, i))
+        else:
+            signature.append(parameter.name)
+
+    native_bind = build_function(
+        'native_bind',
+        [
+            'def native_bind({0}):'.format(', '.join(signature)),
+            '    return ({0})'.format(''.join(n + ', ' for n in names)),
+        ],
+        namespace,
+        '<magic_constraints binder>',
+    )
+
+    def bind(args, kwargs):
+        try:
+            return native_bind(*args, **kwargs)
+        except TypeError:
+            # raise MagicSyntaxError with details.
+            bind_by_slots(args, kwargs)
+            raise
+
+    return bind
+
+
+def generate_check(plan, var, suffix, namespace, raise_line):
+    # returns lines checking `var` with the plan.
+    if plan.classes is not None:
+        classes_name = 'classes_' + suffix
+        namespace[classes_name] = plan.classes
+        condition = 'isinstance({0}, {1})'.format(var, classes_name)
+
+    elif plan.checker is not None:
+        checker_name = 'check_' + suffix
+        namespace[checker_name] = plan.checker
+        condition = '{0}({1})'.format(checker_name, var)
+
+    else:
+        return []
+
+    return [
+        '    if not {0}:'.format(condition),
+        '        ' + raise_line,
+    ]
+
+
+def generate_parameter_lines(constraints_package, arguments, namespace):
+    lines = []
+    for i, var in enumerate(arguments):
+        plan = constraints_package.parameter_plans[i]
+
+        if plan.deferred_wrapper:
+            # defer checking by wrapping the argument.
+            wrapper_name = 'wrap_{0}'.format(i)
+            namespace[wrapper_name] = plan.deferred_wrapper
+            lines.append('    {0} = {1}({0})'.format(var, wrapper_name))
+            continue
+
+        parameter_name = 'parameter_{0}'.format(i)
+        namespace[parameter_name] = constraints_package.parameters[i]
+        raise_arguments = [parameter_name, var]
+        if plan.sampling_policy is not None:
+            policy_name = 'sampling_policy_{0}'.format(i)
+            namespace[policy_name] = plan.sampling_policy
+            raise_arguments.append(policy_name)
+
+        lines.extend(generate_check(
+            plan, var, str(i), namespace,
+            'raise_argument_unmatched({0})'.format(
+                ', '.join(raise_arguments),
+            ),
+        ))
+    return lines
+
+
+def generate_return_lines(return_type, return_plan, skip_check,
+                          call_arguments, namespace,
+                          asynchronous=False, metrics=None):
+    call = 'function({0})'.format(', '.join(call_arguments))
+    if asynchronous:
+        # arguments are checked before awaiting, the result after.
+        call = 'await ' + call
+
+    if skip_check:
+        if metrics is None:
+            return ['    return ' + call]
+        check_lines = []
+
+    elif return_plan.deferred_wrapper:
+        # checked while consumed, i.e. Iterator[T].
+        namespace['wrap_return'] = return_plan.deferred_wrapper
+        if metrics is None:
+            return ['    return wrap_return({0})'.format(call)]
+        check_lines = ['    ret = wrap_return(ret)']
+
+    else:
+        namespace['return_type'] = return_type
+        namespace['return_sampling_policy'] = return_plan.sampling_policy
+        check_lines = generate_check(
+            return_plan, 'ret', 'return', namespace,
+            'raise_return_unmatched('
+            'return_type, ret, return_sampling_policy)',
+        )
+
+    lines = ['    ret = ' + call]
+    if metrics is None:
+        lines.extend(check_lines)
+    else:
+        # failures of the function itself are counted as well.
+        lines = instrument_check_lines(lines, 'BaseException')
+        lines.append('    returned = clock()')
+        lines.extend(instrument_check_lines(check_lines))
+        lines.append('    metrics.record(started, checked, returned, clock())')
+    lines.append('    return ret')
+    return lines
+
+
+def instrument_check_lines(lines, exception='MagicError'):
+    # failures are counted by exception type.
+    if not lines:
+        return []
+    return ['    try:'] + ['    ' + line for line in lines] + [
+        '    except {0} as error:'.format(exception),
+        '        metrics.record_failure(error)',
+        '        raise',
+    ]
+
+
+def instrument_namespace(namespace, metrics):
+    namespace.update({
+        'metrics': metrics,
+        'clock': clock,
+        'MagicError': MagicError,
+    })
+
+
+def generate_attributes_lines(target, parameters, arguments, namespace):
+    lines = []
+    for i, (parameter, var) in enumerate(zip(parameters, arguments)):
+        if valid_identifier(parameter.name):
+            lines.append('    {0}.{1} = {2}'.format(
+                target, parameter.name, var,
+            ))
+        else:
+            name = 'name_{0}'.format(i)
+            namespace[name] = parameter.name
+            lines.append('    setattr({0}, {1}, {2})'.format(
+                target, name, var,
+            ))
+    return lines
+
+
+def coroutine_function(function):
+    return iscoroutinefunction is not None and iscoroutinefunction(function)
+
+
+def wrapper_header(function, arguments):
+    # `async def` for native coroutine function.
+    if coroutine_function(function):
+        definition = 'async def'
+    else:
+        definition = 'def'
+    return '{0} wrapper({1}):'.format(definition, ', '.join(arguments))
+
+
+def generate_arguments_wrapper(function, constraints_package,
+                               leading_argument, binding, metrics=None,
+                               bind=None):
+    asynchronous = coroutine_function(function)
+    parameters = constraints_package.parameters
+    arguments = ['a{0}'.format(i) for i in range(len(parameters))]
+    # trailing coma makes a valid target for single argument.
+    unpacked = ''.join(a + ', ' for a in arguments)
+
+    namespace = {
+        'function': function,
+        'bind': bind or generate_binder(constraints_package),
+        'raise_argument_unmatched': raise_argument_unmatched,
+        'raise_return_unmatched': raise_return_unmatched,
+        'CompoundArgument': CompoundArgument,
+    }
+
+    leading = ['self_or_cls'] if leading_argument else []
+    header = wrapper_header(function, leading + ['*args', '**kwargs'])
+    lines = []
+
+    # 1. bind.
+    if arguments:
+        lines.extend([
+            '    if not kwargs and len(args) == {0}:'.format(len(arguments)),
+            '        {0} = args'.format(unpacked),
+            '    else:',
+            '        {0} = bind(args, kwargs)'.format(unpacked),
+        ])
+    else:
+        lines.extend([
+            '    if args or kwargs:',
+            '        bind(args, kwargs)',
+        ])
+
+    # 2. check.
+    lines.extend(generate_parameter_lines(
+        constraints_package, arguments, namespace,
+    ))
+
+    # 3. call.
+    if binding == BIND_POSITIONAL:
+        call_arguments = leading + arguments
+
+    elif binding == BIND_COMPOUND:
+        lines.append('    compound_args = CompoundArgument()')
+        lines.extend(generate_attributes_lines(
+            'compound_args', parameters, arguments, namespace,
+        ))
+        call_arguments = leading + ['compound_args']
+
+    elif binding == BIND_ATTRIBUTES:
+        lines.extend(generate_attributes_lines(
+            'self_or_cls', parameters, arguments, namespace,
+        ))
+
+    if metrics is not None:
+        instrument_namespace(namespace, metrics)
+        lines = ['    started = clock()'] + instrument_check_lines(lines) +\
+            ['    checked = clock()']
+
+    if binding == BIND_ATTRIBUTES:
+        if metrics is None:
+            lines.append('    function(self_or_cls)')
+        else:
+            lines.extend(instrument_check_lines(
+                ['    function(self_or_cls)'], 'BaseException',
+            ))
+            lines.extend([
+                '    returned = clock()',
+                '    metrics.record(started, checked, returned, returned)',
+            ])
+    else:
+        lines.extend(generate_return_lines(
+            constraints_package.return_type,
+            constraints_package.return_plan,
+            constraints_package.skip_return_check,
+            call_arguments,
+            namespace,
+            asynchronous,
+            metrics,
+        ))
+
+    return build_function(
+        'wrapper', [header] + lines, namespace,
+        '<magic_constraints wrapper of {0}>'.format(
+            getattr(function, '__name__', 'function'),
+        ),
+    )
+
+
+def generate_return_wrapper(function, return_type, return_plan,
+                            skip_return_check, leading_argument,
+                            metrics=None):
+    namespace = {
+        'function': function,
+        'raise_return_unmatched': raise_return_unmatched,
+    }
+
+    leading = ['self_or_cls'] if leading_argument else []
+    call_arguments = leading + ['*args', '**kwargs']
+    lines = [wrapper_header(function, call_arguments)]
+    if metrics is not None:
+        instrument_namespace(namespace, metrics)
+        lines.append('    started = checked = clock()')
+    lines.extend(
+        generate_return_lines(
+            return_type, return_plan, skip_return_check,
+            call_arguments, namespace,
+            coroutine_function(function), metrics,
+        ),
+    )
+
+    return build_function(
+        'wrapper', lines, namespace,
+        '<magic_constraints wrapper of {0}>'.format(
+            getattr(function, '__name__', 'function'),
+        ),
+    )
@@ -0,0 +1,422 @@
+# -*- coding: utf-8 -*-
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals,
+)
+from builtins import *                  # noqa
+from future.builtins.disabled import *  # noqa
+
+from abc import ABCMeta
+
+from magic_constraints.types import (
+    Any,
+    BasicMetaMagicType,
+    check_type_of_instance,
+    get_cache_token,
+)
+
+from magic_constraints.buffer import buffer_element_class
+
+from magic_constraints.checked import CHECKED_CONTAINER_TYPES
+
+from magic_constraints.exception import MagicSyntaxError, MagicTypeError
+
+from magic_constraints.memo import lower_memoized
+
+from magic_constraints.sampling import (
+    get_default_sampling_policy,
+    raise_on_non_sampling_policy,
+    resolve_sampling_policy,
+    selects_nothing,
+)
+
+from magic_constraints.utils import (
+    raise_on_nontype_object,
+    return_true,
+)
+
+
+# A type is lowered to one of the following forms:
+# 1. None, accepts everything (Any).
+# 2. tuple of classes, accepts instance if isinstance(instance, classes).
+# 3. callable, accepts instance if callable(instance) returns True.
+def lower_type(type_, sampling_policy=None):
+    if type_ is Any:
+        return None
+
+    if isinstance(type_, BasicMetaMagicType):
+        lower = getattr(type_, 'lower', None)
+        if lower:
+            return lower(sampling_policy)
+        else:
+            # MagicType without lowering, fallback to the interpreter.
+            return getattr(type_, 'check_instance', None) or return_true
+
+    return (type_,)
+
+
+def plain_classes(lowered):
+    # isinstance accepts both single class and tuple.
+    return lowered[0] if len(lowered) == 1 else lowered
+
+
+def to_checker(lowered):
+    if lowered is None:
+        return return_true
+
+    if isinstance(lowered, tuple):
+        classes = plain_classes(lowered)
+
+        def check_plain(instance):
+            return isinstance(instance, classes)
+
+        return check_plain
+
+    return lowered
+
+
+def prepare_sampling_policy(sampling_policy):
+    # the default policy applies if no policy is given.
+    if sampling_policy is None:
+        sampling_policy = get_default_sampling_policy()
+    else:
+        raise_on_non_sampling_policy(sampling_policy)
+    return resolve_sampling_policy(None, sampling_policy)
+
+
+def top_level_sampling_policy(type_, sampling_policy):
+    # the policy applied to the elements of type_, if type_ is a container.
+    if isinstance(type_, BasicMetaMagicType) and type_.partial_cls and\
+            hasattr(type_, 'sampled'):
+        return resolve_sampling_policy(type_.sampling_policy, sampling_policy)
+    return None
+
+
+def compile_type(type_, sampling_policy=None):
+    raise_on_nontype_object(type_)
+    sampling_policy = prepare_sampling_policy(sampling_policy)
+    return to_checker(lower_type(type_, sampling_policy))
+
+
+def lower_instance_type(cls):
+
+    def check_instance_type(instance):
+        # 1. memoized verdict of issubclass(type(instance), cls).
+        cache_token, cache = vars(cls).get(
+            'subclass_check_cache', (None, None),
+        )
+        instance_type = type(instance)
+        if cache_token == get_cache_token() and\
+                instance.__class__ is instance_type:
+            verdict = cache.get(instance_type)
+            if verdict is not None:
+                return verdict
+
+        # 2. fills the memo through cls.__subclasscheck__.
+        return check_type_of_instance(cls, instance)
+
+    return check_instance_type
+
+
+def lower_element_loop(lowered):
+    if isinstance(lowered, tuple):
+        classes = plain_classes(lowered)
+
+        def check_plain_elements(iterable):
+            for element in iterable:
+                if not isinstance(element, classes):
+                    return False
+            return True
+
+        return check_plain_elements
+
+    checker = lowered
+
+    def check_elements(iterable):
+        for element in iterable:
+            if not checker(element):
+                return False
+        return True
+
+    return check_elements
+
+
+# isinstance(instance, cls) holds if issubclass(type(instance), cls) holds,
+# as long as the metaclass of cls implements one of these.
+STANDARD_INSTANCECHECKS = (type.__instancecheck__, ABCMeta.__instancecheck__)
+
+
+def reducible_by_type(classes):
+    for cls in classes:
+        instancecheck = getattr(type(cls), '__instancecheck__', None)
+        if instancecheck not in STANDARD_INSTANCECHECKS:
+            return False
+    return True
+
+
+# building the set of types doesn't pay off on small containers.
+HOMOGENEOUS_MIN_SIZE = 32
+
+
+def lower_homogeneous_elements(lowered):
+    classes = plain_classes(lowered)
+    check_plain_elements = lower_element_loop(lowered)
+
+    def check_homogeneous_elements(iterable):
+        if len(iterable) < HOMOGENEOUS_MIN_SIZE:
+            return check_plain_elements(iterable)
+
+        # 1. collect the distinct types in a C-level pass.
+        for element_type in set(map(type, iterable)):
+            if not issubclass(element_type, classes):
+                # 2. isinstance may still hold through __class__, iterate
+                #    again to be precise.
+                return check_plain_elements(iterable)
+        return True
+
+    return check_homogeneous_elements
+
+
+def lower_elements(lowered, sampling_policy=None):
+    # returns None if elements need no checking.
+    if lowered is None or selects_nothing(sampling_policy):
+        return None
+
+    if sampling_policy is not None:
+        # selected elements can only be iterated once.
+        check_all = lower_element_loop(lowered)
+        select = sampling_policy.select
+
+        def check_sampled_elements(iterable):
+            return check_all(select(iterable))
+
+        return check_sampled_elements
+
+    if isinstance(lowered, tuple) and reducible_by_type(lowered):
+        return lower_homogeneous_elements(lowered)
+
+    return lower_element_loop(lowered)
+
+
+def lower_buffer_elements(lowered, check_content):
+    # buffers hold elements of a single class given by the format code,
+    # decide on the class instead of boxing every element.
+    if not (isinstance(lowered, tuple) and reducible_by_type(lowered)):
+        return check_content
+
+    classes = plain_classes(lowered)
+
+    def check_buffer_elements(sequence):
+        element_class = buffer_element_class(sequence)
+        if element_class is None:
+            return check_content(sequence)
+        return not len(sequence) or issubclass(element_class, classes)
+
+    return check_buffer_elements
+
+
+def lower_fixed_buffer_elements(lowered_list, check_content):
+    for lowered in lowered_list:
+        if not (isinstance(lowered, tuple) and reducible_by_type(lowered)):
+            return check_content
+
+    classes_list = tuple(map(plain_classes, lowered_list))
+    length = len(classes_list)
+
+    def check_fixed_buffer_elements(sequence):
+        element_class = buffer_element_class(sequence)
+        if element_class is None:
+            return check_content(sequence)
+        if len(sequence) != length:
+            return False
+        for classes in classes_list:
+            if not issubclass(element_class, classes):
+                return False
+        return True
+
+    return check_fixed_buffer_elements
+
+
+def lower_fixed_elements(lowered_list, sampling_policy=None):
+    length = len(lowered_list)
+    if selects_nothing(sampling_policy):
+        def check_length(sequence):
+            return len(sequence) == length
+
+        return check_length
+
+    checkers = tuple(map(to_checker, lowered_list))
+    indices = range(length)
+    if sampling_policy is not None:
+        # the length is fixed, so are the selected positions.
+        indices = tuple(sampling_policy.select(indices))
+
+    def check_fixed_elements(sequence):
+        if len(sequence) != length:
+            return False
+        for i in indices:
+            if not checkers[i](sequence[i]):
+                return False
+        return True
+
+    return check_fixed_elements
+
+
+def lower_pairs(key_lowered, val_lowered):
+    if isinstance(key_lowered, tuple) and isinstance(val_lowered, tuple):
+        key_classes = plain_classes(key_lowered)
+        val_classes = plain_classes(val_lowered)
+
+        def check_plain_pairs(pairs):
+            for key, val in pairs:
+                if not (isinstance(key, key_classes) and
+                        isinstance(val, val_classes)):
+                    return False
+            return True
+
+        return check_plain_pairs
+
+    key_checker = to_checker(key_lowered)
+    val_checker = to_checker(val_lowered)
+
+    def check_pairs(pairs):
+        for key, val in pairs:
+            if not (key_checker(key) and val_checker(val)):
+                return False
+        return True
+
+    return check_pairs
+
+
+def lower_items(key_lowered, val_lowered, sampling_policy=None):
+    if (key_lowered is None and val_lowered is None) or\
+            selects_nothing(sampling_policy):
+        return None
+
+    if sampling_policy is not None:
+        check_pairs = lower_pairs(key_lowered, val_lowered)
+        select = sampling_policy.select
+
+        def check_sampled_items(mapping):
+            return check_pairs(select(mapping.items()))
+
+        return check_sampled_items
+
+    # keys and values are checked in separate passes, so that each side
+    # could take the homogeneous fast path.
+    check_keys = lower_elements(key_lowered)
+    check_values = lower_elements(val_lowered)
+
+    if check_keys is None:
+        def check_only_values(mapping):
+            return check_values(mapping.values())
+
+        return check_only_values
+
+    if check_values is None:
+        def check_only_keys(mapping):
+            return check_keys(mapping.keys())
+
+        return check_only_keys
+
+    def check_items(mapping):
+        return check_keys(mapping.keys()) and check_values(mapping.values())
+
+    return check_items
+
+
+def lower_container(cls, check_content):
+    check_instance_type = lower_instance_type(cls)
+    if check_content is None:
+        return check_instance_type
+
+    partial_cls = cls.partial_cls
+
+    def check_container(instance):
+        if not check_instance_type(instance):
+            return False
+        # elements have been checked on write.
+        if type(instance) in CHECKED_CONTAINER_TYPES and\
+                instance.checked_type.partial_cls == partial_cls:
+            return True
+        return check_content(instance)
+
+    return check_container
+
+
+def build_checked_container(cls, checked_class, element_types,
+                            *args, **kwargs):
+    if not issubclass(checked_class, cls.main_cls):
+        raise MagicSyntaxError(
+            'require mutable container type.',
+            type_=cls,
+        )
+
+    # verdicts on plain classes never change once an element is written,
+    # which doesn't hold for nested containers.
+    checkers = []
+    for element_type in element_types:
+        lowered = lower_type(element_type)
+        if not (lowered is None or isinstance(lowered, tuple)):
+            raise MagicSyntaxError(
+                'require plain element type.',
+                type_=cls,
+                element_type=element_type,
+            )
+        checkers.append(to_checker(lowered))
+
+    return checked_class(cls, tuple(checkers), *args, **kwargs)
+
+
+def lower_memoized_container(cls, sampling_policy, checker):
+    # opt-in by cls.memoized().
+    if not cls.memoize:
+        return checker
+    return lower_memoized((cls, sampling_policy), checker)
+
+
+def build_lazy_wrapper(cls, view_class, element_types, length=None):
+    # the container is checked eagerly, elements are checked by the view.
+    check_instance_type = lower_instance_type(cls)
+    checkers = tuple(to_checker(lower_type(T)) for T in element_types)
+
+    def wrap_lazy_view(instance):
+        if not check_instance_type(instance) or\
+                (length is not None and len(instance) != length):
+            raise MagicTypeError(
+                'type unmatched.',
+                type_=cls,
+                instance=instance,
+            )
+        return view_class(cls, instance, checkers)
+
+    return wrap_lazy_view
+
+
+def lower_union(lowered_list):
+    classes = ()
+    checkers = []
+    for lowered in lowered_list:
+        if lowered is None:
+            # Any in union.
+            return None
+        elif isinstance(lowered, tuple):
+            classes += lowered
+        else:
+            checkers.append(lowered)
+
+    if not checkers:
+        return classes
+    if not classes:
+        plain = ()
+    else:
+        plain = plain_classes(classes)
+
+    def check_union(instance):
+        if isinstance(instance, plain):
+            return True
+        for checker in checkers:
+            if checker(instance):
+                return True
+        return False
+
+    return check_union
@@ -8,10 +8,6 @@ from future.builtins.disabled import *  # noqa
 from collections import namedtuple
 import collections as abc
 
-from funcsigs import signature
-from funcsigs import Parameter as SigParameter
-
-
 from magic_constraints.types import (
     Any,
     BasicMagicType,
@@ -22,6 +18,19 @@ from magic_constraints.exception import (
     MagicTypeError,
 )
 
+from magic_constraints.compiler import (
+    lower_type,
+    plain_classes,
+    to_checker,
+    prepare_sampling_policy,
+    top_level_sampling_policy,
+)
+
+from magic_constraints.signature import (
+    SigParameter,
+    signature_of,
+)
+
 from magic_constraints.utils import (
     type_object,
     nontype_object,
@@ -32,12 +41,40 @@ from magic_constraints.utils import (
 )
 
 
+# instances are wrapped and checked on use.
+DEFERRED_ABCS = tuple(
+    ABC for ABC in [
+        abc.Iterator,
+        abc.Iterable,
+        abc.Callable,
+        # Python 3.5+.
+        getattr(abc, 'AsyncIterator', None),
+        getattr(abc, 'AsyncIterable', None),
+    ]
+    if ABC is not None
+)
+
+
+def make_constraint(constraint_class, args, options):
+    return constraint_class(*args, **options)
+
+
 class Constraint(object):
 
+    # thousands of them are created on import, see benchmarks/
+    # bench_decoration.py.
+    __slots__ = (
+        'type_', 'options',
+        'with_default', 'default', 'validator',
+        '_arguments_repr',
+    )
+
     def __init__(self, type_, **options):
 
         raise_on_nontype_object(type_)
         self.type_ = type_
+        # kept for pickling.
+        self.options = options
 
         # 1. record default value.
         # NOTICE that ReturnType do not support default.
@@ -53,15 +90,8 @@ class Constraint(object):
             'validator', return_true,
         )
 
-        # generator serialized string for repr.
-        # op 1.
-        prefix = self.init_arguments_repr_prefix(type_, **options)
-        # common suffix.
-        suffix = self._init_arguments_repr_suffix(type_, **options)
-        if prefix:
-            self._arguments_repr = '{0}, {1}'.format(prefix, suffix)
-        else:
-            self._arguments_repr = suffix
+        # serialized string for repr, generated on the first use.
+        self._arguments_repr = None
 
         # check default.
         if self.with_default and not self.check_instance(self.default):
@@ -74,14 +104,23 @@ class Constraint(object):
         if not issubclass(self.type_, BasicMagicType):
             return None
 
-        if issubclass(self.type_.main_cls, (abc.Iterator, abc.Callable)) and\
-                self.type_.partial_cls:
+        # lazy views are handed to the function, hence return values and
+        # arguments with validator are checked eagerly.
+        if self.type_.lazy_checking:
+            if isinstance(self, Parameter) and\
+                    self.validator is return_true:
+                return self.type_.lazy_wrapper()
+            return None
+
+        if self.type_.main_cls in DEFERRED_ABCS and self.type_.partial_cls:
             return self.type_
 
         else:
             return None
 
     def check_instance(self, instance, *args, **kwargs):
+        # magic types reuse their compiled checker, which follows the default
+        # sampling policy.
         if not isinstance(instance, self.type_):
             return False
 
@@ -90,6 +129,15 @@ class Constraint(object):
     def init_arguments_repr_prefix(self, type_, **options):
         return ''
 
+    def init_arguments(self):
+        return (self.type_,)
+
+    def __reduce__(self):
+        return (
+            make_constraint,
+            (type(self), self.init_arguments(), self.options),
+        )
+
     def _init_arguments_repr_suffix(self, type_, **options):
         # positional arguments.
         prefix = "type_={type_}".format(
@@ -109,17 +157,35 @@ class Constraint(object):
 
         return arguemnt_repr
 
+    def arguments_repr(self):
+        if self._arguments_repr is None:
+            # op 1.
+            prefix = self.init_arguments_repr_prefix(
+                self.type_, **self.options
+            )
+            # common suffix.
+            suffix = self._init_arguments_repr_suffix(
+                self.type_, **self.options
+            )
+            if prefix:
+                self._arguments_repr = '{0}, {1}'.format(prefix, suffix)
+            else:
+                self._arguments_repr = suffix
+        return self._arguments_repr
+
     def __repr__(self):
         return conditional_to_bytes(
             '{cls_name}({arguemnt_repr})'.format(
                 cls_name=type(self).__name__,
-                arguemnt_repr=self._arguments_repr,
+                arguemnt_repr=self.arguments_repr(),
             ),
         )
 
 
 class Parameter(Constraint):
 
+    __slots__ = ('name',)
+
     def __init__(self, name, type_, **options):
         self.name = name
         super().__init__(type_, **options)
@@ -129,9 +195,14 @@ class Parameter(Constraint):
             conditional_repr(self.name),
         )
 
+    def init_arguments(self):
+        return (self.name, self.type_)
+
 
 class ReturnType(Constraint):
 
+    __slots__ = ()
+
     def __init__(self, type_, **options):
         if 'default' in options:
             raise MagicSyntaxError(
@@ -199,7 +270,80 @@ def check_and_preprocess_parameters(parameters):
     return name_hash, start_of_defaults
 
 
-def build_constraints_package(constraints):
+# precomputed decision on how to check an argument or a return value.
+# 1. checker: callable returns bool, None if no checking is needed.
+# 2. classes: classes for the inlined isinstance, if checker is a plain
+#    isinstance test.
+# 3. deferred_wrapper: wraps the value for deferred checking, checker and
+#    classes are None in this case.
+# 4. sampling_policy: the policy applied to the elements of the top-level
+#    container, reported on failure.
+CheckPlan = namedtuple(
+    'CheckPlan',
+    ['checker', 'classes', 'deferred_wrapper', 'sampling_policy'],
+)
+
+ConstraintsPackage = namedtuple(
+    'ConstraintsPackage',
+    [
+        'parameters', 'name_hash', 'start_of_defaults',
+        'return_type',
+        'parameter_plans', 'return_plan', 'skip_return_check',
+    ],
+)
+
+
+NO_CHECK_PLAN = CheckPlan(None, None, None, None)
+
+
+def strip_check_plans(constraints_package):
+    # keeps only the binding of arguments.
+    parameters = constraints_package.parameters
+    return constraints_package._replace(
+        parameter_plans=(NO_CHECK_PLAN,) * len(parameters),
+        return_plan=NO_CHECK_PLAN,
+        skip_return_check=True,
+    )
+
+
+def build_check_plan(constraint, sampling_policy=None):
+    deferred_wrapper = constraint.wrapper_for_deferred_checking()
+    if deferred_wrapper:
+        return CheckPlan(None, None, deferred_wrapper, None)
+
+    sampling_policy = prepare_sampling_policy(sampling_policy)
+    lowered = lower_type(constraint.type_, sampling_policy)
+    reported_policy = top_level_sampling_policy(
+        constraint.type_, sampling_policy,
+    )
+
+    if constraint.validator is not return_true:
+        type_checker = to_checker(lowered)
+        validator = constraint.validator
+
+        def check_with_validator(instance):
+            return type_checker(instance) and validator(instance)
+
+        return CheckPlan(check_with_validator, None, None, reported_policy)
+
+    if lowered is None:
+        # Any.
+        return CheckPlan(None, None, None, None)
+    elif isinstance(lowered, tuple):
+        return CheckPlan(
+            to_checker(lowered), plain_classes(lowered), None,
+            reported_policy,
+        )
+    else:
+        return CheckPlan(lowered, None, None, reported_policy)
+
+
+def return_check_skipped(return_plan):
+    # the return value is returned as is.
+    return return_plan.checker is None and not return_plan.deferred_wrapper
+
+
+def build_constraints_package(constraints, sampling_policy=None):
     if isinstance(constraints[-1], ReturnType):
         parameters = constraints[:-1]
         return_type = constraints[-1]
@@ -209,17 +353,17 @@ def build_constraints_package(constraints):
 
     name_hash, start_of_defaults = check_and_preprocess_parameters(parameters)
 
-    ConstraintsPackage = namedtuple(
-        'ConstraintsPackage',
-        [
-            'parameters', 'name_hash', 'start_of_defaults',
-            'return_type',
-        ],
+    parameter_plans = tuple(
+        build_check_plan(parameter, sampling_policy)
+        for parameter in parameters
     )
+    return_plan = build_check_plan(return_type, sampling_policy)
 
     return ConstraintsPackage(
         parameters, name_hash, start_of_defaults,
         return_type,
+        parameter_plans, return_plan,
+        return_check_skipped(return_plan),
     )
 
 
@@ -277,17 +421,19 @@ def build_return_type(return_type):
 
 
 def build_constraints_with_annotation(function, skip_first_argument):
-    function_sig = signature(function)
+    function_sig = signature_of(function)
 
     constraints = []
     # 1. parameters.
-    for name, sig_parameter in function_sig.parameters.items():
+    for sig_parameter in function_sig.parameters:
         if skip_first_argument:
             skip_first_argument = False
             continue
 
         constraints.append(
-            build_parameter_in_inspection(name, None, sig_parameter),
+            build_parameter_in_inspection(
+                sig_parameter.name, None, sig_parameter,
+            ),
         )
 
     # 2. return type.
@@ -302,7 +448,7 @@ def build_constraints_with_given_type_args(
         function, skip_first_argument,
         type_args, return_type=SigParameter.empty):
 
-    argument_sigs = signature(function)
+    argument_sigs = signature_of(function)
 
     parameter_length = len(argument_sigs.parameters)
     if skip_first_argument:
@@ -318,13 +464,15 @@ def build_constraints_with_given_type_args(
     constraints = []
     # 1. parameters.
     ti = 0
-    for name, sig_parameter in argument_sigs.parameters.items():
+    for sig_parameter in argument_sigs.parameters:
         if skip_first_argument:
             skip_first_argument = False
             continue
 
         constraints.append(
-            build_parameter_in_inspection(name, type_args[ti], sig_parameter),
+            build_parameter_in_inspection(
+                sig_parameter.name, type_args[ti], sig_parameter,
+            ),
         )
         ti += 1
 
@@ -8,12 +8,8 @@ from future.builtins.disabled import *  # noqa
 import collections as abc
 from functools import wraps
 
-# TODO: fix that later.
-from funcsigs import Parameter as SigParameter
-
 from magic_constraints.exception import (
     MagicSyntaxError,
-    MagicTypeError,
 )
 
 from magic_constraints.constraint import (
@@ -23,19 +19,42 @@ from magic_constraints.constraint import (
     build_constraints_with_given_type_args,
     build_constraints_with_annotation,
     build_return_type,
+    build_check_plan,
+    return_check_skipped,
 
     raise_on_non_constraints,
     raise_on_non_parameters,
+    strip_check_plans,
 )
 
-from magic_constraints.argument import (
-    transform_to_slots, check_and_bind_arguments,
+from magic_constraints.levels import (
+    LEVEL_OFF,
+    checking_level_of,
+    resolve_sampling_policy_of_level,
 )
 
-from magic_constraints.utils import (
-    CompoundArgument,
-    AttributesBinder,
+from magic_constraints.codegen import (
+    BIND_POSITIONAL,
+    BIND_COMPOUND,
+    BIND_ATTRIBUTES,
+    generate_binder,
+    generate_arguments_wrapper,
+    generate_return_wrapper,
+)
+
+from magic_constraints.batch import attach_batch_functions
+
+from magic_constraints.metrics import metrics_of
+
+from magic_constraints.trampoline import (
+    lazy_decoration_of,
+    lazy_class_init,
+    decorate,
+)
+
+from magic_constraints.signature import SigParameter
 
+from magic_constraints.utils import (
     type_object,
 
     raise_on_non_callable,
@@ -43,19 +62,42 @@ from magic_constraints.utils import (
 )
 
 
+SUPPORTED_OPTIONS = ('return_type', 'sampling', 'lazy')
+
+
+def raise_on_unsupported_options(options):
+    for name in options:
+        if name not in SUPPORTED_OPTIONS:
+            raise MagicSyntaxError(
+                'unsupported option.',
+                name=name,
+                supported=SUPPORTED_OPTIONS,
+            )
+
+
 def decorator_dispather(
         args, options,
         by_positional, by_only_return_type_checking,
         by_compound, by_inspection):
 
-    if not args and 'return_type' not in options:
+    raise_on_unsupported_options(options)
+
+    if not args and not options:
         raise MagicSyntaxError(
             'empty args with no return_type option.',
         )
 
+    if not args and 'return_type' not in options:
+        # @function_constraints(sampling=..., lazy=...) on annotated
+        # function.
+        def decorator(function):
+            return by_inspection(function, options)
+        return decorator
+
     if len(args) == 1 and args[0] is Ellipsis:
         return by_only_return_type_checking(
             options.get('return_type', SigParameter.empty),
+            options,
         )
 
     elif 'return_type' in options or type_object(args[0]):
@@ -65,7 +107,7 @@ def decorator_dispather(
         return by_compound(args, options)
 
     elif len(args) == 1 and isinstance(args[0], abc.Callable):
-        return by_inspection(args[0])
+        return by_inspection(args[0], options)
 
     else:
         raise MagicSyntaxError(
@@ -73,13 +115,33 @@ def decorator_dispather(
         )
 
 
-def check_ret(ret, return_type):
-    if not return_type.check_instance(ret):
-        raise MagicTypeError(
-            'return value unmatched.',
-            return_type=return_type,
-            ret=ret,
-        )
+def level_sampling_policy(level, options):
+    return resolve_sampling_policy_of_level(level, options.get('sampling'))
+
+
+def build_compound_constraints_package(level, constraints, options):
+    # the wrapper binds the arguments, it can't be omitted at level off.
+    if level == LEVEL_OFF:
+        return strip_check_plans(build_constraints_package(constraints))
+
+    return build_constraints_package(
+        constraints, level_sampling_policy(level, options),
+    )
+
+
+def build_arguments_wrapper(function, constraints_package,
+                            leading_argument, binding, metrics):
+    bind = generate_binder(constraints_package)
+    wrapper = wraps(function)(generate_arguments_wrapper(
+        function, constraints_package, leading_argument, binding, metrics,
+        bind,
+    ))
+    # batch entry points, see magic_constraints.batch.
+    attach_batch_functions(
+        wrapper, function, constraints_package, leading_argument, binding,
+        bind,
+    )
+    return wrapper
 
 
 # @function_constraints(
@@ -95,27 +157,28 @@ def _function_constraints_pass_by_positional_args(type_args, options):
     def decorator(function):
         raise_on_non_callable(function)
 
-        input_type_args = [function, False, type_args]
-        if 'return_type' in options:
-            input_type_args.append(options['return_type'])
-
-        constraints_package = build_constraints_package(
-            build_constraints_with_given_type_args(*input_type_args),
-        )
-
-        @wraps(function)
-        def wrapper(*args, **kwargs):
-
-            slots = transform_to_slots(constraints_package, *args, **kwargs)
-            check_and_bind_arguments(
-                constraints_package.parameters, slots, lambda name, arg: None,
+        level = checking_level_of(function)
+        if level == LEVEL_OFF:
+            return function
+        # settings are resolved at decoration time, even if lazy.
+        sampling_policy = level_sampling_policy(level, options)
+        metrics = metrics_of(function)
+
+        def build():
+            input_type_args = [function, False, type_args]
+            if 'return_type' in options:
+                input_type_args.append(options['return_type'])
+
+            constraints_package = build_constraints_package(
+                build_constraints_with_given_type_args(*input_type_args),
+                sampling_policy,
             )
 
-            ret = function(*slots)
-            check_ret(ret, constraints_package.return_type)
-            return ret
+            return build_arguments_wrapper(
+                function, constraints_package, False, BIND_POSITIONAL, metrics,
+            )
 
-        return wrapper
+        return decorate(function, build, options)
     return decorator
 
 
@@ -132,69 +195,72 @@ def _function_constraints_pass_by_positional_args(type_args, options):
 def _function_constraints_pass_by_compound_args(constraints, options):
     raise_on_non_constraints(constraints)
 
-    constraints_package = build_constraints_package(constraints)
-
     def decorator(function):
         raise_on_non_callable(function)
 
-        @wraps(function)
-        def wrapper(*args, **kwargs):
-
-            slots = transform_to_slots(constraints_package, *args, **kwargs)
+        level = checking_level_of(function)
+        metrics = metrics_of(function)
 
-            compound_args = CompoundArgument()
-            bind_callback = AttributesBinder(compound_args)
-
-            check_and_bind_arguments(
-                constraints_package.parameters, slots, bind_callback,
+        def build():
+            constraints_package = build_compound_constraints_package(
+                level, constraints, options,
             )
 
-            ret = function(compound_args)
-            check_ret(ret, constraints_package.return_type)
-            return ret
+            return build_arguments_wrapper(
+                function, constraints_package, False, BIND_COMPOUND, metrics,
+            )
 
-        return wrapper
+        return decorate(function, build, options)
     return decorator
 
 
 # @function_constraints
 # def function(foo: int, bar: float) -> float:
 #     return foo + bar
-def _function_constraints_by_inspection(function):
+def _function_constraints_by_inspection(function, options):
     raise_on_non_callable(function)
 
-    constraints_package = build_constraints_package(
-        build_constraints_with_annotation(function, False),
-    )
+    level = checking_level_of(function)
+    if level == LEVEL_OFF:
+        return function
+    sampling_policy = level_sampling_policy(level, options)
+    metrics = metrics_of(function)
 
-    @wraps(function)
-    def wrapper(*args, **kwargs):
-        slots = transform_to_slots(constraints_package, *args, **kwargs)
-        check_and_bind_arguments(
-            constraints_package.parameters, slots, lambda name, arg: None,
+    def build():
+        constraints_package = build_constraints_package(
+            build_constraints_with_annotation(function, False),
+            sampling_policy,
         )
 
-        ret = function(*slots)
-        check_ret(ret, constraints_package.return_type)
-        return ret
+        return build_arguments_wrapper(
+            function, constraints_package, False, BIND_POSITIONAL, metrics,
+        )
 
-    return wrapper
+    return decorate(function, build, options)
 
 
-def _function_constraints_by_only_return_type_checking(return_type):
+def _function_constraints_by_only_return_type_checking(return_type, options):
 
     return_type = build_return_type(return_type)
 
     def decorator(function):
         raise_on_non_callable(function)
 
-        @wraps(function)
-        def wrapper(*args, **kwargs):
-            ret = function(*args, **kwargs)
-            check_ret(ret, return_type)
-            return ret
+        level = checking_level_of(function)
+        if level == LEVEL_OFF:
+            return function
+        sampling_policy = level_sampling_policy(level, options)
+        metrics = metrics_of(function)
+
+        def build():
+            return_plan = build_check_plan(return_type, sampling_policy)
+
+            return wraps(function)(generate_return_wrapper(
+                function, return_type, return_plan,
+                return_check_skipped(return_plan), False, metrics,
+            ))
 
-        return wrapper
+        return decorate(function, build, options, batch_functions=False)
     return decorator
 
 
@@ -221,27 +287,28 @@ def _method_constraints_pass_by_positional_args(type_args, options):
     def decorator(function):
         raise_on_non_callable(function)
 
-        input_type_args = [function, True, type_args]
-        if 'return_type' in options:
-            input_type_args.append(options['return_type'])
-
-        constraints_package = build_constraints_package(
-            build_constraints_with_given_type_args(*input_type_args),
-        )
-
-        @wraps(function)
-        def wrapper(self_or_cls, *args, **kwargs):
-
-            slots = transform_to_slots(constraints_package, *args, **kwargs)
-            check_and_bind_arguments(
-                constraints_package.parameters, slots, lambda name, arg: None,
+        level = checking_level_of(function)
+        if level == LEVEL_OFF:
+            return function
+        # settings are resolved at decoration time, even if lazy.
+        sampling_policy = level_sampling_policy(level, options)
+        metrics = metrics_of(function)
+
+        def build():
+            input_type_args = [function, True, type_args]
+            if 'return_type' in options:
+                input_type_args.append(options['return_type'])
+
+            constraints_package = build_constraints_package(
+                build_constraints_with_given_type_args(*input_type_args),
+                sampling_policy,
             )
 
-            ret = function(self_or_cls, *slots)
-            check_ret(ret, constraints_package.return_type)
-            return ret
+            return build_arguments_wrapper(
+                function, constraints_package, True, BIND_POSITIONAL, metrics,
+            )
 
-        return wrapper
+        return decorate(function, build, options)
     return decorator
 
 
@@ -258,69 +325,72 @@ def _method_constraints_pass_by_positional_args(type_args, options):
 def _method_constraints_pass_by_compound_args(constraints, options):
     raise_on_non_constraints(constraints)
 
-    constraints_package = build_constraints_package(constraints)
-
     def decorator(function):
         raise_on_non_callable(function)
 
-        @wraps(function)
-        def wrapper(self_or_cls, *args, **kwargs):
+        level = checking_level_of(function)
+        metrics = metrics_of(function)
 
-            slots = transform_to_slots(constraints_package, *args, **kwargs)
-
-            compound_args = CompoundArgument()
-            bind_callback = AttributesBinder(compound_args)
-
-            check_and_bind_arguments(
-                constraints_package.parameters, slots, bind_callback,
+        def build():
+            constraints_package = build_compound_constraints_package(
+                level, constraints, options,
             )
 
-            ret = function(self_or_cls, compound_args)
-            check_ret(ret, constraints_package.return_type)
-            return ret
+            return build_arguments_wrapper(
+                function, constraints_package, True, BIND_COMPOUND, metrics,
+            )
 
-        return wrapper
+        return decorate(function, build, options)
     return decorator
 
 
 # @method_constraints
 # def method(self_or_cls, foo: int, bar: float) -> float:
 #     return foo + bar
-def _method_constraints_by_inspection(function):
+def _method_constraints_by_inspection(function, options):
     raise_on_non_callable(function)
 
-    constraints_package = build_constraints_package(
-        build_constraints_with_annotation(function, True),
-    )
+    level = checking_level_of(function)
+    if level == LEVEL_OFF:
+        return function
+    sampling_policy = level_sampling_policy(level, options)
+    metrics = metrics_of(function)
 
-    @wraps(function)
-    def wrapper(self_or_cls, *args, **kwargs):
-        slots = transform_to_slots(constraints_package, *args, **kwargs)
-        check_and_bind_arguments(
-            constraints_package.parameters, slots, lambda name, arg: None,
+    def build():
+        constraints_package = build_constraints_package(
+            build_constraints_with_annotation(function, True),
+            sampling_policy,
         )
 
-        ret = function(self_or_cls, *slots)
-        check_ret(ret, constraints_package.return_type)
-        return ret
+        return build_arguments_wrapper(
+            function, constraints_package, True, BIND_POSITIONAL, metrics,
+        )
 
-    return wrapper
+    return decorate(function, build, options)
 
 
-def _method_constraints_by_only_return_type_checking(return_type):
+def _method_constraints_by_only_return_type_checking(return_type, options):
 
     return_type = build_return_type(return_type)
 
     def decorator(function):
         raise_on_non_callable(function)
 
-        @wraps(function)
-        def wrapper(self_or_cls, *args, **kwargs):
-            ret = function(self_or_cls, *args, **kwargs)
-            check_ret(ret, return_type)
-            return ret
+        level = checking_level_of(function)
+        if level == LEVEL_OFF:
+            return function
+        sampling_policy = level_sampling_policy(level, options)
+        metrics = metrics_of(function)
+
+        def build():
+            return_plan = build_check_plan(return_type, sampling_policy)
 
-        return wrapper
+            return wraps(function)(generate_return_wrapper(
+                function, return_type, return_plan,
+                return_check_skipped(return_plan), True, metrics,
+            ))
+
+        return decorate(function, build, options, batch_functions=False)
     return decorator
 
 
@@ -350,22 +420,29 @@ def class_initialization_constraints(user_defined_class):
 
     parameters = getattr(user_defined_class, 'INIT_PARAMETERS', None)
     raise_on_non_parameters(parameters)
-    constraints_package = build_constraints_package(parameters)
 
+    level = checking_level_of(user_defined_class)
+    metrics = metrics_of(user_defined_class, '.__init__')
     predefined_init = getattr(
         user_defined_class,
         '__init__',
     )
 
-    def init(self, *args, **kwargs):
+    def build():
+        # the arguments are bound even if checking is off.
+        constraints_package = build_compound_constraints_package(
+            level, parameters, {},
+        )
 
-        slots = transform_to_slots(constraints_package, *args, **kwargs)
-        bind_callback = AttributesBinder(self)
-        check_and_bind_arguments(
-            parameters, slots, bind_callback,
+        return generate_arguments_wrapper(
+            predefined_init, constraints_package, True, BIND_ATTRIBUTES,
+            metrics,
         )
 
-        predefined_init(self)
+    if lazy_decoration_of({}):
+        init = lazy_class_init(user_defined_class, build)
+    else:
+        init = build()
 
     setattr(user_defined_class, '__init__', init)
 
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals,
+)
+from builtins import *                  # noqa
+from future.builtins.disabled import *  # noqa
+
+import collections as abc
+
+from magic_constraints.exception import MagicTypeError
+
+
+# Read-only views handed to the function by Sequence[T].lazy() and
+# Mapping[K, V].lazy() parameters. The container itself is checked eagerly,
+# elements are checked when read.
+def raise_element_unmatched(type_, position, element):
+    raise MagicTypeError(
+        'element unmatched.',
+        type_=type_,
+        position=position,
+        element=element,
+    )
+
+
+class LazySequence(abc.Sequence):
+
+    # checkers: single checker for Sequence[T], one checker per position
+    # for Sequence[T, ...].
+    def __init__(self, type_, sequence, checkers):
+        self.type_ = type_
+        self.sequence = sequence
+        self.checkers = checkers
+
+    def check_element(self, index, element):
+        if len(self.checkers) == 1:
+            checker = self.checkers[0]
+        else:
+            checker = self.checkers[index]
+        if not checker(element):
+            raise_element_unmatched(self.type_, index, element)
+        return element
+
+    def __len__(self):
+        return len(self.sequence)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            # the positions of Sequence[T, ...] are shifted by slicing.
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        element = self.sequence[index]
+        if index < 0:
+            index += len(self.sequence)
+        return self.check_element(index, element)
+
+    def __iter__(self):
+        for index, element in enumerate(self.sequence):
+            yield self.check_element(index, element)
+
+    def __repr__(self):
+        return 'LazySequence({0!r})'.format(self.sequence)
+
+
+class LazyMapping(abc.Mapping):
+
+    def __init__(self, type_, mapping, checkers):
+        self.type_ = type_
+        self.mapping = mapping
+        self.checkers = checkers
+
+    def check_key(self, key):
+        if not self.checkers[0](key):
+            raise_element_unmatched(self.type_, 'key', key)
+        return key
+
+    def __len__(self):
+        return len(self.mapping)
+
+    def __getitem__(self, key):
+        val = self.mapping[key]
+        self.check_key(key)
+        if not self.checkers[1](val):
+            raise_element_unmatched(self.type_, key, val)
+        return val
+
+    def __contains__(self, key):
+        return key in self.mapping
+
+    def __iter__(self):
+        for key in self.mapping:
+            yield self.check_key(key)
+
+    def __repr__(self):
+        return 'LazyMapping({0!r})'.format(self.mapping)
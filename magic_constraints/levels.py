@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals,
+)
+from builtins import *                  # noqa
+from future.builtins.disabled import *  # noqa
+
+import os
+
+from magic_constraints.exception import MagicSyntaxError
+from magic_constraints.sampling import First
+
+
+# Checking levels, resolved by the decorators at decoration time from the
+# module of the decorated function or class:
+# 1. off: the decorator returns the function unchanged.
+# 2. boundary: only the top-level type, elements of containers are skipped.
+# 3. sampled: elements of containers are sampled.
+# 4. full: every element.
+LEVEL_OFF = 'off'
+LEVEL_BOUNDARY = 'boundary'
+LEVEL_SAMPLED = 'sampled'
+LEVEL_FULL = 'full'
+
+LEVEL_SAMPLING_POLICIES = {
+    LEVEL_BOUNDARY: First(0),
+    LEVEL_SAMPLED: First(100),
+    LEVEL_FULL: None,
+}
+
+# MAGIC_CONSTRAINTS_LEVEL=off,myapp.api=full,myapp.batch=sampled
+# an entry without module prefix sets the default level.
+LEVEL_ENVIRON = 'MAGIC_CONSTRAINTS_LEVEL'
+
+# module prefix -> level, '' for the default level.
+CHECKING_LEVELS = {}
+
+
+def raise_on_invalid_level(level):
+    if level not in (LEVEL_OFF, LEVEL_BOUNDARY, LEVEL_SAMPLED, LEVEL_FULL):
+        raise MagicSyntaxError(
+            'invalid checking level.',
+            level=level,
+        )
+
+
+def parse_checking_levels(text):
+    levels = {'': LEVEL_FULL}
+    for entry in text.split(','):
+        entry = entry.strip()
+        if not entry:
+            continue
+
+        if '=' in entry:
+            prefix, level = [part.strip() for part in entry.split('=', 1)]
+        else:
+            prefix, level = '', entry
+        raise_on_invalid_level(level)
+        levels[prefix] = level
+    return levels
+
+
+def reset_checking_levels():
+    CHECKING_LEVELS.clear()
+    CHECKING_LEVELS.update(
+        parse_checking_levels(os.environ.get(LEVEL_ENVIRON, '')),
+    )
+
+
+def set_checking_level(level, module_prefix=''):
+    # affects the functions and classes decorated afterward.
+    raise_on_invalid_level(level)
+    CHECKING_LEVELS[module_prefix] = level
+
+
+def get_checking_level(module_name):
+    # the longest matching prefix wins.
+    module_name = module_name or ''
+    while True:
+        if module_name in CHECKING_LEVELS:
+            return CHECKING_LEVELS[module_name]
+        if not module_name:
+            return LEVEL_FULL
+        module_name = module_name.rpartition('.')[0]
+
+
+def checking_level_of(obj):
+    return get_checking_level(getattr(obj, '__module__', None))
+
+
+def resolve_sampling_policy_of_level(level, sampling_policy):
+    # sampling policy given to the decorator wins.
+    if sampling_policy is not None:
+        return sampling_policy
+    return LEVEL_SAMPLING_POLICIES[level]
+
+
+reset_checking_levels()
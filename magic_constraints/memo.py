@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals,
+)
+from builtins import *                  # noqa
+from future.builtins.disabled import *  # noqa
+
+import weakref
+from collections import namedtuple, OrderedDict
+
+from magic_constraints.exception import MagicSyntaxError
+
+
+# Memo of (id(value), type, sampling_policy) -> MemoEntry, recording that
+# value has been accepted by the type. frozenset is held by a weak reference
+# and its entry is dropped with it. tuple is held to keep its id from being
+# reused, hence the memo is bounded, by entries and by the total number of
+# elements of the values, and the oldest entry is evicted first.
+#
+# Only values that can never change are recorded: tuple and frozenset whose
+# elements are, transitively, tuple, frozenset or immutable scalars.
+# MappingProxyType is a live view of a dict, no mapping qualifies.
+IMMUTABLE_SCALAR_TYPES = frozenset(map(type, [
+    0, 2 ** 64, 0.0, 0j, True, None, '', b'',
+]))
+IMMUTABLE_CONTAINER_TYPES = frozenset([tuple, frozenset])
+
+MemoStats = namedtuple(
+    'MemoStats',
+    ['hits', 'misses', 'size', 'max_size', 'elements', 'max_elements'],
+)
+# 1. held: the value, or a weak reference to it.
+# 2. elements: transitive number of elements of the value.
+MemoEntry = namedtuple('MemoEntry', ['held', 'elements'])
+
+MEMO = OrderedDict()
+MEMO_MAX_SIZE = 1024
+MEMO_MAX_ELEMENTS = 2 ** 20
+MEMO_COUNTERS = {'hits': 0, 'misses': 0, 'elements': 0}
+
+
+def immutable_elements(value):
+    # transitive number of elements, None if value could change.
+    value_type = type(value)
+    if value_type in IMMUTABLE_SCALAR_TYPES:
+        return 0
+    if value_type not in IMMUTABLE_CONTAINER_TYPES:
+        return None
+
+    # 1. flat containers, C-level pass.
+    if IMMUTABLE_SCALAR_TYPES.issuperset(map(type, value)):
+        return len(value)
+    # 2. nested containers.
+    elements = len(value)
+    for element in value:
+        nested = immutable_elements(element)
+        if nested is None:
+            return None
+        elements += nested
+    return elements
+
+
+def deeply_immutable(value):
+    return immutable_elements(value) is not None
+
+
+def get_memo_stats():
+    return MemoStats(
+        MEMO_COUNTERS['hits'], MEMO_COUNTERS['misses'],
+        len(MEMO), MEMO_MAX_SIZE,
+        MEMO_COUNTERS['elements'], MEMO_MAX_ELEMENTS,
+    )
+
+
+def raise_on_invalid_bound(name, value):
+    if not isinstance(value, int) or value < 0:
+        raise MagicSyntaxError(
+            'invalid memo size.',
+            **{name: value}
+        )
+
+
+def set_memo_max_size(max_size, max_elements=None):
+    global MEMO_MAX_SIZE, MEMO_MAX_ELEMENTS
+
+    raise_on_invalid_bound('max_size', max_size)
+    if max_elements is not None:
+        raise_on_invalid_bound('max_elements', max_elements)
+        MEMO_MAX_ELEMENTS = max_elements
+    MEMO_MAX_SIZE = max_size
+    evict()
+
+
+def clear_memo():
+    MEMO.clear()
+    MEMO_COUNTERS['hits'] = 0
+    MEMO_COUNTERS['misses'] = 0
+    MEMO_COUNTERS['elements'] = 0
+
+
+def evict():
+    while len(MEMO) > MEMO_MAX_SIZE or\
+            MEMO_COUNTERS['elements'] > MEMO_MAX_ELEMENTS:
+        try:
+            _, entry = MEMO.popitem(last=False)
+        except KeyError:
+            # emptied by another thread.
+            break
+        MEMO_COUNTERS['elements'] -= entry.elements
+
+
+def forget(key, held):
+    # the frozenset is gone, its id may be reused.
+    entry = MEMO.get(key)
+    if entry is not None and entry.held is held:
+        try:
+            del MEMO[key]
+        except KeyError:
+            return
+        MEMO_COUNTERS['elements'] -= entry.elements
+
+
+def remember(key, value, elements):
+    if not MEMO_MAX_SIZE or elements > MEMO_MAX_ELEMENTS:
+        return
+    try:
+        held = weakref.ref(value, lambda held: forget(key, held))
+    except TypeError:
+        # tuple.
+        held = value
+
+    previous = MEMO.pop(key, None)
+    if previous is not None:
+        MEMO_COUNTERS['elements'] -= previous.elements
+    MEMO[key] = MemoEntry(held, elements)
+    MEMO_COUNTERS['elements'] += elements
+    evict()
+
+
+def held_value(held):
+    if isinstance(held, weakref.ref):
+        return held()
+    return held
+
+
+def lower_memoized(memo_type, checker):
+    # memo_type: the interned type, with the sampling policy applied.
+
+    def check_memoized(instance):
+        key = (id(instance), memo_type)
+        entry = MEMO.get(key)
+        if entry is not None and held_value(entry.held) is instance:
+            MEMO_COUNTERS['hits'] += 1
+            return True
+
+        MEMO_COUNTERS['misses'] += 1
+        if not checker(instance):
+            return False
+        elements = immutable_elements(instance)
+        if elements is not None:
+            remember(key, instance, elements)
+        return True
+
+    return check_memoized
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals,
+)
+from builtins import *                  # noqa
+from future.builtins.disabled import *  # noqa
+
+import os
+import time
+import threading
+from collections import OrderedDict
+
+
+# Opt-in instrumentation of the wrappers, resolved at decoration time like
+# the checking levels: functions decorated while metrics are disabled get
+# the plain wrappers, hence no overhead at all.
+#
+# MAGIC_CONSTRAINTS_METRICS=1 enables the metrics on import.
+METRICS_ENVIRON = 'MAGIC_CONSTRAINTS_METRICS'
+
+# readings of clock() are converted to nanoseconds on snapshot.
+try:
+    clock = time.perf_counter_ns
+    CLOCK_NS = 1
+except AttributeError:  # pragma: no cover
+    # Python < 3.7, seconds.
+    from timeit import default_timer
+    clock = default_timer
+    CLOCK_NS = 10 ** 9
+
+PHASES = ('arguments', 'body', 'return')
+
+# qualified name -> FunctionMetrics.
+FUNCTION_METRICS = OrderedDict()
+FUNCTION_METRICS_LOCK = threading.Lock()
+METRICS_SWITCH = {'enabled': False}
+
+
+class FunctionMetrics(object):
+
+    # counters are updated without locking, increments may be lost under
+    # heavy contention. totals and maxima are indexed as PHASES, in units
+    # of clock().
+    __slots__ = ('name', 'calls', 'totals', 'maxima', 'failures')
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.totals = [0] * len(PHASES)
+        self.maxima = [0] * len(PHASES)
+        self.failures = {}
+
+    def record(self, started, checked, returned, finished):
+        # inlined, it runs on every call.
+        self.calls += 1
+        totals = self.totals
+        maxima = self.maxima
+
+        elapsed = checked - started
+        totals[0] += elapsed
+        if elapsed > maxima[0]:
+            maxima[0] = elapsed
+
+        elapsed = returned - checked
+        totals[1] += elapsed
+        if elapsed > maxima[1]:
+            maxima[1] = elapsed
+
+        elapsed = finished - returned
+        totals[2] += elapsed
+        if elapsed > maxima[2]:
+            maxima[2] = elapsed
+
+    def record_failure(self, error):
+        self.calls += 1
+        name = type(error).__name__
+        self.failures[name] = self.failures.get(name, 0) + 1
+
+    def snapshot(self):
+        return {
+            'calls': self.calls,
+            'total_ns': dict(
+                (phase, int(total * CLOCK_NS))
+                for phase, total in zip(PHASES, self.totals)
+            ),
+            'max_ns': dict(
+                (phase, int(maximum * CLOCK_NS))
+                for phase, maximum in zip(PHASES, self.maxima)
+            ),
+            'failures': dict(self.failures),
+        }
+
+
+def set_metrics_enabled(enabled=True):
+    # affects the functions and classes decorated afterward.
+    METRICS_SWITCH['enabled'] = bool(enabled)
+
+
+def qualified_name(obj):
+    return '{0}.{1}'.format(
+        getattr(obj, '__module__', None),
+        getattr(obj, '__qualname__', getattr(obj, '__name__', repr(obj))),
+    )
+
+
+def metrics_of(obj, suffix=''):
+    # returns None if metrics are disabled.
+    if not METRICS_SWITCH['enabled']:
+        return None
+
+    name = qualified_name(obj) + suffix
+    with FUNCTION_METRICS_LOCK:
+        metrics = FUNCTION_METRICS.get(name)
+        if metrics is None:
+            metrics = FUNCTION_METRICS[name] = FunctionMetrics(name)
+    return metrics
+
+
+def get_metrics_snapshot():
+    with FUNCTION_METRICS_LOCK:
+        function_metrics = list(FUNCTION_METRICS.values())
+    return OrderedDict(
+        (metrics.name, metrics.snapshot()) for metrics in function_metrics
+    )
+
+
+def reset_metrics():
+    # counters of the decorated functions restart from zero.
+    with FUNCTION_METRICS_LOCK:
+        for metrics in FUNCTION_METRICS.values():
+            metrics.__init__(metrics.name)
+
+
+def escape_label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"')\
+        .replace('\n', '\\n')
+
+
+def format_sample(metric, labels, value):
+    return '{0}{{{1}}} {2}'.format(
+        metric,
+        ','.join(
+            '{0}="{1}"'.format(name, escape_label(label))
+            for name, label in labels
+        ),
+        value,
+    )
+
+
+def format_prometheus_metrics(snapshot=None):
+    # text exposition format.
+    if snapshot is None:
+        snapshot = get_metrics_snapshot()
+
+    families = [
+        ('magic_constraints_calls_total', 'counter',
+         'Calls of the decorated function.'),
+        ('magic_constraints_seconds_total', 'counter',
+         'Time spent in each phase of the calls.'),
+        ('magic_constraints_max_seconds', 'gauge',
+         'Longest time spent in each phase of a call.'),
+        ('magic_constraints_failures_total', 'counter',
+         'Failed checks by exception type.'),
+    ]
+    samples = dict((metric, []) for metric, _, _ in families)
+    for name, metrics in snapshot.items():
+        function = ('function', name)
+        samples['magic_constraints_calls_total'].append(
+            format_sample(
+                'magic_constraints_calls_total', [function],
+                metrics['calls'],
+            ),
+        )
+        for phase in PHASES:
+            labels = [function, ('phase', phase)]
+            samples['magic_constraints_seconds_total'].append(
+                format_sample(
+                    'magic_constraints_seconds_total', labels,
+                    repr(metrics['total_ns'][phase] / 1e9),
+                ),
+            )
+            samples['magic_constraints_max_seconds'].append(
+                format_sample(
+                    'magic_constraints_max_seconds', labels,
+                    repr(metrics['max_ns'][phase] / 1e9),
+                ),
+            )
+        for exception, count in sorted(metrics['failures'].items()):
+            samples['magic_constraints_failures_total'].append(
+                format_sample(
+                    'magic_constraints_failures_total',
+                    [function, ('exception', exception)],
+                    count,
+                ),
+            )
+
+    lines = []
+    for metric, metric_type, help_text in families:
+        lines.append('# HELP {0} {1}'.format(metric, help_text))
+        lines.append('# TYPE {0} {1}'.format(metric, metric_type))
+        lines.extend(samples[metric])
+    return '\n'.join(lines) + '\n'
+
+
+def write_prometheus_metrics(path):
+    # for the textfile collector of node_exporter, the file is replaced
+    # atomically.
+    temporary_path = '{0}.{1}.tmp'.format(path, os.getpid())
+    with open(temporary_path, 'w') as fout:
+        fout.write(format_prometheus_metrics())
+    getattr(os, 'replace', os.rename)(temporary_path, path)
+
+
+set_metrics_enabled(os.environ.get(METRICS_ENVIRON, '') not in ('', '0'))
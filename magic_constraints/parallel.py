@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals,
+)
+from builtins import *                  # noqa
+from future.builtins.disabled import *  # noqa
+
+import pickle
+import threading
+import multiprocessing
+from collections import namedtuple, OrderedDict
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    FIRST_COMPLETED,
+    wait,
+)
+from itertools import islice
+
+from magic_constraints.exception import MagicSyntaxError
+from magic_constraints.sampling import raise_on_invalid_count
+
+
+# Opt-in by Sequence[T].parallel(...), Set[T].parallel(...) and
+# Mapping[K, V].parallel(...). Containers with at least min_size elements
+# are split into chunks of chunk_size, checked in a pool of workers
+# (threads, or processes if processes is True), a few at a time. Pending
+# chunks are cancelled on the first failure.
+#
+# Smaller containers, and sampled checking, take the serial path.
+ParallelOptions = namedtuple(
+    'ParallelOptions',
+    ['min_size', 'chunk_size', 'workers', 'processes'],
+)
+
+# chunk: position of the chunk, index: position of the element in the
+# container. For mappings the element is the (key, value) pair.
+ParallelFailure = namedtuple('ParallelFailure', ['chunk', 'index', 'element'])
+
+DEFAULT_MIN_SIZE = 100000
+# chunks per worker if chunk_size is not given, for early stopping.
+CHUNKS_PER_WORKER = 4
+# chunks in flight per worker. The container is sliced as the chunks are
+# checked, a failure stops the slicing.
+CHUNKS_IN_FLIGHT_PER_WORKER = 2
+
+# (processes, workers) -> executor, shared by all types.
+EXECUTORS = {}
+EXECUTORS_LOCK = threading.Lock()
+
+# of the last check in the thread:
+# 1. failure: ParallelFailure, None if passed or checked serially.
+# 2. instance: the failing container until reported. Compared by identity,
+#    the reference keeps its id from being reused.
+LAST_FAILURE = threading.local()
+
+# element types -> (check_elements, check_element), per worker process.
+# The checkers hold the types, hence the cache is bounded and the oldest
+# entry is evicted first, for the dynamically created types to be freed.
+CHUNK_CHECKERS = OrderedDict()
+CHUNK_CHECKERS_MAX_SIZE = 64
+
+
+def raise_on_unpicklable(type_, element_types):
+    try:
+        pickle.dumps(element_types)
+    except Exception:
+        raise MagicSyntaxError(
+            'element types can not be sent to worker processes.',
+            type_=type_,
+            element_types=element_types,
+        )
+
+
+def make_parallel_options(type_, element_types, min_size, chunk_size,
+                          workers, processes):
+    if min_size is None:
+        min_size = DEFAULT_MIN_SIZE
+    raise_on_invalid_count('min_size', min_size, 1)
+    if chunk_size is not None:
+        raise_on_invalid_count('chunk_size', chunk_size, 1)
+    if workers is not None:
+        raise_on_invalid_count('workers', workers, 1)
+    if processes:
+        raise_on_unpicklable(type_, element_types)
+    return ParallelOptions(min_size, chunk_size, workers, bool(processes))
+
+
+def worker_count(options):
+    return options.workers or multiprocessing.cpu_count()
+
+
+def get_executor(options):
+    key = (options.processes, worker_count(options))
+    with EXECUTORS_LOCK:
+        executor = EXECUTORS.get(key)
+        if executor is None:
+            if options.processes:
+                executor = ProcessPoolExecutor(key[1])
+            else:
+                executor = ThreadPoolExecutor(key[1])
+            EXECUTORS[key] = executor
+    return executor
+
+
+def shutdown_parallel_executors():
+    with EXECUTORS_LOCK:
+        executors = list(EXECUTORS.values())
+        EXECUTORS.clear()
+    for executor in executors:
+        executor.shutdown()
+
+
+def get_parallel_failure():
+    return getattr(LAST_FAILURE, 'failure', None)
+
+
+def parallel_details(value):
+    # reported by the decorators, if the check of value failed in parallel.
+    # Releases the container.
+    instance = getattr(LAST_FAILURE, 'instance', None)
+    if instance is None:
+        return {}
+    LAST_FAILURE.instance = None
+    if instance is not value:
+        return {}
+    return {'parallel_failure': LAST_FAILURE.failure}
+
+
+def lower_chunk(element_types):
+    checkers = CHUNK_CHECKERS.get(element_types)
+    if checkers is not None:
+        return checkers
+
+    if len(element_types) == 1:
+        lowered = lower_type(element_types[0])
+        check_elements = lower_elements(lowered)
+        check_element = to_checker(lowered)
+    else:
+        # (key, value) pairs.
+        key_lowered, val_lowered = map(lower_type, element_types)
+        check_elements = lower_pairs(key_lowered, val_lowered)
+
+        def check_element(pair):
+            return check_elements((pair,))
+
+    checkers = CHUNK_CHECKERS[element_types] = (check_elements, check_element)
+    while len(CHUNK_CHECKERS) > CHUNK_CHECKERS_MAX_SIZE:
+        try:
+            CHUNK_CHECKERS.popitem(last=False)
+        except KeyError:
+            # emptied by another thread.
+            break
+    return checkers
+
+
+def check_chunk(element_types, chunk):
+    # runs in the workers, returns the offset of the first failing element
+    # in chunk, None if passed.
+    check_elements, check_element = lower_chunk(element_types)
+    if check_elements is None or check_elements(chunk):
+        return None
+    for offset, element in enumerate(chunk):
+        if not check_element(element):
+            return offset
+    return None
+
+
+def split_chunks(elements, chunk_size):
+    iterator = iter(elements)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def submit_chunks(executor, element_types, chunks, count, futures):
+    # submits up to count chunks, returns the set of new futures.
+    submitted = set()
+    for position, chunk in islice(chunks, count):
+        future = executor.submit(check_chunk, element_types, chunk)
+        futures[future] = (position, chunk)
+        submitted.add(future)
+    return submitted
+
+
+def find_failure(element_types, elements, length, options):
+    workers = worker_count(options)
+    chunk_size = options.chunk_size or max(
+        1, -(-length // (workers * CHUNKS_PER_WORKER)),
+    )
+    in_flight = workers * CHUNKS_IN_FLIGHT_PER_WORKER
+    executor = get_executor(options)
+    chunks = enumerate(split_chunks(elements, chunk_size))
+
+    futures = {}
+    pending = submit_chunks(
+        executor, element_types, chunks, in_flight, futures,
+    )
+    failures = []
+    while pending and not failures:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            position, chunk = futures.pop(future)
+            offset = future.result()
+            if offset is not None:
+                failures.append(ParallelFailure(
+                    position, position * chunk_size + offset, chunk[offset],
+                ))
+        if not failures:
+            pending |= submit_chunks(
+                executor, element_types, chunks, in_flight - len(pending),
+                futures,
+            )
+    for future in pending:
+        future.cancel()
+
+    # report the first failing element among the finished chunks.
+    return min(failures) if failures else None
+
+
+def lower_parallel_elements(options, element_types, check_serial,
+                            select_elements):
+    # select_elements: container -> iterable of the checked elements.
+
+    def check_parallel(instance):
+        LAST_FAILURE.failure = LAST_FAILURE.instance = None
+        length = len(instance)
+        if length < options.min_size:
+            return check_serial(instance)
+
+        failure = find_failure(
+            element_types, select_elements(instance), length, options,
+        )
+        if failure is None:
+            return True
+        LAST_FAILURE.failure = failure
+        LAST_FAILURE.instance = instance
+        return False
+
+    return check_parallel
+
+
+from magic_constraints.compiler import (  # noqa
+    lower_elements,
+    lower_pairs,
+    lower_type,
+    to_checker,
+)
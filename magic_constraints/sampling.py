@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals,
+)
+from builtins import *                  # noqa
+from future.builtins.disabled import *  # noqa
+
+import random
+from collections import namedtuple
+from itertools import islice
+
+from magic_constraints.exception import MagicSyntaxError
+
+
+# Sampling policies decide which elements of a container are inspected.
+# Policies are immutable and hashable, since they are part of the
+# interning key of specialized MagicTypes.
+def sized_length(container):
+    try:
+        return len(container)
+    except TypeError:
+        return 0
+
+
+def raise_on_invalid_count(name, value, minimum):
+    if not isinstance(value, int) or value < minimum:
+        raise MagicSyntaxError(
+            'invalid count.',
+            name=name,
+            value=value,
+            minimum=minimum,
+        )
+
+
+class Full(namedtuple('Full', [])):
+
+    __slots__ = ()
+
+    def select(self, elements):
+        return elements
+
+    def inspected(self, container):
+        return sized_length(container)
+
+
+class First(namedtuple('First', ['size'])):
+
+    __slots__ = ()
+
+    def __new__(cls, size):
+        raise_on_invalid_count('size', size, 0)
+        return super(First, cls).__new__(cls, size)
+
+    def select(self, elements):
+        return islice(elements, self.size)
+
+    def inspected(self, container):
+        return min(self.size, sized_length(container))
+
+
+class Random(namedtuple('Random', ['size', 'seed'])):
+
+    __slots__ = ()
+
+    def __new__(cls, size, seed=0):
+        raise_on_invalid_count('size', size, 0)
+        return super(Random, cls).__new__(cls, size, seed)
+
+    def select(self, elements):
+        # support indexing?
+        if not hasattr(type(elements), '__getitem__'):
+            elements = list(elements)
+
+        length = len(elements)
+        if length <= self.size:
+            return elements
+
+        indices = random.Random(self.seed).sample(range(length), self.size)
+        indices.sort()
+        return (elements[i] for i in indices)
+
+    def inspected(self, container):
+        return min(self.size, sized_length(container))
+
+
+class Stride(namedtuple('Stride', ['step'])):
+
+    __slots__ = ()
+
+    def __new__(cls, step):
+        raise_on_invalid_count('step', step, 1)
+        return super(Stride, cls).__new__(cls, step)
+
+    def select(self, elements):
+        return islice(elements, 0, None, self.step)
+
+    def inspected(self, container):
+        return -(-sized_length(container) // self.step)
+
+
+SAMPLING_POLICY_TYPES = (Full, First, Random, Stride)
+
+
+def raise_on_non_sampling_policy(policy):
+    if not isinstance(policy, SAMPLING_POLICY_TYPES):
+        raise MagicSyntaxError(
+            'require sampling policy.',
+            policy=policy,
+        )
+
+
+DEFAULT_SAMPLING_POLICY = None
+
+
+def get_default_sampling_policy():
+    return DEFAULT_SAMPLING_POLICY
+
+
+def set_default_sampling_policy(policy):
+    global DEFAULT_SAMPLING_POLICY
+
+    # None restores full checking.
+    if policy is not None:
+        raise_on_non_sampling_policy(policy)
+    DEFAULT_SAMPLING_POLICY = policy
+
+    # isinstance should pick up the new default.
+    clear_checker_caches()
+
+
+def selects_nothing(policy):
+    # First(0), only the container itself is checked.
+    return isinstance(policy, First) and not policy.size
+
+
+def resolve_sampling_policy(own, inherited):
+    # 1. the policy of a specialization overrides the inherited one.
+    # 2. Full is the same as no sampling.
+    policy = own if own is not None else inherited
+    return None if isinstance(policy, Full) else policy
+
+
+from magic_constraints.types import clear_checker_caches  # noqa
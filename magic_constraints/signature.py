@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals,
+)
+from builtins import *                  # noqa
+from future.builtins.disabled import *  # noqa
+
+from collections import namedtuple, OrderedDict
+from types import FunctionType
+
+try:
+    from inspect import signature as native_signature
+    from inspect import Parameter as SigParameter
+except ImportError:  # pragma: no cover
+    # Python 2.
+    from funcsigs import signature as native_signature
+    from funcsigs import Parameter as SigParameter
+
+
+# Signatures of the decorated functions, read from __code__, __defaults__
+# and __annotations__ for plain functions, from the native signature()
+# otherwise.
+#
+# 1. parameters: tuple of SignatureParameter, kind is one of the kinds of
+#    SigParameter.
+# 2. return_annotation: SigParameter.empty if not annotated.
+FunctionSignature = namedtuple(
+    'FunctionSignature',
+    ['parameters', 'return_annotation'],
+)
+SignatureParameter = namedtuple(
+    'SignatureParameter',
+    ['name', 'kind', 'annotation', 'default'],
+)
+
+# flags of code objects.
+CO_VARARGS = 0x04
+CO_VARKEYWORDS = 0x08
+
+# (code, defaults, annotations) -> FunctionSignature. Defaults and
+# annotations are keyed by id, the cached signature holds the objects to
+# keep their ids from being reused. Bounded, the oldest entry is evicted
+# first.
+SIGNATURE_CACHE = OrderedDict()
+SIGNATURE_CACHE_MAX_SIZE = 4096
+
+
+def plain_function(function):
+    # __wrapped__ and __signature__ are honoured by the native signature().
+    return type(function) is FunctionType and\
+        not hasattr(function, '__wrapped__') and\
+        not hasattr(function, '__signature__')
+
+
+def signature_key(function):
+    annotations = getattr(function, '__annotations__', None) or {}
+    return (
+        function.__code__,
+        tuple(map(id, function.__defaults__ or ())),
+        tuple(
+            (name, id(default))
+            for name, default in (
+                getattr(function, '__kwdefaults__', None) or {}
+            ).items()
+        ),
+        tuple(
+            (name, id(annotation))
+            for name, annotation in annotations.items()
+        ),
+    )
+
+
+def signature_from_code(function):
+    code = function.__code__
+    names = code.co_varnames
+    defaults = function.__defaults__ or ()
+    kwdefaults = getattr(function, '__kwdefaults__', None) or {}
+    annotations = getattr(function, '__annotations__', None) or {}
+    empty = SigParameter.empty
+
+    # Python 3.8+.
+    positional_only_count = getattr(code, 'co_posonlyargcount', 0)
+    positional_count = code.co_argcount
+    keyword_only_count = getattr(code, 'co_kwonlyargcount', 0)
+    start_of_defaults = positional_count - len(defaults)
+
+    parameters = []
+    # 1. positional.
+    for index in range(positional_count):
+        name = names[index]
+        if index < positional_only_count:
+            kind = SigParameter.POSITIONAL_ONLY
+        else:
+            kind = SigParameter.POSITIONAL_OR_KEYWORD
+        if index >= start_of_defaults:
+            default = defaults[index - start_of_defaults]
+        else:
+            default = empty
+        parameters.append(SignatureParameter(
+            name, kind, annotations.get(name, empty), default,
+        ))
+
+    # 2. *args, keyword-only, **kwargs. Keyword-only names precede the
+    #    names of *args and **kwargs in co_varnames.
+    index = positional_count + keyword_only_count
+    if code.co_flags & CO_VARARGS:
+        name = names[index]
+        parameters.append(SignatureParameter(
+            name, SigParameter.VAR_POSITIONAL,
+            annotations.get(name, empty), empty,
+        ))
+        index += 1
+
+    for name in names[positional_count:positional_count + keyword_only_count]:
+        parameters.append(SignatureParameter(
+            name, SigParameter.KEYWORD_ONLY,
+            annotations.get(name, empty), kwdefaults.get(name, empty),
+        ))
+
+    if code.co_flags & CO_VARKEYWORDS:
+        name = names[index]
+        parameters.append(SignatureParameter(
+            name, SigParameter.VAR_KEYWORD,
+            annotations.get(name, empty), empty,
+        ))
+
+    return FunctionSignature(
+        tuple(parameters), annotations.get('return', empty),
+    )
+
+
+def signature_from_native(function):
+    native = native_signature(function)
+    return FunctionSignature(
+        tuple(
+            SignatureParameter(
+                parameter.name, parameter.kind,
+                parameter.annotation, parameter.default,
+            )
+            for parameter in native.parameters.values()
+        ),
+        native.return_annotation,
+    )
+
+
+def signature_of(function):
+    if not plain_function(function):
+        return signature_from_native(function)
+
+    key = signature_key(function)
+    function_signature = SIGNATURE_CACHE.get(key)
+    if function_signature is None:
+        function_signature = signature_from_code(function)
+        if SIGNATURE_CACHE_MAX_SIZE:
+            SIGNATURE_CACHE[key] = function_signature
+            while len(SIGNATURE_CACHE) > SIGNATURE_CACHE_MAX_SIZE:
+                try:
+                    SIGNATURE_CACHE.popitem(last=False)
+                except KeyError:
+                    # emptied by another thread.
+                    break
+    return function_signature
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals,
+)
+from builtins import *                  # noqa
+from future.builtins.disabled import *  # noqa
+
+import os
+import threading
+import weakref
+from functools import update_wrapper
+
+from magic_constraints.exception import MagicError
+
+from magic_constraints.codegen import (
+    iscoroutinefunction,
+    build_function,
+    coroutine_function,
+)
+
+
+# Lazy decoration: the decorators return a trampoline, the constraints
+# package and the wrapper are built on the first call, or by warmup().
+# Declaration errors are raised on the first call as well.
+#
+# MAGIC_CONSTRAINTS_LAZY=1 enables it on import, lazy= given to the
+# decorator wins.
+LAZY_ENVIRON = 'MAGIC_CONSTRAINTS_LAZY'
+LAZY_SWITCH = {'enabled': False}
+
+# builds are rare, a single reentrant lock is enough.
+BUILD_LOCK = threading.RLock()
+# LazyBuild not built yet.
+PENDING_BUILDS = weakref.WeakSet()
+
+
+def set_lazy_decoration(enabled=True):
+    # affects the functions and classes decorated afterward.
+    LAZY_SWITCH['enabled'] = bool(enabled)
+
+
+def lazy_decoration_of(options):
+    lazy = options.get('lazy')
+    if lazy is None:
+        return LAZY_SWITCH['enabled']
+    return bool(lazy)
+
+
+# factories of the trampolines, compiled once. target[0] is replaced by the
+# wrapper once built.
+def trampoline_factory(definition, call):
+    return build_function(
+        'factory',
+        [
+            'def factory(target):',
+            '    {0} trampoline(*args, **kwargs):'.format(definition),
+            '        return {0}target[0](*args, **kwargs)'.format(call),
+            '    return trampoline',
+        ],
+        {},
+        '<magic_constraints trampoline>',
+    )
+
+
+TRAMPOLINE_FACTORY = trampoline_factory('def', '')
+if iscoroutinefunction is not None:
+    ASYNC_TRAMPOLINE_FACTORY = trampoline_factory('async def', 'await ')
+
+
+class LazyBuild(object):
+
+    # 1. target: of the trampoline.
+    # 2. build: returns the wrapper.
+    # 3. on_built: called with the wrapper, under the lock.
+    __slots__ = ('target', 'build', 'on_built', '__weakref__')
+
+    def __init__(self, build, on_built):
+        self.target = [self.first_call]
+        self.build = build
+        self.on_built = on_built
+
+    def get(self):
+        with BUILD_LOCK:
+            if self.build is not None:
+                wrapper = self.build()
+                self.on_built(wrapper)
+                self.target[0] = wrapper
+                self.build = self.on_built = None
+                PENDING_BUILDS.discard(self)
+            return self.target[0]
+
+    def first_call(self, *args, **kwargs):
+        return self.get()(*args, **kwargs)
+
+
+def generate_trampoline(function, build, on_built):
+    lazy_build = LazyBuild(build, on_built)
+    if coroutine_function(function):
+        trampoline = ASYNC_TRAMPOLINE_FACTORY(lazy_build.target)
+    else:
+        trampoline = TRAMPOLINE_FACTORY(lazy_build.target)
+
+    PENDING_BUILDS.add(lazy_build)
+    return trampoline, lazy_build
+
+
+def lazy_function_wrapper(function, build, batch_functions):
+    # attributes of the wrapper replace the ones of the trampoline once
+    # built.
+    trampoline, lazy_build = generate_trampoline(
+        function, build,
+        lambda wrapper: trampoline.__dict__.update(wrapper.__dict__),
+    )
+    update_wrapper(trampoline, function)
+
+    if batch_functions:
+        trampoline.check_batch = lambda rows: lazy_build.get().check_batch(
+            rows,
+        )
+        if coroutine_function(function):
+            trampoline.map_checked = None
+        else:
+            trampoline.map_checked = lambda rows: lazy_build.get()\
+                .map_checked(rows)
+    return trampoline
+
+
+def lazy_class_init(user_defined_class, build):
+    # the class gets the __init__ wrapper itself once built.
+    trampoline, _ = generate_trampoline(
+        user_defined_class.__init__, build,
+        lambda init: setattr(user_defined_class, '__init__', init),
+    )
+    return trampoline
+
+
+def decorate(function, build, options, batch_functions=True):
+    if not lazy_decoration_of(options):
+        return build()
+    return lazy_function_wrapper(function, build, batch_functions)
+
+
+def warmup():
+    # builds every pending wrapper, returns the number of builds. Failed
+    # builds are no longer pending, they raise again on their first call,
+    # and are reported together.
+    errors = []
+    with BUILD_LOCK:
+        lazy_builds = list(PENDING_BUILDS)
+        for lazy_build in lazy_builds:
+            try:
+                lazy_build.get()
+            except Exception as error:
+                PENDING_BUILDS.discard(lazy_build)
+                errors.append(error)
+
+    if errors:
+        raise MagicError(
+            'lazy decoration failed.',
+            errors=errors,
+            built=len(lazy_builds) - len(errors),
+        )
+    return len(lazy_builds)
+
+
+set_lazy_decoration(os.environ.get(LAZY_ENVIRON, '') not in ('', '0'))
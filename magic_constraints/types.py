@@ -6,21 +6,42 @@ from builtins import *                  # noqa
 from future.builtins.disabled import *  # noqa
 from future.utils import with_metaclass
 
+import sys
+import array
+import pickle
+import importlib
+import weakref
+try:
+    import copyreg
+except ImportError:  # pragma: no cover
+    # Python 2.
+    import copy_reg as copyreg
 from abc import ABCMeta
+try:
+    from abc import get_cache_token
+except ImportError:  # pragma: no cover
+    # Python 2.
+    def get_cache_token():
+        return ABCMeta._abc_invalidation_counter
 # collections.abc dosn't esist in Python 2.x.
 import collections as abc
 
 from magic_constraints.utils import (
     type_object, nontype_object,
     conditional_to_bytes, conditional_repr,
+    return_false,
 )
 
 from magic_constraints.exception import (
-    MagicTypeError, MagicIndexError
+    MagicSyntaxError, MagicTypeError, MagicIndexError
 )
 
 
-def meta_create_class(prefix, classname, baseclass, generator_cls):
+INJECTED_FUNCTIONS_CACHE = {}
+METACLASS_CACHE = {}
+
+
+def collect_injected_functions(prefix, generator_cls):
 
     injected_functions = {}
     for name in dir(generator_cls):
@@ -34,20 +55,42 @@ def meta_create_class(prefix, classname, baseclass, generator_cls):
         # remove prefix.
         injected_functions[name[len(prefix):]] = function
 
-    return type(
-        conditional_to_bytes(classname), (baseclass,), injected_functions,
+    return injected_functions
+
+
+def meta_create_class(prefix, classname, baseclass, generator_cls,
+                      metaclass=type):
+
+    # walking dir(generator_cls) is expensive, do it once per generator.
+    cache_key = (prefix, generator_cls)
+    injected_functions = INJECTED_FUNCTIONS_CACHE.get(cache_key)
+    if injected_functions is None:
+        injected_functions = collect_injected_functions(prefix, generator_cls)
+        INJECTED_FUNCTIONS_CACHE[cache_key] = injected_functions
+
+    return metaclass(
+        conditional_to_bytes(classname),
+        (baseclass,),
+        dict(injected_functions),
     )
 
 
 def create_metaclass(baseclass, generator_cls):
-    return meta_create_class(
-        '_metaclass_', 'MetaMagicClass', baseclass, generator_cls,
-    )
+    # all MagicTypes created by the same generator share one metaclass.
+    MetaMagicType = METACLASS_CACHE.get(generator_cls)
+    if MetaMagicType is None:
+        MetaMagicType = meta_create_class(
+            '_metaclass_', 'MetaMagicClass', baseclass, generator_cls,
+        )
+        # MagicTypes are created on the fly, pickle them as recipes.
+        copyreg.pickle(MetaMagicType, reduce_magic_type)
+        METACLASS_CACHE[generator_cls] = MetaMagicType
+    return MetaMagicType
 
 
-def create_class(baseclass, generator_cls):
+def create_class(baseclass, generator_cls, metaclass):
     return meta_create_class(
-        '_class_', 'MagicClass', baseclass, generator_cls,
+        '_class_', 'MagicClass', baseclass, generator_cls, metaclass,
     )
 
 
@@ -60,48 +103,258 @@ def safe_getmethod(cls, name):
     return method if method else do_nothing
 
 
+# specialized MagicTypes are interned, i.e. Sequence[int] is Sequence[int].
+# 1. STATIC_SPECIALIZATION_CACHE holds the specializations built only from
+#    long-living types (builtins, module-level classes).
+# 2. DYNAMIC_SPECIALIZATION_CACHE holds the rest, weakly. Otherwise classes
+#    created on the fly by the user would never be released.
+STATIC_SPECIALIZATION_CACHE = {}
+DYNAMIC_SPECIALIZATION_CACHE = weakref.WeakValueDictionary()
+
+# Py_TPFLAGS_HEAPTYPE.
+HEAPTYPE_FLAG = 1 << 9
+
+
+class ListMarker(object):
+    pass
+
+
+def freeze_type_decl(type_decl):
+    # list is used in Callable[[T, ...], T]. Mark it to distinguish
+    # Sequence[[int]] (invalid) from Sequence[int, ] (valid).
+    if isinstance(type_decl, type):
+        return type_decl
+    elif isinstance(type_decl, list):
+        return (ListMarker,) + tuple(map(freeze_type_decl, type_decl))
+    elif isinstance(type_decl, tuple):
+        return tuple(map(freeze_type_decl, type_decl))
+    else:
+        return type_decl
+
+
+def static_type_object(obj):
+    if isinstance(obj, BasicMetaMagicType):
+        return obj.static
+
+    # builtins.
+    if not getattr(obj, '__flags__', HEAPTYPE_FLAG) & HEAPTYPE_FLAG:
+        return True
+
+    # module-level classes.
+    module = sys.modules.get(getattr(obj, '__module__', None))
+    return getattr(module, getattr(obj, '__name__', ''), None) is obj
+
+
+def static_type_decl(frozen_type_decl):
+    if isinstance(frozen_type_decl, tuple):
+        return all(map(static_type_decl, frozen_type_decl))
+    elif type_object(frozen_type_decl):
+        return static_type_object(frozen_type_decl)
+    else:
+        # Ellipsis.
+        return True
+
+
+def lookup_specialization(key):
+    ret_cls = STATIC_SPECIALIZATION_CACHE.get(key)
+    if ret_cls is None:
+        ret_cls = DYNAMIC_SPECIALIZATION_CACHE.get(key)
+    return ret_cls
+
+
+def intern_specialization(key, ret_cls):
+    if ret_cls.static:
+        return STATIC_SPECIALIZATION_CACHE.setdefault(key, ret_cls)
+    else:
+        return DYNAMIC_SPECIALIZATION_CACHE.setdefault(key, ret_cls)
+
+
 class BasicMagicType(object):
     pass
 
 
-class BasicMetaMagicType(ABCMeta):
+def specialize(cls, type_decl, options):
+    # options: sorted tuple of (name, value), set as attributes of the
+    # specialized MagicType.
+    try:
+        frozen_type_decl = freeze_type_decl(type_decl)
+        key = (cls.generator_cls, cls.main_cls, frozen_type_decl, options)
+        ret_cls = lookup_specialization(key)
+    except TypeError:
+        # unhashable, skip the cache.
+        key = None
+        ret_cls = None
 
-    def __getitem__(cls, type_decl):
+    if ret_cls is not None:
+        return ret_cls
 
-        if not safe_getmethod(cls, 'check_getitem_type_decl')(type_decl):
-            raise MagicTypeError(
-                'invalid type.',
-                type_decl=type_decl,
-            )
+    if not safe_getmethod(cls, 'check_getitem_type_decl')(type_decl):
+        raise MagicTypeError(
+            'invalid type.',
+            type_decl=type_decl,
+        )
+
+    ret_cls = cls.generator_cls(cls.main_cls)
+    ret_cls.partial_cls = type_decl
+    ret_cls.options = options
+    for name, value in options:
+        setattr(ret_cls, name, value)
 
-        ret_cls = cls.generator_cls(cls.main_cls)
-        ret_cls.partial_cls = type_decl
+    if key is None:
+        ret_cls.static = False
         return ret_cls
 
-    def __subclasscheck__(cls, subclass):
-        if nontype_object(subclass):
-            return False
+    ret_cls.static = static_type_decl(frozen_type_decl)
+    return intern_specialization(key, ret_cls)
 
-        if not safe_getmethod(cls, 'check_subclass')(subclass):
-            return False
 
-        # corner case, subclass isn't MagicType.
-        if not issubclass(subclass, BasicMagicType):
-            return issubclass(subclass, cls.main_cls)
+def derive_specialization(cls, **options):
+    if cls.partial_cls is None:
+        raise MagicSyntaxError(
+            'require specialized type.',
+            type_=cls,
+            options=options,
+        )
+
+    merged = dict(cls.options)
+    merged.update(options)
+    return specialize(
+        cls, cls.partial_cls, tuple(sorted(merged.items())),
+    )
+
 
-        # subclass is MagicType.
-        if cls.partial_cls or subclass.partial_cls:
-            # if subclass has partial_cls, return False.
+def parallelized(cls, element_types, min_size, chunk_size, workers,
+                 processes):
+    return derive_specialization(
+        cls,
+        parallel_options=make_parallel_options(
+            cls, element_types, min_size, chunk_size, workers, processes,
+        ),
+    )
+
+
+def lower_parallel_container(cls, sampling_policy, element_types,
+                             check_content, select_elements):
+    # sampled checking stays serial.
+    if cls.parallel_options is None or check_content is None or\
+            sampling_policy is not None:
+        return check_content
+    return lower_parallel_elements(
+        cls.parallel_options, element_types, check_content, select_elements,
+    )
+
+
+def select_items(mapping):
+    return mapping.items()
+
+
+# (generator_cls, main_cls) -> unspecialized MagicType bound to a module-level
+# name, such as Sequence.
+WELL_KNOWN_TYPES = {}
+
+
+def name_well_known_types(module_name, namespace):
+    for name, obj in list(namespace.items()):
+        if isinstance(obj, BasicMetaMagicType) and obj.partial_cls is None:
+            obj.well_known_name = (module_name, name)
+            WELL_KNOWN_TYPES[(obj.generator_cls, obj.main_cls)] = obj
+
+
+def load_well_known_type(module_name, name):
+    return getattr(importlib.import_module(module_name), name)
+
+
+def load_specialization(base, type_decl, options):
+    # interned, unpickled Sequence[int] is Sequence[int].
+    return specialize(base, type_decl, options)
+
+
+def reduce_magic_type(cls):
+    # recipes:
+    # 1. Sequence -> (module name, name).
+    # 2. Sequence[int].sampled(...) -> (Sequence, int, options).
+    if cls.partial_cls is None:
+        if cls.well_known_name is None:
+            raise pickle.PicklingError(
+                'can not pickle {0!r}, not bound to a module-level name.'
+                .format(cls),
+            )
+        return load_well_known_type, cls.well_known_name
+
+    base = WELL_KNOWN_TYPES.get((cls.generator_cls, cls.main_cls))
+    if base is None:
+        raise pickle.PicklingError(
+            'can not pickle {0!r}, unknown generator.'.format(cls),
+        )
+    return load_specialization, (base, cls.partial_cls, cls.options)
+
+
+# array.array is registered as a MutableSequence by the standard library
+# since Python 3.10 only. It is recognized by the magic types instead of
+# registering it, which would change the ABC for the whole process.
+ARRAY_ABCS = (abc.Sequence, abc.MutableSequence)
+
+
+def check_magic_subclass(cls, subclass):
+    if not safe_getmethod(cls, 'check_subclass')(subclass):
+        return False
+
+    # corner case, subclass isn't MagicType.
+    if not issubclass(subclass, BasicMagicType):
+        return issubclass(subclass, cls.main_cls) or (
+            cls.main_cls in ARRAY_ABCS and issubclass(subclass, array.array)
+        )
+
+    # subclass is MagicType.
+    if cls.partial_cls or subclass.partial_cls:
+        # if subclass has partial_cls, return False.
+        return False
+    else:
+        # 1. subclass is normal type object.
+        # 2. subclass is a MagicType.
+        return issubclass(subclass.main_cls, cls.main_cls)
+
+
+def memoized_subclass_check(cls, subclass, check):
+    # verdicts of check(cls, subclass) are cached in the class, as
+    # (abc cache token, {subclass: verdict}) with weak keys. ABCMeta.register
+    # bumps the token, which drops the cached verdicts.
+    token = get_cache_token()
+    cache_token, cache = vars(cls).get('subclass_check_cache', (None, None))
+    if cache_token != token:
+        cache = weakref.WeakKeyDictionary()
+        setattr(cls, 'subclass_check_cache', (token, cache))
+
+    try:
+        return cache[subclass]
+    except KeyError:
+        pass
+    except TypeError:
+        # not weak referenceable.
+        return check(cls, subclass)
+
+    verdict = cache[subclass] = check(cls, subclass)
+    return verdict
+
+
+class BasicMetaMagicType(ABCMeta):
+
+    def __getitem__(cls, type_decl):
+        return specialize(cls, type_decl, ())
+
+    def __subclasscheck__(cls, subclass):
+        if nontype_object(subclass):
             return False
-        else:
-            # 1. subclass is normal type object.
-            # 2. subclass is a MagicType.
-            return issubclass(subclass.main_cls, cls.main_cls)
+        return memoized_subclass_check(cls, subclass, check_magic_subclass)
 
     def __instancecheck__(cls, instance):
-        return safe_getmethod(cls, 'check_instance')(instance)
+        if cls.checker_cache is None:
+            cls.checker_cache = compile_type(cls)
+        return cls.checker_cache(instance)
 
     def __repr__(cls):
+        if cls.repr_cache is not None:
+            return cls.repr_cache
 
         name = conditional_repr(cls.main_cls)
         if cls.partial_cls:
@@ -116,8 +369,24 @@ class BasicMetaMagicType(ABCMeta):
             name = '{0}[{1}]'.format(
                 name, partial,
             )
+        if cls.sampling_policy is not None:
+            name = '{0}.sampled({1!r})'.format(name, cls.sampling_policy)
+        if cls.memoize:
+            name = '{0}.memoized()'.format(name)
+        if cls.lazy_checking:
+            name = '{0}.lazy()'.format(name)
+        if cls.parallel_options is not None:
+            name = '{0}.parallel({1})'.format(name, ', '.join(
+                '{0}={1!r}'.format(field, value)
+                for field, value in zip(
+                    cls.parallel_options._fields, cls.parallel_options,
+                )
+            ))
+        if getattr(cls, 'batch_size', None) is not None:
+            name = '{0}.batched({1})'.format(name, cls.batch_size)
 
-        return conditional_to_bytes(name)
+        cls.repr_cache = conditional_to_bytes(name)
+        return cls.repr_cache
 
 
 # 1. _metaclass_{name} -> {name} in metaclass.
@@ -130,17 +399,37 @@ class MagicTypeGenerator(type):
             generator_cls,
         )
         MagicType = create_class(
-            with_metaclass(MetaMagicType, BasicMagicType),
+            BasicMagicType,
             generator_cls,
+            MetaMagicType,
         )
 
         MagicType.generator_cls = generator_cls
         MagicType.main_cls = ABC
         MagicType.partial_cls = None
-
+        MagicType.static = True
+        MagicType.options = ()
+        MagicType.sampling_policy = None
+        MagicType.memoize = False
+        MagicType.lazy_checking = False
+        MagicType.parallel_options = None
+        MagicType.well_known_name = None
+        MagicType.repr_cache = None
+        MagicType.checker_cache = None
+
+        MAGIC_TYPES.add(MagicType)
         return MagicType
 
 
+# all MagicTypes, to invalidate the compiled checkers.
+MAGIC_TYPES = weakref.WeakSet()
+
+
+def clear_checker_caches():
+    for magic_type in list(MAGIC_TYPES):
+        magic_type.checker_cache = None
+
+
 def check_type_of_instance(cls, instance):
     return any(
         issubclass(T, cls)
@@ -158,12 +447,17 @@ def check_getitem_tuple(type_decl, n):
 
 def generate_immutable_abc(supercls, mutable_subclass):
 
+    def check_immutable_subclass(cls, subclass):
+        if not issubclass(subclass, supercls):
+            return False
+        return not issubclass(subclass, mutable_subclass)
+
     class ABCImmutableMeta(ABCMeta):
 
         def __subclasscheck__(cls, subclass):
-            if not issubclass(subclass, supercls):
-                return False
-            return not issubclass(subclass, mutable_subclass)
+            return memoized_subclass_check(
+                cls, subclass, check_immutable_subclass,
+            )
 
     class ABCImmutable(with_metaclass(ABCImmutableMeta, object)):
         pass
@@ -174,6 +468,16 @@ def generate_immutable_abc(supercls, mutable_subclass):
     return ABCImmutable
 
 
+def raise_on_non_lazy_type(cls, mutable_abc):
+    # views are read-only.
+    if cls.partial_cls and not issubclass(cls.main_cls, mutable_abc):
+        return
+    raise MagicSyntaxError(
+        'require specialized read-only type.',
+        type_=cls,
+    )
+
+
 class SequenceGenerator(MagicTypeGenerator):
 
     def _metaclass_check_getitem_type_decl(cls, type_decl):
@@ -208,6 +512,76 @@ class SequenceGenerator(MagicTypeGenerator):
 
         return True
 
+    def _metaclass_lower(cls, sampling_policy=None):
+        if not cls.partial_cls:
+            return lower_container(cls, None)
+
+        sampling_policy = resolve_sampling_policy(
+            cls.sampling_policy, sampling_policy,
+        )
+        if type_object(cls.partial_cls):
+            lowered = lower_type(cls.partial_cls, sampling_policy)
+            check_content = lower_parallel_container(
+                cls, sampling_policy, (cls.partial_cls,),
+                lower_elements(lowered, sampling_policy), iter,
+            )
+            if check_content:
+                check_content = lower_buffer_elements(lowered, check_content)
+        else:
+            lowered_list = [
+                lower_type(T, sampling_policy) for T in cls.partial_cls
+            ]
+            check_content = lower_fixed_elements(
+                lowered_list, sampling_policy,
+            )
+            if not selects_nothing(sampling_policy):
+                check_content = lower_fixed_buffer_elements(
+                    lowered_list, check_content,
+                )
+        return lower_memoized_container(
+            cls, sampling_policy, lower_container(cls, check_content),
+        )
+
+    def _metaclass_sampled(cls, sampling_policy):
+        raise_on_non_sampling_policy(sampling_policy)
+        return derive_specialization(cls, sampling_policy=sampling_policy)
+
+    def _metaclass_memoized(cls):
+        return derive_specialization(cls, memoize=True)
+
+    def _metaclass_parallel(cls, min_size=None, chunk_size=None,
+                            workers=None, processes=False):
+        if not type_object(cls.partial_cls):
+            raise MagicSyntaxError(
+                'require Sequence[T].',
+                type_=cls,
+            )
+        return parallelized(
+            cls, (cls.partial_cls,), min_size, chunk_size, workers, processes,
+        )
+
+    def _metaclass_checked(cls, iterable=()):
+        if not type_object(cls.partial_cls):
+            raise MagicSyntaxError(
+                'require Sequence[T].',
+                type_=cls,
+            )
+        return build_checked_container(
+            cls, CheckedList, (cls.partial_cls,), iterable,
+        )
+
+    def _metaclass_lazy(cls):
+        raise_on_non_lazy_type(cls, abc.MutableSequence)
+        return derive_specialization(cls, lazy_checking=True)
+
+    def _metaclass_lazy_wrapper(cls):
+        if type_object(cls.partial_cls):
+            return build_lazy_wrapper(cls, LazySequence, (cls.partial_cls,))
+        else:
+            return build_lazy_wrapper(
+                cls, LazySequence, cls.partial_cls, len(cls.partial_cls),
+            )
+
 
 class SetGenerator(MagicTypeGenerator):
 
@@ -228,6 +602,49 @@ class SetGenerator(MagicTypeGenerator):
 
         return True
 
+    def _metaclass_lower(cls, sampling_policy=None):
+        if not cls.partial_cls:
+            return lower_container(cls, None)
+
+        sampling_policy = resolve_sampling_policy(
+            cls.sampling_policy, sampling_policy,
+        )
+        checker = lower_container(
+            cls,
+            lower_parallel_container(
+                cls, sampling_policy, (cls.partial_cls,),
+                lower_elements(
+                    lower_type(cls.partial_cls, sampling_policy),
+                    sampling_policy,
+                ),
+                iter,
+            ),
+        )
+        return lower_memoized_container(cls, sampling_policy, checker)
+
+    def _metaclass_sampled(cls, sampling_policy):
+        raise_on_non_sampling_policy(sampling_policy)
+        return derive_specialization(cls, sampling_policy=sampling_policy)
+
+    def _metaclass_memoized(cls):
+        return derive_specialization(cls, memoize=True)
+
+    def _metaclass_parallel(cls, min_size=None, chunk_size=None,
+                            workers=None, processes=False):
+        return parallelized(
+            cls, (cls.partial_cls,), min_size, chunk_size, workers, processes,
+        )
+
+    def _metaclass_checked(cls, iterable=()):
+        if not cls.partial_cls:
+            raise MagicSyntaxError(
+                'require Set[T].',
+                type_=cls,
+            )
+        return build_checked_container(
+            cls, CheckedSet, (cls.partial_cls,), iterable,
+        )
+
 
 class MappingGenerator(MagicTypeGenerator):
 
@@ -248,6 +665,54 @@ class MappingGenerator(MagicTypeGenerator):
                     return False
         return True
 
+    def _metaclass_lower(cls, sampling_policy=None):
+        if not cls.partial_cls:
+            return lower_container(cls, None)
+
+        sampling_policy = resolve_sampling_policy(
+            cls.sampling_policy, sampling_policy,
+        )
+        key_cls, val_cls = cls.partial_cls
+        return lower_container(
+            cls,
+            lower_parallel_container(
+                cls, sampling_policy, cls.partial_cls,
+                lower_items(
+                    lower_type(key_cls, sampling_policy),
+                    lower_type(val_cls, sampling_policy),
+                    sampling_policy,
+                ),
+                select_items,
+            ),
+        )
+
+    def _metaclass_sampled(cls, sampling_policy):
+        raise_on_non_sampling_policy(sampling_policy)
+        return derive_specialization(cls, sampling_policy=sampling_policy)
+
+    def _metaclass_parallel(cls, min_size=None, chunk_size=None,
+                            workers=None, processes=False):
+        return parallelized(
+            cls, cls.partial_cls, min_size, chunk_size, workers, processes,
+        )
+
+    def _metaclass_checked(cls, *args, **kwargs):
+        if not cls.partial_cls:
+            raise MagicSyntaxError(
+                'require Mapping[K, V].',
+                type_=cls,
+            )
+        return build_checked_container(
+            cls, CheckedDict, cls.partial_cls, *args, **kwargs
+        )
+
+    def _metaclass_lazy(cls):
+        raise_on_non_lazy_type(cls, abc.MutableMapping)
+        return derive_specialization(cls, lazy_checking=True)
+
+    def _metaclass_lazy_wrapper(cls):
+        return build_lazy_wrapper(cls, LazyMapping, cls.partial_cls)
+
 
 class IteratorGenerator(MagicTypeGenerator):
 
@@ -276,6 +741,12 @@ class IteratorGenerator(MagicTypeGenerator):
             # is Iterator and not Iterator[...].
             return True
 
+    def _metaclass_lower(cls, sampling_policy=None):
+        if cls.partial_cls:
+            return return_false
+        else:
+            return lower_container(cls, None)
+
     def _class___init__(self, iterator):
         if self.partial_cls is None:
             raise MagicTypeError(
@@ -346,6 +817,9 @@ class IteratorGenerator(MagicTypeGenerator):
                     type_=self.partial_cls,
                 )
 
+            # good case.
+            return element
+
 
 class IterableGenerator(MagicTypeGenerator):
 
@@ -373,6 +847,12 @@ class IterableGenerator(MagicTypeGenerator):
             # is Iterable and not Iterable[...].
             return True
 
+    def _metaclass_lower(cls, sampling_policy=None):
+        if cls.partial_cls:
+            return return_false
+        else:
+            return lower_container(cls, None)
+
     def _class___init__(self, iterable):
         if self.partial_cls is None:
             raise MagicTypeError(
@@ -421,6 +901,12 @@ class CallableGenerator(MagicTypeGenerator):
             # is callable and not Callable[T, ...].
             return True
 
+    def _metaclass_lower(cls, sampling_policy=None):
+        if cls.partial_cls:
+            return return_false
+        else:
+            return lower_container(cls, None)
+
     def _class___new__(cls, instance):
         # 1. not Callable.
         if not isinstance(instance, cls.main_cls):
@@ -470,6 +956,14 @@ class UnionGenerator(MagicTypeGenerator):
                 return True
         return False
 
+    def _metaclass_lower(cls, sampling_policy=None):
+        if cls.partial_cls is None:
+            return return_false
+
+        return lower_union([
+            lower_type(T, sampling_policy) for T in cls.partial_cls
+        ])
+
 
 class OptionalGenerator(MagicTypeGenerator):
 
@@ -488,6 +982,14 @@ class OptionalGenerator(MagicTypeGenerator):
         else:
             return isinstance(instance, cls.partial_cls)
 
+    def _metaclass_lower(cls, sampling_policy=None):
+        if cls.partial_cls is None:
+            return return_false
+
+        return lower_union([
+            (NoneType,), lower_type(cls.partial_cls, sampling_policy),
+        ])
+
 
 def dummy_class(name):
     return type(conditional_to_bytes(name), (object,), {})
@@ -540,7 +1042,41 @@ Union = UnionGenerator(dummy_class('Union'))
 Optional = OptionalGenerator(dummy_class('Optional'))
 NoneType = type(None)
 
-
+name_well_known_types(__name__, globals())
+
+
+from magic_constraints.compiler import (
+    lower_type,
+    lower_container,
+    lower_elements,
+    lower_fixed_elements,
+    lower_buffer_elements,
+    lower_fixed_buffer_elements,
+    lower_items,
+    lower_union,
+    lower_memoized_container,
+    build_checked_container,
+    build_lazy_wrapper,
+    compile_type,
+)  # noqa
+from magic_constraints.lazy import (
+    LazySequence,
+    LazyMapping,
+)  # noqa
+from magic_constraints.checked import (
+    CheckedList,
+    CheckedSet,
+    CheckedDict,
+)  # noqa
+from magic_constraints.sampling import (
+    raise_on_non_sampling_policy,
+    resolve_sampling_policy,
+    selects_nothing,
+)  # noqa
+from magic_constraints.parallel import (
+    make_parallel_options,
+    lower_parallel_elements,
+)  # noqa
 from magic_constraints.decorator import (
     function_constraints,
 )  # noqa
@@ -13,15 +13,6 @@ class CompoundArgument(object):
     pass
 
 
-class AttributesBinder(object):
-
-    def __init__(self, obj):
-        self.obj = obj
-
-    def __call__(self, attr, val):
-        setattr(self.obj, attr, val)
-
-
 def type_object(obj):
     return hasattr(obj, '__bases__')
 
@@ -72,6 +63,10 @@ def return_true(*args, **kwargs):
     return True
 
 
+def return_false(*args, **kwargs):
+    return False
+
+
 from magic_constraints.exception import (
     MagicTypeError,
 )  # noqa
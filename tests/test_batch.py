@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals,
+)
+from builtins import *                  # noqa
+from future.builtins.disabled import *  # noqa
+
+import pytest
+from magic_constraints import *  # noqa
+
+
+def test_check_batch():
+
+    @function_constraints(int, float, return_type=float)
+    def function(a, b=1.0):
+        return a + b
+
+    rows = [(i, 0.5) for i in range(100)]
+    assert [] == function.check_batch(rows)
+    assert [] == function.check_batch([])
+
+    rows[3] = ('3', 0.5)
+    rows[7] = (7, 7)
+    rows[9] = (9,)
+    rows[11] = (11, 0.5, 0.5)
+    rows[13] = ()
+    assert [3, 7, 11, 13] == function.check_batch(rows)
+    assert [0] == function.check_batch([(1, 'a'), (1,)])
+
+
+def test_map_checked():
+
+    @function_constraints(int, float, return_type=float)
+    def function(a, b=1.0):
+        return a + b
+
+    assert [1.5, 2.0, 2.5] == function.map_checked(
+        [(1, 0.5), (1,), (2, 0.5)],
+    )
+
+    with pytest.raises(MagicTypeError) as e:
+        function.map_checked([(1, 0.5), (2, 2), ('3', 0.5)])
+    assert [1, 2] == e.value.serialize()['indices']
+
+    @function_constraints(int, return_type=int)
+    def bad_return(a):
+        return a if a % 2 else str(a)
+
+    with pytest.raises(MagicTypeError) as e:
+        bad_return.map_checked([(i,) for i in range(5)])
+    assert [0, 2, 4] == e.value.serialize()['indices']
+
+
+def test_batch_with_compound():
+
+    @function_constraints(
+        Parameter('a', int),
+        Parameter('b', Sequence[int], default=(1,)),
+        ReturnType(int),
+    )
+    def function(args):
+        return args.a + sum(args.b)
+
+    assert [1] == function.check_batch([(1, [1]), (1, [1.5]), (1,)])
+    assert [2, 4] == function.map_checked([(1, [1]), (2, [1, 1])])
+
+
+def test_batch_with_non_identifier_name():
+
+    @function_constraints(
+        Parameter('a', int),
+        Parameter('not an identifier', int, default=1),
+    )
+    def function(args):
+        return args.a + getattr(args, 'not an identifier')
+
+    assert [] == function.check_batch([(1,), (1, 2)])
+    assert [1] == function.check_batch([(1,), (1.0,), (1, 2)])
+    assert [2, 3] == function.map_checked([(1,), (1, 2)])
+
+
+def test_batch_with_method():
+
+    class Example(object):
+
+        @method_constraints(int)
+        def method(self, a):
+            return a * 2
+
+    example = Example()
+    assert [1] == Example.method.check_batch([(example, 1), (example, '1')])
+    assert [2, 4] == example.method.map_checked([(example, 1), (example, 2)])
+
+
+def test_batch_with_deferred():
+
+    @function_constraints(Iterator[int], return_type=Iterator[int])
+    def function(iterator):
+        return iterator
+
+    assert [1] == function.check_batch([(iter([1]),), ([1],)])
+
+    result, = function.map_checked([(iter([1, '2']),)])
+    assert 1 == next(result)
+    with pytest.raises(MagicTypeError):
+        next(result)
+
+
+def test_batch_with_deferred_arguments():
+
+    @function_constraints(Iterator[int])
+    def consume(iterator):
+        return list(iterator)
+
+    with pytest.raises(MagicTypeError):
+        consume.map_checked([(iter([1]),), (iter([1, 'a']),)])
+    assert [[1], [2, 3]] == consume.map_checked(
+        [(iter([1]),), (iter([2, 3]),)],
+    )
+
+    @function_constraints(Callable[[int], int], Any)
+    def call(function, argument):
+        return function(argument)
+
+    assert [1] == call.map_checked([(lambda x: x, 1)])
+    with pytest.raises(MagicTypeError):
+        call.map_checked([(lambda x: x, 'x')])
+    with pytest.raises(MagicTypeError):
+        call.map_checked([(lambda x: str(x), 1)])
+
+
+def test_module_level_batch_functions():
+
+    @function_constraints(int, return_type=int)
+    def decorated(a):
+        return a + 1
+
+    def plain(a):
+        return a + 1
+
+    class Example(object):
+
+        def method(self, a):
+            return a + 1
+
+    example = Example()
+    assert [1] == check_batch(decorated, [(1,), ('1',)])
+    assert [2] == map_checked(decorated, [(1,)])
+    with pytest.raises(MagicTypeError):
+        map_checked(decorated, [('1',)])
+
+    assert [] == check_batch(plain, [(1,), ('1',)])
+    assert [2, 3] == map_checked(plain, [(1,), (2,)])
+    assert [2] == map_checked(example.method, [(example, 1)])
+
+
+def test_batch_functions_at_level_off():
+    set_checking_level('off', __name__)
+    try:
+        @function_constraints(int, return_type=int)
+        def function(a):
+            return a + 1
+    finally:
+        reset_checking_levels()
+
+    assert not hasattr(function, 'check_batch')
+    assert [] == check_batch(function, [('1',)])
+    assert [2] == map_checked(function, [(1,)])
+
+
+def test_batch_functions_built_on_first_call():
+
+    @function_constraints(int)
+    def function(a):
+        return a
+
+    check_batch = function.check_batch
+    assert [1] == check_batch([(1,), (1.0,)])
+    # replaced once built.
+    assert check_batch is not function.check_batch
+    built = function.check_batch
+    assert [1] == function.map_checked([(1,)])
+    assert built is function.check_batch
+    assert [0] == check_batch([(1.0,)])
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals,
+)
+from builtins import *                  # noqa
+from future.builtins.disabled import *  # noqa
+
+import copy
+import pytest
+from magic_constraints import *  # noqa
+
+
+def test_checked_list():
+    checked = MutableSequence[int].checked([1, 2])
+    assert [1, 2] == checked
+    assert MutableSequence[int] is checked.checked_type
+
+    checked.append(3)
+    checked.extend([4, 5])
+    checked.insert(0, 0)
+    checked[0] = 0
+    checked[1:3] = [1, 2]
+    checked += [6]
+    assert list(range(7)) == checked
+
+    for write in [
+        lambda: checked.append(1.0),
+        lambda: checked.extend([1, 1.0]),
+        lambda: checked.insert(0, None),
+        lambda: checked.__setitem__(0, 'a'),
+        lambda: checked.__setitem__(slice(0, 1), [1.0]),
+        lambda: checked.__iadd__([1.0]),
+    ]:
+        with pytest.raises(MagicTypeError):
+            write()
+    assert list(range(7)) == checked
+
+    with pytest.raises(MagicTypeError):
+        MutableSequence[int].checked([1.0])
+
+    assert copy.copy(checked) == checked
+    assert copy.copy(checked).checked_type is checked.checked_type
+
+
+def test_checked_set_and_dict():
+    checked = MutableSet[int].checked([1])
+    checked.add(2)
+    checked.update([3], {4})
+    checked |= {5}
+    checked ^= {5, 6}
+    assert {1, 2, 3, 4, 6} == checked
+    with pytest.raises(MagicTypeError):
+        checked.add(1.0)
+    with pytest.raises(MagicTypeError):
+        checked |= {1.0}
+
+    checked = MutableMapping[str, int].checked({'a': 1}, b=2)
+    checked['c'] = 3
+    checked.update({'d': 4}, e=5)
+    checked.setdefault('f', 6)
+    assert 1 == checked.setdefault('a', 1.0)
+    assert 6 == len(checked)
+    with pytest.raises(MagicTypeError):
+        checked['g'] = 1.0
+    with pytest.raises(MagicTypeError):
+        checked.update({1: 1})
+    with pytest.raises(MagicTypeError):
+        checked.setdefault('h')
+    with pytest.raises(MagicSyntaxError):
+        checked.fromkeys(['i'], 1)
+    with pytest.raises(MagicSyntaxError):
+        type(checked).fromkeys(['i'], 1)
+
+
+def test_checked_accepted_without_scan():
+    checked = MutableSequence[int].checked([1, 2])
+    assert isinstance(checked, MutableSequence[int])
+    assert isinstance(checked, Sequence[int])
+
+    # writes bypassing the checking are not seen.
+    list.append(checked, 1.0)
+    assert isinstance(checked, Sequence[int])
+    assert not isinstance(checked, Sequence[float])
+    assert not isinstance(checked, ImmutableSequence[int])
+
+    checked = MutableMapping[str, int].checked()
+    dict.__setitem__(checked, 1, 1)
+    assert isinstance(checked, Mapping[str, int])
+
+    @function_constraints(Sequence[int])
+    def example(values):
+        return values
+
+    checked = MutableSequence[int].checked()
+    list.append(checked, 1.0)
+    assert example(checked) is checked
+
+
+def test_checked_invalid():
+    with pytest.raises(MagicSyntaxError):
+        MutableSequence.checked([])
+    with pytest.raises(MagicSyntaxError):
+        Sequence[int, int].checked([1, 2])
+    with pytest.raises(MagicSyntaxError):
+        ImmutableSequence[int].checked([])
+    with pytest.raises(MagicSyntaxError):
+        MutableSequence[Sequence[int]].checked([])
+    with pytest.raises(MagicSyntaxError):
+        MutableMapping.checked()
+
+    assert [[1]] == MutableSequence[Any].checked([[1]])
+    assert [1, None] == MutableSequence[Optional[int]].checked([1, None])
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals,
+)
+from builtins import *                  # noqa
+from future.builtins.disabled import *  # noqa
+
+import pytest
+from magic_constraints import *  # noqa
+
+
+def test_native_binding():
+
+    @function_constraints(
+        int, float, int, Optional[int],
+    )
+    def example(a, b, c=42, d=None):
+        return a, b, c, d
+
+    assert (1, 1.0, 42, None) == example(1, 1.0)
+    assert (1, 1.0, 42, None) == example(b=1.0, a=1)
+    assert (1, 1.0, 0, 2) == example(1, 1.0, d=2, c=0)
+    assert (1, 1.0, 0, 2) == example(1, 1.0, 0, 2)
+
+    with pytest.raises(MagicSyntaxError):
+        example()
+    with pytest.raises(MagicSyntaxError):
+        example(1, 1.0, 0, 2, 3)
+    with pytest.raises(MagicSyntaxError):
+        example(1, 1.0, e=1)
+    with pytest.raises(MagicSyntaxError):
+        example(1, 1.0, a=1)
+
+    with pytest.raises(MagicTypeError):
+        example(1, 1.0, d=1.0)
+
+    assert 'example' == example.__name__
+
+
+def test_no_parameters():
+
+    @function_constraints(return_type=int)
+    def example():
+        return 42
+
+    assert 42 == example()
+    with pytest.raises(MagicSyntaxError):
+        example(1)
+
+
+def test_compound_with_non_identifier_names():
+
+    @function_constraints(
+        Parameter('foo-bar', int),
+        Parameter('class', int, default=0),
+    )
+    def example(args):
+        return getattr(args, 'foo-bar'), getattr(args, 'class')
+
+    assert (1, 0) == example(1)
+    assert (1, 2) == example(1, 2)
+    with pytest.raises(MagicSyntaxError):
+        example()
+    with pytest.raises(MagicTypeError):
+        example(1.0)
+
+
+def test_compound_binds_deferred_wrapper():
+
+    @function_constraints(
+        Parameter('iterator', Iterator[int]),
+    )
+    def example(args):
+        return list(args.iterator)
+
+    with pytest.raises(MagicTypeError):
+        example(iter([1.0]))
+
+
+def test_validator_in_wrapper():
+
+    @function_constraints(
+        Parameter('a', int, validator=lambda a: a > 0),
+        ReturnType(int, validator=lambda ret: ret < 10),
+    )
+    def example(args):
+        return args.a
+
+    assert 1 == example(1)
+    with pytest.raises(MagicTypeError):
+        example(0)
+    with pytest.raises(MagicTypeError):
+        example(10)
+
+
+def test_skip_return_check():
+    from magic_constraints.codegen import (
+        BIND_POSITIONAL,
+        generate_arguments_wrapper,
+    )
+    from magic_constraints.constraint import build_constraints_package
+
+    def example(a):
+        return a
+
+    package = build_constraints_package([
+        Parameter('a', Any),
+        ReturnType(int),
+    ])
+    wrapper = generate_arguments_wrapper(
+        example, package, False, BIND_POSITIONAL,
+    )
+    with pytest.raises(MagicTypeError):
+        wrapper(1.0)
+
+    # the flag decides, whatever the plan.
+    wrapper = generate_arguments_wrapper(
+        example, package._replace(skip_return_check=True),
+        False, BIND_POSITIONAL,
+    )
+    assert 1.0 == wrapper(1.0)
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals,
+)
+from builtins import *                  # noqa
+from future.builtins.disabled import *  # noqa
+
+import pytest
+
+import magic_constraints
+from magic_constraints import *  # noqa
+from magic_constraints.compiler import lower_type
+from magic_constraints.utils import return_true
+
+
+def test_compile_plain():
+    check = compile_type(int)
+    assert check(1)
+    assert not check(1.0)
+
+    assert magic_constraints.compile is compile_type
+    assert compile_type(Any) is return_true
+
+    with pytest.raises(TypeError):
+        compile_type(1)
+
+
+def test_lower():
+    assert lower_type(int) == (int,)
+    assert lower_type(Any) is None
+    # Any branches are removed.
+    assert lower_type(Union[int, Any]) is None
+    # plain classes are merged.
+    assert lower_type(Union[int, float]) == (int, float)
+    assert lower_type(Optional[int]) == (NoneType, int)
+    assert lower_type(Optional[Union[int, float]]) == (NoneType, int, float)
+
+
+def test_compile_nested():
+    check = compile_type(Sequence[Mapping[str, Optional[int]]])
+    assert check([{'a': 1, 'b': None}, {}])
+    assert check(())
+    assert not check([{'a': 1.0}])
+    assert not check([{1: 1}])
+    assert not check([[]])
+    assert not check({})
+
+    check = compile_type(Mapping[str, Any])
+    assert check({'a': [], 'b': None})
+    assert not check({1: None})
+
+    check = compile_type(Mapping[Any, Sequence[int]])
+    assert check({1: [1], 'a': ()})
+    assert not check({1: [1.0]})
+
+    check = compile_type(Set[Union[int, Sequence[int]]])
+    assert check({1, (1, 2)})
+    assert not check({1, (1.0, 2)})
+
+
+def test_compile_fixed_tuple():
+    check = compile_type(Sequence[int, Sequence[str]])
+    assert check([1, ['a']])
+    assert check((1, ()))
+    assert not check([1])
+    assert not check([1, ['a'], 2])
+    assert not check([1, [1]])
+
+
+def test_compile_unspecialized():
+    assert compile_type(Sequence)([])
+    assert not compile_type(Sequence)(1)
+    assert compile_type(ImmutableSequence)(())
+    assert not compile_type(ImmutableSequence)([])
+
+    assert compile_type(Iterator)(iter([]))
+    assert not compile_type(Iterator[int])(iter([]))
+    assert not compile_type(Union)(1)
+    assert not compile_type(Optional)(None)
+
+
+def test_compile_matches_isinstance():
+    types_and_values = [
+        (Sequence[int], [[1, 2], [1, 2.0], (), 1]),
+        (MutableSequence[float], [[1.0], (1.0,), []]),
+        (ImmutableSet[int], [frozenset([1]), {1}, frozenset([1.0])]),
+        (Mapping[str, Union[int, float]], [{'a': 1.0}, {'a': 'b'}, []]),
+        (Optional[Sequence[int]], [None, [1], [None]]),
+    ]
+    for type_, values in types_and_values:
+        check = compile_type(type_)
+        for value in values:
+            assert check(value) == type_.check_instance(value)
+
+
+def test_homogeneous_fast_path():
+    size = 100
+
+    check = compile_type(Sequence[int])
+    assert check(list(range(size)))
+    assert not check(list(range(size)) + [1.0])
+    # bool is a subclass of int.
+    assert check([True] * size)
+
+    check = compile_type(Set[Union[int, str]])
+    assert check(set(range(size)) | set(map(str, range(size))))
+    assert not check(set(range(size)) | {0.5})
+
+    check = compile_type(Mapping[str, float])
+    assert check(dict((str(i), float(i)) for i in range(size)))
+    assert not check(dict((i, float(i)) for i in range(size)))
+    assert not check(dict((str(i), i) for i in range(size)))
+
+
+def test_homogeneous_fast_path_fallback():
+    size = 100
+
+    class Proxy(object):
+
+        @property
+        def __class__(self):
+            return int
+
+    # isinstance holds through __class__, not through type.
+    assert isinstance(Proxy(), int)
+    assert compile_type(Sequence[int])([Proxy()] * size)
+
+    class Meta(type):
+
+        def __instancecheck__(cls, instance):
+            return instance == 42
+
+    Answer = Meta(str('Answer'), (object,), {})
+
+    check = compile_type(Sequence[Answer])
+    assert check([42] * size)
+    assert not check([42] * size + [1])
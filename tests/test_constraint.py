@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals,
+)
+from builtins import *                  # noqa
+from future.builtins.disabled import *  # noqa
+
+from magic_constraints import *  # noqa
+from magic_constraints.constraint import (
+    ConstraintsPackage,
+    build_constraints_package,
+)
+
+
+def test_check_plan():
+    def positive(n):
+        return n > 0
+
+    package = build_constraints_package([
+        Parameter('a', Any),
+        Parameter('b', Optional[int]),
+        Parameter('c', Sequence[int]),
+        Parameter('d', int, validator=positive),
+        Parameter('e', Iterator[int]),
+    ])
+    assert isinstance(package, ConstraintsPackage)
+
+    a, b, c, d, e = package.parameter_plans
+
+    assert a.checker is None and a.classes is None
+    assert a.deferred_wrapper is None
+
+    assert b.classes == (NoneType, int)
+    assert b.checker(None) and not b.checker(1.0)
+
+    assert c.classes is None
+    assert c.checker([1]) and not c.checker([1.0])
+
+    assert d.classes is None
+    assert d.checker(1) and not d.checker(0)
+
+    assert e.checker is None
+    assert e.deferred_wrapper is Iterator[int]
+
+    assert package.skip_return_check
+
+
+def test_return_plan():
+    package = build_constraints_package([
+        Parameter('a', int),
+        ReturnType(float),
+    ])
+    assert package.return_plan.classes is float
+    assert not package.skip_return_check
+
+
+def test_lazy_repr():
+    parameter = Parameter('a', Sequence[int], default=[1])
+    assert parameter._arguments_repr is None
+
+    arguments_repr = parameter.arguments_repr()
+    assert 'name=' in arguments_repr and 'default=' in arguments_repr
+    assert arguments_repr is parameter._arguments_repr
+    assert arguments_repr in repr(parameter)
+    assert 'ReturnType(type_=' in repr(ReturnType(int))
+
+
+def test_slots():
+    for constraint in [Parameter('a', int), ReturnType(int)]:
+        assert not hasattr(constraint, '__dict__')
+
+
+def test_check_instance_follows_default_sampling_policy():
+    parameter = Parameter('a', Sequence[int])
+    assert not parameter.check_instance([1, 1.0])
+    try:
+        set_default_sampling_policy(First(1))
+        assert parameter.check_instance([1, 1.0])
+        assert isinstance([1, 1.0], Sequence[int])
+    finally:
+        set_default_sampling_policy(None)
+    assert not parameter.check_instance([1, 1.0])
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals,
+)
+from builtins import *                  # noqa
+from future.builtins.disabled import *  # noqa
+
+import pytest
+from magic_constraints import *  # noqa
+
+
+def test_lazy_sequence():
+
+    @function_constraints(Sequence[int].lazy())
+    def example(values):
+        return values
+
+    view = example([1, 2, 'a', 4])
+    assert 4 == len(view)
+    assert 1 == view[0]
+    assert 4 == view[-1]
+    assert [1, 2] == view[:2]
+    with pytest.raises(MagicTypeError):
+        view[2]
+    with pytest.raises(MagicTypeError):
+        list(view)
+    with pytest.raises(MagicTypeError):
+        view[1:]
+
+    # the container is checked eagerly.
+    with pytest.raises(MagicTypeError):
+        example({1: 1})
+
+    assert 'Sequence[int].lazy()' == repr(Sequence[int].lazy())
+    # isinstance checks every element.
+    assert not isinstance([1, 'a'], Sequence[int].lazy())
+
+
+def test_lazy_fixed_sequence():
+
+    @function_constraints(ImmutableSequence[int, str].lazy())
+    def example(values):
+        return values
+
+    view = example((1, 2))
+    assert 1 == view[0]
+    with pytest.raises(MagicTypeError):
+        view[1]
+    with pytest.raises(MagicTypeError):
+        view[-1]
+
+    with pytest.raises(MagicTypeError):
+        example((1, 'a', 2))
+    with pytest.raises(MagicTypeError):
+        example([1, 'a'])
+
+
+def test_lazy_mapping():
+
+    @function_constraints(
+        Parameter('records', Mapping[str, int].lazy()),
+        Parameter('key', str),
+    )
+    def lookup(args):
+        return args.records[args.key]
+
+    records = dict((str(i), i) for i in range(1000))
+    records['bad'] = 'bad'
+    records[1] = 1
+
+    assert 42 == lookup(records, '42')
+    with pytest.raises(MagicTypeError):
+        lookup(records, 'bad')
+    with pytest.raises(KeyError):
+        lookup(records, 'missing')
+
+    @function_constraints(Mapping[str, int].lazy())
+    def example(values):
+        return values
+
+    view = example(records)
+    assert 1002 == len(view)
+    assert '1' in view
+    assert 1 == view.get('1')
+    assert None is view.get('missing')
+    with pytest.raises(MagicTypeError):
+        view[1]
+    with pytest.raises(MagicTypeError):
+        list(view.items())
+
+
+def test_lazy_eager_cases():
+
+    @function_constraints(
+        Parameter('values', Sequence[int].lazy(), validator=len),
+        ReturnType(Sequence[int].lazy()),
+    )
+    def example(args):
+        return args.values
+
+    # arguments with validator and return values are checked eagerly.
+    assert [1] == example([1])
+    with pytest.raises(MagicTypeError):
+        example([1.0])
+
+    with pytest.raises(MagicSyntaxError):
+        MutableSequence[int].lazy()
+    with pytest.raises(MagicSyntaxError):
+        MutableMapping[str, int].lazy()
+    with pytest.raises(MagicSyntaxError):
+        Sequence.lazy()
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals,
+)
+from builtins import *                  # noqa
+from future.builtins.disabled import *  # noqa
+
+import threading
+
+import pytest
+from magic_constraints import *  # noqa
+from magic_constraints.trampoline import PENDING_BUILDS, generate_trampoline
+
+
+def setup_function(function):
+    PENDING_BUILDS.clear()
+
+
+def teardown_function(function):
+    set_lazy_decoration(False)
+
+
+def test_lazy_option():
+
+    @function_constraints(int, return_type=int, lazy=True)
+    def example(a):
+        return a
+
+    assert 'example' == example.__name__
+    assert 1 == len(PENDING_BUILDS)
+
+    assert 1 == example(1)
+    assert 0 == len(PENDING_BUILDS)
+    with pytest.raises(MagicTypeError):
+        example(1.0)
+
+    @function_constraints(int, return_type=int, lazy=False)
+    def eager(a):
+        return a
+
+    assert 0 == len(PENDING_BUILDS)
+
+
+def test_declaration_error_on_first_call():
+
+    # the default is not an int.
+    @function_constraints(int, lazy=True)
+    def example(a=1.0):
+        return a
+
+    with pytest.raises(MagicTypeError):
+        example(1)
+    with pytest.raises(MagicTypeError):
+        example(1)
+
+
+def test_lazy_switch():
+    set_lazy_decoration(True)
+
+    @function_constraints(
+        Parameter('a', int),
+        ReturnType(int),
+    )
+    def compound(args):
+        return args.a
+
+    @function_constraints(Ellipsis, return_type=int)
+    def return_only(a):
+        return a
+
+    class Example(object):
+
+        @method_constraints(int)
+        def method(self, a):
+            return a
+
+    assert 3 == len(PENDING_BUILDS)
+    assert 1 == compound(1)
+    assert 1 == return_only(1)
+    assert 1 == Example().method(1)
+    with pytest.raises(MagicTypeError):
+        compound(1.0)
+    with pytest.raises(MagicTypeError):
+        return_only(1.0)
+    with pytest.raises(MagicTypeError):
+        Example().method(1.0)
+
+    # lazy= wins.
+    @function_constraints(int, lazy=False)
+    def eager(a):
+        return a
+
+    assert 0 == len(PENDING_BUILDS)
+
+
+def test_lazy_class_initialization():
+    set_lazy_decoration(True)
+
+    @class_initialization_constraints
+    class Example(object):
+
+        INIT_PARAMETERS = [
+            Parameter('a', int),
+        ]
+
+    trampoline = Example.__init__
+    assert 1 == Example(1).a
+    # replaced once built.
+    assert trampoline is not Example.__init__
+    with pytest.raises(MagicTypeError):
+        Example(1.0)
+
+
+def test_lazy_batch_functions():
+
+    @function_constraints(int, return_type=int, lazy=True)
+    def example(a):
+        return a + 1
+
+    assert [2, 3] == example.map_checked([(1,), (2,)])
+    assert [1] == example.check_batch([(1,), (1.0,)])
+
+
+def test_warmup():
+    set_lazy_decoration(True)
+
+    @function_constraints(int)
+    def first(a):
+        return a
+
+    @function_constraints(int)
+    def second(a):
+        return a
+
+    assert 2 == warmup()
+    assert 0 == warmup()
+    with pytest.raises(MagicTypeError):
+        first(1.0)
+
+
+def test_warmup_failures():
+    set_lazy_decoration(True)
+
+    functions = []
+    for _ in range(5):
+        @function_constraints(int)
+        def valid(a):
+            return a
+        functions.append(valid)
+
+    @function_constraints(int, float)
+    def invalid(a):
+        return a
+
+    with pytest.raises(MagicError) as e:
+        warmup()
+    assert 5 == e.value.serialize()['built']
+    assert 1 == len(e.value.serialize()['errors'])
+    assert 0 == len(PENDING_BUILDS)
+    assert 0 == warmup()
+
+    for function in functions:
+        with pytest.raises(MagicTypeError):
+            function(1.0)
+    # raises again on the first call.
+    with pytest.raises(MagicSyntaxError):
+        invalid(1)
+
+
+def test_concurrent_first_calls():
+    builds = []
+
+    def function(a):
+        return a
+
+    def build():
+        builds.append(None)
+        return function
+
+    trampoline, _ = generate_trampoline(function, build, lambda wrapper: None)
+
+    barrier = threading.Event()
+    results = []
+
+    def call():
+        barrier.wait()
+        results.append(trampoline(1))
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    barrier.set()
+    for thread in threads:
+        thread.join()
+
+    assert [1] * 8 == results
+    assert 1 == len(builds)
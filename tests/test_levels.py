@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals,
+)
+from builtins import *                  # noqa
+from future.builtins.disabled import *  # noqa
+
+import os
+import pytest
+from magic_constraints import *  # noqa
+from magic_constraints.levels import LEVEL_ENVIRON, parse_checking_levels
+
+
+def teardown_function(function):
+    reset_checking_levels()
+
+
+def test_parse_levels():
+    assert {'': 'full'} == parse_checking_levels('')
+    assert {'': 'off', 'a.b': 'full', 'c': 'sampled'} ==\
+        parse_checking_levels(' off, a.b=full ,c = sampled')
+
+    with pytest.raises(MagicSyntaxError):
+        parse_checking_levels('fast')
+    with pytest.raises(MagicSyntaxError):
+        set_checking_level('fast')
+
+
+def test_resolve_level():
+    set_checking_level('off')
+    set_checking_level('sampled', 'a')
+    set_checking_level('full', 'a.b')
+
+    assert 'off' == get_checking_level('x')
+    assert 'off' == get_checking_level(None)
+    assert 'sampled' == get_checking_level('a')
+    assert 'sampled' == get_checking_level('a.bc')
+    assert 'full' == get_checking_level('a.b')
+    assert 'full' == get_checking_level('a.b.c')
+
+
+def test_environ(monkeypatch):
+    monkeypatch.setitem(os.environ, LEVEL_ENVIRON, 'boundary,a=off')
+    reset_checking_levels()
+    assert 'boundary' == get_checking_level('x')
+    assert 'off' == get_checking_level('a.b')
+
+    monkeypatch.delitem(os.environ, LEVEL_ENVIRON)
+    reset_checking_levels()
+    assert 'full' == get_checking_level('a.b')
+
+
+def test_level_off():
+    set_checking_level('off', __name__)
+
+    def function(a):
+        return a
+
+    assert function is function_constraints(int)(function)
+    assert function is function_constraints(..., return_type=int)(function)
+    assert function is method_constraints(int)(function)
+
+    # arguments are still bound.
+    @function_constraints(Parameter('a', int))
+    def compound(args):
+        return args.a
+
+    assert 1.0 == compound(1.0)
+
+    @class_initialization_constraints
+    class Example(object):
+
+        INIT_PARAMETERS = [Parameter('a', int)]
+
+    assert 1.0 == Example(1.0).a
+
+    # levels are resolved at decoration time.
+    set_checking_level('full', __name__)
+    assert 1.0 == compound(1.0)
+    with pytest.raises(MagicTypeError):
+        function_constraints(Parameter('a', int))(compound)(1.0)
+
+
+def test_level_boundary_and_sampled():
+    set_checking_level('boundary', __name__)
+
+    @function_constraints(Sequence[int])
+    def boundary(values):
+        return values
+
+    assert [1.0] == boundary([1.0])
+    with pytest.raises(MagicTypeError):
+        boundary(1)
+
+    set_checking_level('sampled', __name__)
+
+    @function_constraints(Sequence[int])
+    def sampled(values):
+        return values
+
+    sampled([1] * 100 + [1.0])
+    with pytest.raises(MagicTypeError):
+        sampled([1.0])
+
+    # sampling given to the decorator wins.
+    @function_constraints(Sequence[int], sampling=Full())
+    def full(values):
+        return values
+
+    with pytest.raises(MagicTypeError):
+        full([1] * 100 + [1.0])
+
+
+def test_level_boundary_fixed_length():
+    set_checking_level('boundary', __name__)
+
+    @function_constraints(Sequence[int, float])
+    def boundary(values):
+        return values
+
+    assert ('a', 'b') == boundary(('a', 'b'))
+    # the length is still checked.
+    with pytest.raises(MagicTypeError):
+        boundary((1,))
+
+    set_checking_level('sampled', __name__)
+
+    @function_constraints(Sequence[int, float])
+    def sampled(values):
+        return values
+
+    with pytest.raises(MagicTypeError):
+        sampled(('a', 'b'))
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals,
+)
+from builtins import *                  # noqa
+from future.builtins.disabled import *  # noqa
+
+import gc
+
+import pytest
+from magic_constraints import *  # noqa
+from magic_constraints.memo import deeply_immutable
+
+
+def setup_function(function):
+    clear_memo()
+
+
+def teardown_function(function):
+    set_memo_max_size(1024, 2 ** 20)
+    clear_memo()
+
+
+def test_deeply_immutable():
+    assert deeply_immutable((1, 'a', None, 1.0))
+    assert deeply_immutable(frozenset([(1, 2), (3, ())]))
+    assert not deeply_immutable((1, [2]))
+    assert not deeply_immutable(((1, [2]),))
+    assert not deeply_immutable([1])
+
+
+def test_memoized():
+    T = ImmutableSequence[ImmutableSequence[int]].memoized()
+    assert T is ImmutableSequence[ImmutableSequence[int]].memoized()
+    assert 'ABCImmutable[ABCImmutable[int]].memoized()' == repr(T)
+
+    value = tuple((i, i + 1) for i in range(10))
+    assert isinstance(value, T)
+    assert isinstance(value, T)
+    assert (1, 1, 1) == get_memo_stats()[:3]
+
+    # not memoized by default.
+    assert isinstance(value, ImmutableSequence[ImmutableSequence[int]])
+    assert 1 == get_memo_stats().hits
+
+    # rejected values are not recorded.
+    assert not isinstance(((1.0,),), T)
+    assert 1 == get_memo_stats().size
+
+    @function_constraints(T)
+    def example(value):
+        return value
+
+    example(value)
+    assert 2 == get_memo_stats().hits
+
+
+def test_memoized_transitive_immutability():
+    T = ImmutableSequence[Any].memoized()
+
+    value = (1, [2])
+    assert isinstance(value, T)
+    assert isinstance(value, T)
+    assert 0 == get_memo_stats().hits
+    assert 0 == get_memo_stats().size
+
+    # sampled checks are recorded apart.
+    sampled = T.sampled(First(1))
+    assert isinstance((1, 2), T)
+    assert isinstance((1, 2), sampled)
+    assert 0 == get_memo_stats().hits
+    assert 2 == get_memo_stats().size
+
+    # held weakly.
+    value = frozenset([1])
+    assert isinstance(value, ImmutableSet[int].memoized())
+    assert 3 == get_memo_stats().size
+
+
+def test_memo_size_cap():
+    T = ImmutableSequence[int].memoized()
+    values = [(i,) for i in range(10)]
+
+    set_memo_max_size(4)
+    for value in values:
+        assert isinstance(value, T)
+    assert 4 == get_memo_stats().size
+
+    # the latest entries are kept.
+    assert isinstance(values[-1], T)
+    assert 1 == get_memo_stats().hits
+
+    set_memo_max_size(0)
+    assert 0 == get_memo_stats().size
+    assert isinstance(values[-1], T)
+    assert 0 == get_memo_stats().size
+
+    with pytest.raises(MagicSyntaxError):
+        set_memo_max_size(-1)
+
+    with pytest.raises(MagicSyntaxError):
+        ImmutableSequence.memoized()
+
+
+def test_memo_element_cap():
+    T = ImmutableSequence[Any].memoized()
+    values = [tuple(range(10)) for _ in range(4)]
+
+    set_memo_max_size(1024, 25)
+    for value in values:
+        assert isinstance(value, T)
+    # the oldest entries are evicted.
+    assert 2 == get_memo_stats().size
+    assert 20 == get_memo_stats().elements
+
+    # nested elements count.
+    assert isinstance(((1, 2), (3,)), T)
+    assert 3 == get_memo_stats().size
+    assert 25 == get_memo_stats().elements
+
+    # larger than the cap, not recorded.
+    assert isinstance(tuple(range(26)), T)
+    assert 3 == get_memo_stats().size
+
+    clear_memo()
+    assert 0 == get_memo_stats().elements
+
+    with pytest.raises(MagicSyntaxError):
+        set_memo_max_size(1024, -1)
+
+
+def test_memo_weak_references():
+    T = ImmutableSet[int].memoized()
+
+    value = frozenset(range(10))
+    assert isinstance(value, T)
+    assert isinstance(value, T)
+    assert 1 == get_memo_stats().hits
+    assert 10 == get_memo_stats().elements
+
+    # not held by the memo.
+    del value
+    gc.collect()
+    assert 0 == get_memo_stats().size
+    assert 0 == get_memo_stats().elements
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals,
+)
+from builtins import *                  # noqa
+from future.builtins.disabled import *  # noqa
+
+import pytest
+from magic_constraints import *  # noqa
+from magic_constraints.metrics import (
+    FUNCTION_METRICS,
+    format_prometheus_metrics,
+)
+
+
+def setup_function(function):
+    set_metrics_enabled(True)
+
+
+def teardown_function(function):
+    set_metrics_enabled(False)
+    FUNCTION_METRICS.clear()
+
+
+def metrics_named(suffix):
+    for name, metrics in get_metrics_snapshot().items():
+        if name.endswith(suffix):
+            return metrics
+    return None
+
+
+def test_metrics_disabled():
+    set_metrics_enabled(False)
+
+    @function_constraints(int)
+    def not_recorded(a):
+        return a
+
+    not_recorded(1)
+    assert metrics_named('not_recorded') is None
+
+
+def test_metrics_of_function():
+
+    @function_constraints(int, return_type=int)
+    def function(a):
+        return a if a else 'zero'
+
+    function(1)
+    function(2)
+    with pytest.raises(MagicTypeError):
+        function('1')
+    with pytest.raises(MagicTypeError):
+        function(0)
+    with pytest.raises(MagicSyntaxError):
+        function(1, 2)
+
+    metrics = metrics_named('function')
+    assert 5 == metrics['calls']
+    assert {'MagicTypeError': 2, 'MagicSyntaxError': 1} ==\
+        metrics['failures']
+    for phase in ('arguments', 'body', 'return'):
+        assert 0 < metrics['total_ns'][phase]
+        assert metrics['max_ns'][phase] <= metrics['total_ns'][phase]
+
+    reset_metrics()
+    assert 0 == metrics_named('function')['calls']
+
+
+def test_metrics_of_raising_body():
+
+    @function_constraints(int)
+    def raising(a):
+        raise ValueError(a)
+
+    @function_constraints(Ellipsis, return_type=int)
+    def raising_only_return(a):
+        raise KeyError(a)
+
+    @class_initialization_constraints
+    class Raising(object):
+
+        INIT_PARAMETERS = [Parameter('a', int)]
+
+        def __init__(self):
+            raise ValueError(self.a)
+
+    for function, exception in [
+        (raising, ValueError),
+        (raising_only_return, KeyError),
+        (Raising, ValueError),
+    ]:
+        for i in range(3):
+            with pytest.raises(exception):
+                function(i)
+
+    assert {'ValueError': 3} == metrics_named('raising')['failures']
+    assert 3 == metrics_named('raising')['calls']
+    assert {'KeyError': 3} ==\
+        metrics_named('raising_only_return')['failures']
+    assert {'ValueError': 3} == metrics_named('Raising.__init__')['failures']
+
+
+def test_metrics_of_other_paths():
+
+    @function_constraints(
+        Parameter('a', int),
+        ReturnType(int),
+    )
+    def compound(args):
+        return args.a
+
+    @function_constraints(Ellipsis, return_type=int)
+    def only_return(a):
+        return a
+
+    @class_initialization_constraints
+    class Example(object):
+
+        INIT_PARAMETERS = [Parameter('a', int)]
+
+    compound(1)
+    only_return(1)
+    with pytest.raises(MagicTypeError):
+        only_return(1.0)
+    Example(1)
+
+    assert 1 == metrics_named('compound')['calls']
+    assert {'MagicTypeError': 1} == metrics_named('only_return')['failures']
+    assert 1 == metrics_named('Example.__init__')['calls']
+
+
+def test_prometheus_export(tmpdir):
+
+    @function_constraints(int)
+    def exported(a):
+        return a
+
+    exported(1)
+    with pytest.raises(MagicTypeError):
+        exported('1')
+
+    path = tmpdir.join('magic_constraints.prom')
+    write_prometheus_metrics(str(path))
+    text = path.read()
+    assert text == format_prometheus_metrics()
+    assert '# TYPE magic_constraints_calls_total counter' in text
+    assert 'magic_constraints_calls_total{function="' in text
+    assert 'exported",exception="MagicTypeError"} 1' in text
+    assert 'exported",phase="body"}' in text
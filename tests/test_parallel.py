@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals,
+)
+from builtins import *                  # noqa
+from future.builtins.disabled import *  # noqa
+
+import pytest
+from magic_constraints import *  # noqa
+from magic_constraints.parallel import ParallelFailure
+
+
+def teardown_module(module):
+    shutdown_parallel_executors()
+
+
+def test_parallel_sequence():
+    T = Sequence[float].parallel(min_size=10, chunk_size=7, workers=2)
+    assert T is Sequence[float].parallel(min_size=10, chunk_size=7, workers=2)
+
+    assert isinstance([1.0] * 100, T)
+    # serial path.
+    assert not isinstance([1] * 5, T)
+
+    values = [1.0] * 100
+    values[50] = 'x'
+    assert not isinstance(values, T)
+    assert ParallelFailure(7, 50, 'x') == get_parallel_failure()
+
+    with pytest.raises(MagicSyntaxError):
+        Sequence[int, float].parallel()
+    with pytest.raises(MagicSyntaxError):
+        Sequence[int].parallel(min_size=0)
+
+
+def test_parallel_set_and_mapping():
+    T = Set[int].parallel(min_size=10, workers=2)
+    assert isinstance(set(range(100)), T)
+    assert not isinstance(set(range(99)) | {0.5}, T)
+    assert 0.5 == get_parallel_failure().element
+
+    T = Mapping[str, int].parallel(min_size=10, workers=2)
+    mapping = {str(i): i for i in range(100)}
+    assert isinstance(mapping, T)
+    mapping['x'] = 'x'
+    assert not isinstance(mapping, T)
+    assert ('x', 'x') == get_parallel_failure().element
+
+
+def test_parallel_processes():
+    T = Mapping[str, int].parallel(min_size=10, workers=2, processes=True)
+    mapping = {str(i): i for i in range(100)}
+    assert isinstance(mapping, T)
+    mapping['x'] = 1.0
+    assert not isinstance(mapping, T)
+    assert ('x', 1.0) == get_parallel_failure().element
+
+
+def test_parallel_parameter():
+
+    @function_constraints(Sequence[int].parallel(min_size=10, workers=2))
+    def function(values):
+        return len(values)
+
+    assert 100 == function(list(range(100)))
+
+    with pytest.raises(MagicTypeError) as e:
+        function([0] * 20 + ['x'])
+    failure = e.value.serialize()['parallel_failure']
+    assert (20, 'x') == (failure.index, failure.element)
+
+
+def test_parallel_failure_not_reused():
+    T = Sequence[int].parallel(min_size=10, workers=2)
+
+    @function_constraints(T)
+    def function(values):
+        return len(values)
+
+    @function_constraints(Sequence[int])
+    def serial(values):
+        return len(values)
+
+    # 1. cleared by the next check.
+    assert not isinstance([0] * 20 + ['x'], T)
+    assert not isinstance(['y'], T)
+    assert get_parallel_failure() is None
+    with pytest.raises(MagicTypeError) as e:
+        function(['y'])
+    assert 'parallel_failure' not in e.value.serialize()
+
+    # 2. not reported for another value, even checked by another type.
+    assert not isinstance([0] * 20 + ['x'], T)
+    with pytest.raises(MagicTypeError) as e:
+        serial(['y'])
+    assert 'parallel_failure' not in e.value.serialize()
+
+
+def test_parallel_stops_slicing():
+
+    class Counted(list):
+
+        def __iter__(self):
+            self.read = 0
+            for element in list.__iter__(self):
+                self.read += 1
+                yield element
+
+    T = Sequence[int].parallel(min_size=10, chunk_size=10, workers=1)
+    values = Counted([1] * 100000)
+    values[0] = 'x'
+    assert not isinstance(values, T)
+    assert 0 == get_parallel_failure().index
+    # the chunks in flight at most.
+    assert values.read <= 100
+
+
+def test_chunk_checkers_bounded():
+    import gc
+    import weakref
+    from magic_constraints.parallel import (
+        CHUNK_CHECKERS,
+        CHUNK_CHECKERS_MAX_SIZE,
+        check_chunk,
+    )
+
+    class Dynamic(object):
+        pass
+
+    ref = weakref.ref(Dynamic)
+    assert check_chunk((Sequence[Dynamic],), [[Dynamic()]]) is None
+    del Dynamic
+
+    for _ in range(CHUNK_CHECKERS_MAX_SIZE):
+        check_chunk((type(str('Other'), (object,), {}),), [1])
+    assert CHUNK_CHECKERS_MAX_SIZE == len(CHUNK_CHECKERS)
+    # 1. collect Sequence[Dynamic]. 2. collect Dynamic.
+    gc.collect()
+    gc.collect()
+    assert ref() is None
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals,
+)
+from builtins import *                  # noqa
+from future.builtins.disabled import *  # noqa
+
+import pickle
+import pytest
+from magic_constraints import *  # noqa
+from magic_constraints.types import SequenceGenerator
+
+
+def reload(obj):
+    return pickle.loads(pickle.dumps(obj, pickle.HIGHEST_PROTOCOL))
+
+
+@function_constraints(Sequence[int], return_type=int)
+def total(values):
+    return sum(values)
+
+
+def test_pickle_types():
+    for T in [
+        Sequence,
+        Any,
+        Sequence[int],
+        ImmutableSequence[Union[int, float]],
+        Mapping[str, Optional[int]],
+        Callable[[int], int],
+        Optional[Sequence[Mapping[str, float]]],
+        Sequence[int].sampled(First(3)).memoized(),
+        Mapping[str, int].lazy(),
+        Set[int].parallel(processes=True),
+    ]:
+        assert reload(T) is T
+
+    # not bound to a module-level name.
+    with pytest.raises(pickle.PicklingError):
+        pickle.dumps(SequenceGenerator(list))
+
+
+def test_pickle_constraints():
+    parameter = reload(Parameter('a', Sequence[int], default=[1]))
+    assert 'a' == parameter.name
+    assert Sequence[int] is parameter.type_
+    assert [1] == parameter.default
+    assert parameter.check_instance([2])
+    assert not parameter.check_instance([2.0])
+
+    return_type = reload(ReturnType(Mapping[str, int]))
+    assert return_type.check_instance({'a': 1})
+    assert not return_type.check_instance({'a': 1.0})
+
+
+def test_pickle_checked_and_decorated():
+    samples = reload(MutableSequence[int].checked([1, 2]))
+    assert [1, 2] == samples
+    with pytest.raises(MagicTypeError):
+        samples.append(1.0)
+
+    assert total is reload(total)
+    assert 3 == reload(total)([1, 2])
+
+
+def test_parallel_processes_with_magic_types():
+    T = Sequence[Mapping[str, float]].parallel(
+        min_size=10, workers=2, processes=True,
+    )
+    rows = [{'a': 1.0}] * 50
+    assert isinstance(rows, T)
+    assert not isinstance(rows + [{'a': 1}], T)
+    assert 50 == get_parallel_failure().index
+    shutdown_parallel_executors()
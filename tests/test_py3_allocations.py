@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals,
+)
+from builtins import *                  # noqa
+from future.builtins.disabled import *  # noqa
+
+import gc
+import tracemalloc
+
+import pytest
+from magic_constraints import *  # noqa
+
+
+# Per-call allocation budgets, in bytes at the high-water mark of a call.
+# See benchmarks/bench_allocations.py for the figures. The budgets leave
+# room for differences between Python versions, a call exceeding one has
+# started allocating something new.
+@function_constraints(int, float, return_type=float)
+def positional(a, b=1.0):
+    return b
+
+
+@function_constraints(
+    Parameter('a', int),
+    Parameter('b', float, default=1.0),
+    ReturnType(float),
+)
+def compound(args):
+    return args.b
+
+
+@function_constraints
+def inspection(a: int, b: float = 1.0) -> float:
+    return b
+
+
+@function_constraints(..., return_type=float)
+def return_only(a, b=1.0):
+    return b
+
+
+@function_constraints(Iterator[int])
+def deferred(iterator):
+    return iterator
+
+
+class Example(object):
+
+    @method_constraints(int, float, return_type=float)
+    def method(self, a, b=1.0):
+        return b
+
+
+@class_initialization_constraints
+class Initialized(object):
+
+    INIT_PARAMETERS = [
+        Parameter('a', int),
+        Parameter('b', float, default=1.0),
+    ]
+
+
+EXAMPLE = Example()
+VALUES = list(range(1000))
+MAPPING = dict((str(i), i) for i in range(1000))
+
+# (name, call, budget).
+CASES = [
+    ('positional', lambda: positional(1, 1.0), 128),
+    ('positional/keyword', lambda: positional(1, b=1.0), 256),
+    ('positional/default', lambda: positional(1), 256),
+    ('compound', lambda: compound(1, 1.0), 256),
+    ('inspection', lambda: inspection(1, 1.0), 128),
+    ('return_only', lambda: return_only(1, 1.0), 128),
+    ('method', lambda: EXAMPLE.method(1, 1.0), 128),
+    ('class_initialization', lambda: Initialized(1, 1.0), 512),
+    ('deferred', lambda: deferred(iter(())), 512),
+    (
+        'isinstance/Sequence[int]',
+        lambda: isinstance(VALUES, Sequence[int]),
+        1024,
+    ),
+    (
+        'isinstance/Mapping[str, int]',
+        lambda: isinstance(MAPPING, Mapping[str, int]),
+        1024,
+    ),
+]
+
+
+def peak_bytes(call, repeat=11):
+    peaks = []
+    for _ in range(repeat):
+        tracemalloc.start()
+        call()
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return sorted(peaks)[repeat // 2]
+
+
+CASE_NAMES = [case[0] for case in CASES]
+
+
+@pytest.mark.parametrize(
+    'call,budget', [case[1:] for case in CASES], ids=CASE_NAMES,
+)
+def test_allocation_budget(call, budget):
+    # warm up the caches.
+    call()
+    call()
+    assert peak_bytes(call) <= budget
+
+
+@pytest.mark.parametrize(
+    'call', [case[1] for case in CASES], ids=CASE_NAMES,
+)
+def test_no_retained_allocations(call):
+    call()
+    only_magic_constraints = [
+        tracemalloc.Filter(True, '*magic_constraints*'),
+    ]
+
+    tracemalloc.start()
+    gc.collect()
+    before = tracemalloc.take_snapshot().filter_traces(only_magic_constraints)
+    for _ in range(100):
+        call()
+    gc.collect()
+    after = tracemalloc.take_snapshot().filter_traces(only_magic_constraints)
+    tracemalloc.stop()
+
+    assert 0 == sum(
+        stat.count_diff for stat in after.compare_to(before, 'filename')
+    )
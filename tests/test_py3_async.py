@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals,
+)
+from builtins import *                  # noqa
+from future.builtins.disabled import *  # noqa
+
+import asyncio
+import inspect
+
+import pytest
+from magic_constraints import *  # noqa
+
+
+def run(coroutine):
+    return asyncio.get_event_loop().run_until_complete(coroutine)
+
+
+def test_coroutine_function():
+
+    @function_constraints(int, return_type=int)
+    async def example(a):
+        await asyncio.sleep(0)
+        return a
+
+    assert inspect.iscoroutinefunction(example)
+    assert 1 == run(example(1))
+
+    # arguments are checked before awaiting the function.
+    awaited = []
+
+    @function_constraints(int)
+    async def record(a):
+        awaited.append(a)
+
+    with pytest.raises(MagicTypeError):
+        run(record(1.0))
+    assert not awaited
+
+    @function_constraints(int, return_type=int)
+    async def bad_return(a):
+        return float(a)
+
+    coroutine = bad_return(1)
+    with pytest.raises(MagicTypeError):
+        run(coroutine)
+
+
+def test_coroutine_annotation_and_compound():
+
+    @function_constraints
+    async def annotated(a: int) -> Sequence[int]:
+        return [a]
+
+    assert [1] == run(annotated(1))
+    with pytest.raises(MagicTypeError):
+        run(annotated('a'))
+
+    @function_constraints(
+        Parameter('a', int),
+        ReturnType(int),
+    )
+    async def compound(args):
+        return args.a
+
+    assert 1 == run(compound(1))
+
+    @function_constraints(..., return_type=int)
+    async def only_return(*args):
+        return len(args)
+
+    assert inspect.iscoroutinefunction(only_return)
+    assert 2 == run(only_return(1, 2))
+
+
+def test_coroutine_method():
+
+    class Example(object):
+
+        @method_constraints(int, return_type=int)
+        async def method(self, a):
+            return a + 1
+
+    assert 2 == run(Example().method(1))
+    with pytest.raises(MagicTypeError):
+        run(Example().method(1.0))
+
+
+async def produce(*elements):
+    for element in elements:
+        yield element
+
+
+async def consume(async_iterable):
+    return [element async for element in async_iterable]
+
+
+def test_async_iterator():
+    assert isinstance(produce(), AsyncIterator)
+    assert not isinstance(produce(), AsyncIterator[int])
+    assert 'AsyncIterator[int]' == repr(AsyncIterator[int])
+
+    assert [1, 2] == run(consume(AsyncIterator[int](produce(1, 2))))
+    with pytest.raises(MagicTypeError):
+        run(consume(AsyncIterator[int](produce(1, 'a'))))
+
+    # fixed length.
+    T = AsyncIterator[int, str]
+    assert [1, 'a'] == run(consume(T(produce(1, 'a'))))
+    with pytest.raises(MagicTypeError):
+        run(consume(T(produce(1, 2))))
+    with pytest.raises(MagicIndexError):
+        run(consume(T(produce(1))))
+    with pytest.raises(MagicIndexError):
+        run(consume(T(produce(1, 'a', 2))))
+
+    with pytest.raises(MagicTypeError):
+        AsyncIterator[int]([1])
+    with pytest.raises(MagicTypeError):
+        AsyncIterator(produce())
+
+
+def test_async_iterator_batched():
+    T = AsyncIterator[int].batched(4)
+    assert T is AsyncIterator[int].batched(4)
+    assert 'AsyncIterator[int].batched(4)' == repr(T)
+
+    elements = list(range(10))
+    assert elements == run(consume(T(produce(*elements))))
+    assert [] == run(consume(T(produce())))
+
+    # the chunk in error is reported on its first element.
+    consumed = []
+
+    async def consume_until_error():
+        async for element in T(produce(*(elements[:5] + ['a']))):
+            consumed.append(element)
+
+    with pytest.raises(MagicTypeError):
+        run(consume_until_error())
+    assert [0, 1, 2, 3] == consumed
+
+    T = AsyncIterator[int, str, int].batched(2)
+    assert [1, 'a', 2] == run(consume(T(produce(1, 'a', 2))))
+    with pytest.raises(MagicIndexError):
+        run(consume(T(produce(1, 'a'))))
+    with pytest.raises(MagicIndexError):
+        run(consume(T(produce(1, 'a', 2, 3))))
+
+    with pytest.raises(MagicSyntaxError):
+        AsyncIterator[int].batched(0)
+
+
+def test_async_iterable():
+
+    class Numbers(object):
+
+        def __aiter__(self):
+            return produce(1, 2, 3).__aiter__()
+
+    assert [1, 2, 3] == run(consume(AsyncIterable[int](Numbers())))
+    assert [1, 2, 3] == run(consume(
+        AsyncIterable[int].batched(2)(Numbers()),
+    ))
+    with pytest.raises(MagicTypeError):
+        run(consume(AsyncIterable[str](Numbers())))
+
+
+def test_async_deferred_parameter():
+
+    @function_constraints(AsyncIterator[int], return_type=int)
+    async def total(numbers):
+        return sum([number async for number in numbers])
+
+    assert 3 == run(total(produce(1, 2)))
+    with pytest.raises(MagicTypeError):
+        run(total(produce(1, 2.0)))
+    with pytest.raises(MagicTypeError):
+        run(total([1, 2]))
+
+    @function_constraints(AsyncIterable[int].batched(64))
+    async def count(numbers):
+        return len([number async for number in numbers])
+
+    assert 100 == run(count(produce(*range(100))))
+
+
+def test_async_return():
+
+    @function_constraints(int, return_type=AsyncIterator[int])
+    async def count(n):
+        for i in range(n):
+            yield i
+        yield 'end'
+
+    async def consume_count():
+        elements = []
+        async for element in count(2):
+            elements.append(element)
+        return elements
+
+    with pytest.raises(MagicTypeError):
+        run(consume_count())
+
+    @function_constraints(return_type=Iterator[int])
+    async def coroutine_returns_iterator():
+        return iter([1, 'a'])
+
+    it = run(coroutine_returns_iterator())
+    assert 1 == next(it)
+    with pytest.raises(MagicTypeError):
+        next(it)
+
+
+def test_lazy_coroutine_function():
+
+    @function_constraints(int, return_type=int, lazy=True)
+    async def example(a):
+        await asyncio.sleep(0)
+        return a
+
+    assert inspect.iscoroutinefunction(example)
+    assert example.map_checked is None
+    assert 1 == run(example(1))
+    with pytest.raises(MagicTypeError):
+        run(example(1.0))
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals,
+)
+from builtins import *                  # noqa
+from future.builtins.disabled import *  # noqa
+
+from magic_constraints.signature import (
+    signature_from_code,
+    signature_from_native,
+)
+
+
+def test_keyword_only():
+
+    def example(a: int, *args, b: float = 1.0, c, **kwargs) -> int:
+        pass
+
+    assert signature_from_native(example) == signature_from_code(example)
+
+    def example(a, *, b=1.0):
+        pass
+
+    assert signature_from_native(example) == signature_from_code(example)
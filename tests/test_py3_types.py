@@ -5,6 +5,9 @@ from __future__ import (
 from builtins import *                  # noqa
 from future.builtins.disabled import *  # noqa
 
+import sys
+import collections.abc
+
 from magic_constraints import *  # noqa
 
 
@@ -14,3 +17,41 @@ def test_callable_ellipsis():
     c1_wrapper2 = Callable[..., Any](c1)
     c1_wrapper2(42, 42)
     c1_wrapper2(42, 42.0)
+
+
+def test_buffer():
+    import array
+
+    doubles = array.array('d', [1.0, 2.0])
+    assert isinstance(doubles, Sequence[float])
+    assert isinstance(doubles, MutableSequence[float])
+    assert not isinstance(doubles, Sequence[int])
+    assert isinstance(array.array('d'), Sequence[int])
+    assert isinstance(array.array('u', 'ab'), Sequence[str])
+    assert isinstance(doubles, Sequence)
+    assert not isinstance(doubles, ImmutableSequence)
+    assert not isinstance(doubles, ImmutableSequence[float])
+    if sys.version_info < (3, 10):
+        # the ABCs of the standard library are left untouched.
+        assert not isinstance(doubles, collections.abc.MutableSequence)
+
+    assert isinstance(b'ab', Sequence[int])
+    assert isinstance(bytearray(b'ab'), MutableSequence[int])
+    assert not isinstance(b'ab', Sequence[bytes])
+
+    view = memoryview(array.array('i', [1, 2]))
+    assert isinstance(view, Sequence[int])
+    assert isinstance(view, Sequence[Union[int, float]])
+    assert not isinstance(view, Sequence[float])
+    assert isinstance(view.cast('B').cast('?'), Sequence[bool])
+    assert isinstance(memoryview(b'ab').cast('c'), Sequence[bytes])
+
+    # fixed length.
+    assert isinstance(doubles, Sequence[float, float])
+    assert not isinstance(doubles, Sequence[float, float, float])
+    assert not isinstance(doubles, Sequence[float, int])
+
+    # compiled checkers agree with the interpreter.
+    for value in [doubles, b'ab', view, bytearray()]:
+        for type_ in [Sequence[int], Sequence[float], Sequence[int, int]]:
+            assert isinstance(value, type_) == type_.check_instance(value)
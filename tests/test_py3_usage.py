@@ -44,3 +44,14 @@ def test_ellipsis():
     func2(1)
     with pytest.raises(TypeError):
         func2(1.0)
+
+
+def test_inspection_with_sampling():
+
+    @function_constraints(sampling=First(1))
+    def func(a: Sequence[int]) -> Sequence[int]:
+        return a
+
+    func([1, 1.0])
+    with pytest.raises(TypeError):
+        func([1.0, 1])
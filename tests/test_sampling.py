@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals,
+)
+from builtins import *                  # noqa
+from future.builtins.disabled import *  # noqa
+
+import pytest
+from magic_constraints import *  # noqa
+
+
+def test_policy_selection():
+    elements = list(range(10))
+
+    assert elements == list(Full().select(elements))
+    assert [0, 1, 2] == list(First(3).select(elements))
+    assert [0, 4, 8] == list(Stride(4).select(elements))
+
+    sampled = list(Random(3, seed=1).select(elements))
+    assert 3 == len(sampled)
+    assert sorted(sampled) == sampled
+    assert sampled == list(Random(3, seed=1).select(elements))
+    # non-indexable input.
+    assert 3 == len(list(Random(3).select(iter(elements))))
+    assert elements == list(Random(20).select(elements))
+
+    assert 10 == Full().inspected(elements)
+    assert 3 == First(3).inspected(elements)
+    assert 3 == Stride(4).inspected(elements)
+    assert 3 == Random(3).inspected(elements)
+
+    with pytest.raises(MagicSyntaxError):
+        First(-1)
+    with pytest.raises(MagicSyntaxError):
+        Stride(0)
+
+
+def test_sampled_specialization():
+    sampled = Sequence[int].sampled(First(2))
+
+    assert sampled is Sequence[int].sampled(First(2))
+    assert sampled is not Sequence[int]
+    assert sampled is not Sequence[int].sampled(First(3))
+    assert 'Sequence[int].sampled(First(size=2))' == repr(sampled)
+
+    assert isinstance([1, 2, 1.0], sampled)
+    assert not isinstance([1, 1.0], sampled)
+    assert not isinstance([1, 2, 1.0], Sequence[int])
+
+    # Full is the same as no sampling.
+    assert not isinstance([1, 2, 1.0], Sequence[int].sampled(Full()))
+
+    assert isinstance({1, 2, 3}, Set[int].sampled(First(0)))
+    assert isinstance(
+        {1: 1, 2: 1.0},
+        Mapping[int, int].sampled(Stride(10)),
+    ) == isinstance({1: 1}, Mapping[int, int])
+
+    # nested types inherit the policy of the outer type.
+    nested = Sequence[Sequence[int]].sampled(First(1))
+    assert isinstance([[1, 1.0], 1.0], nested)
+
+    # fixed-length sequences sample the positions.
+    fixed = Sequence[int, int, int]
+    assert isinstance([1, 1.0, 1.0], fixed.sampled(First(1)))
+    assert not isinstance([1.0, 1, 1.0], fixed.sampled(Stride(2)))
+    assert isinstance([1, 1.0, 1], fixed.sampled(Stride(2)))
+    assert isinstance(['a', 'b', 'c'], fixed.sampled(First(0)))
+    assert not isinstance(['a', 'b'], fixed.sampled(First(0)))
+
+    with pytest.raises(MagicSyntaxError):
+        Sequence.sampled(First(1))
+    with pytest.raises(MagicSyntaxError):
+        Sequence[int].sampled(1)
+
+
+def test_default_sampling_policy():
+    assert get_default_sampling_policy() is None
+    try:
+        set_default_sampling_policy(First(1))
+        assert isinstance([1, 1.0], Sequence[int])
+        # own policy overrides the default.
+        assert not isinstance([1, 1.0], Sequence[int].sampled(Full()))
+    finally:
+        set_default_sampling_policy(None)
+
+    assert not isinstance([1, 1.0], Sequence[int])
+
+    with pytest.raises(MagicSyntaxError):
+        set_default_sampling_policy(1)
+
+
+def test_decorator_sampling():
+
+    @function_constraints(Sequence[int], sampling=First(1))
+    def example(values):
+        return values
+
+    assert [1, 1.0] == example([1, 1.0])
+    with pytest.raises(MagicTypeError) as exc_info:
+        example([1.0] * 10)
+
+    details = exc_info.value.serialize()
+    assert First(1) == details['sampling_policy']
+    assert 1 == details['inspected']
+
+    @function_constraints(Sequence[int])
+    def unsampled(values):
+        return values
+
+    with pytest.raises(MagicTypeError) as exc_info:
+        unsampled([1.0])
+    assert 'sampling_policy' not in exc_info.value.serialize()
+
+    with pytest.raises(MagicSyntaxError):
+        function_constraints(Sequence[int], sample=First(1))
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+from __future__ import (
+    division, absolute_import, print_function, unicode_literals,
+)
+from builtins import *                  # noqa
+from future.builtins.disabled import *  # noqa
+
+from functools import wraps
+
+from magic_constraints.signature import (
+    SigParameter,
+    SIGNATURE_CACHE,
+    signature_of,
+    signature_from_code,
+    signature_from_native,
+)
+
+
+def example(a, b, c=1, *args, **kwargs):
+    pass
+
+
+example.__annotations__ = {'a': int, 'c': int, 'return': float}
+
+
+def test_signature_from_code():
+    function_signature = signature_from_code(example)
+    assert function_signature == signature_from_native(example)
+
+    a, b, c, args, kwargs = function_signature.parameters
+    assert ('a', int, SigParameter.empty) == (a.name, a.annotation, a.default)
+    assert SigParameter.empty is b.annotation
+    assert 1 == c.default
+    assert SigParameter.VAR_POSITIONAL == args.kind
+    assert SigParameter.VAR_KEYWORD == kwargs.kind
+    assert float is function_signature.return_annotation
+
+
+def test_signature_cache():
+    SIGNATURE_CACHE.clear()
+
+    def factory(default):
+        def function(a=default):
+            pass
+        return function
+
+    one = factory(1)
+    assert signature_of(one) is signature_of(factory(1))
+    assert 1 == len(SIGNATURE_CACHE)
+
+    # 1 == True, defaults are keyed by id.
+    assert True is signature_of(factory(True)).parameters[0].default
+    assert 1 == signature_of(one).parameters[0].default
+
+
+def test_native_signature():
+
+    @wraps(example)
+    def wrapper(*args, **kwargs):
+        pass
+
+    # __wrapped__ is followed on Python 3.
+    assert signature_from_native(wrapper) == signature_of(wrapper)
+
+    class Example(object):
+
+        def method(self, a):
+            pass
+
+    parameters = signature_of(Example().method).parameters
+    assert ['a'] == [parameter.name for parameter in parameters]
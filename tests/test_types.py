@@ -172,6 +172,10 @@ def test_iterator():
     )
 
 
+def test_iterator_elements():
+    assert [1, 2] == list(Iterator[int](iter([1, 2])))
+
+
 def test_iterable():
     assert isinstance([1, 2, 3], Iterable)
     assert not isinstance(1, Iterable)
@@ -310,3 +314,73 @@ def test_corner_cases():
 
     assert not isinstance(1, Optional)
     assert not issubclass(int, Optional)
+
+
+def test_interning():
+    assert Sequence[int] is Sequence[int]
+    assert Sequence[int, float] is Sequence[int, float]
+    assert Sequence[int] is not Sequence[int, ]
+    assert Mapping[str, Sequence[int]] is Mapping[str, Sequence[int]]
+    assert Callable[[int], Any] is Callable[[int], Any]
+    assert Sequence[int] is not MutableSequence[int]
+
+    # list should not be confused with tuple.
+    Sequence[int, int]
+    with pytest.raises(TypeError):
+        Sequence[[int, int]]
+
+    assert repr(Sequence[int]) is repr(Sequence[int])
+
+
+def test_interning_dynamic_class():
+    import gc
+    import weakref
+
+    class Foo(object):
+        pass
+
+    assert Sequence[Foo] is Sequence[Foo]
+    assert isinstance([Foo()], Sequence[Foo])
+
+    ref = weakref.ref(Foo)
+    del Foo
+    # 1. collect Sequence[Foo], which drops the cache entry.
+    # 2. collect Foo.
+    gc.collect()
+    gc.collect()
+    assert ref() is None
+
+
+def test_subclass_check_memo():
+    import gc
+    import weakref
+    import collections as abc
+
+    class Foo(object):
+
+        def __len__(self):
+            return 0
+
+        def __getitem__(self, i):
+            raise IndexError
+
+    assert not isinstance(Foo(), Sequence)
+    assert not isinstance(Foo(), ImmutableSequence)
+
+    # register() invalidates the memoized verdicts.
+    abc.Sequence.register(Foo)
+    assert isinstance(Foo(), Sequence)
+    assert issubclass(Foo, ImmutableSequence)
+    assert isinstance(Foo(), ImmutableSequence)
+
+    abc.MutableSequence.register(Foo)
+    assert not isinstance(Foo(), ImmutableSequence)
+    assert not issubclass(Foo, ImmutableSequence.main_cls)
+
+    _, cache = vars(Sequence)['subclass_check_cache']
+    assert Foo in cache
+
+    ref = weakref.ref(Foo)
+    del Foo
+    gc.collect()
+    assert ref() is None
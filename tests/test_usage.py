@@ -275,6 +275,52 @@ def test_defered_checking():
         func3(iter([1, 2.0, 3]))
 
 
+def test_lazy_return_iterator():
+
+    @function_constraints(int, return_type=Iterator[int])
+    def count(n):
+        for i in range(n):
+            yield i
+        yield 'end'
+
+    it = count(3)
+    # elements are checked while consumed.
+    assert [0, 1, 2] == [next(it) for _ in range(3)]
+    with pytest.raises(TypeError):
+        next(it)
+
+    @function_constraints(return_type=Iterator[int, int])
+    def pair():
+        return iter([1, 2])
+
+    assert [1, 2] == list(pair())
+
+    @function_constraints(
+        Parameter('n', int),
+        ReturnType(Iterable[int]),
+    )
+    def numbers(args):
+        return range(args.n)
+
+    assert [0, 1] == list(numbers(2))
+    assert [0, 1] == list(numbers(2))
+
+    @function_constraints(Iterable[int], return_type=int)
+    def total(values):
+        return sum(values)
+
+    assert 3 == total([1, 2])
+    with pytest.raises(TypeError):
+        total([1, 2.0])
+
+    @function_constraints(..., return_type=Iterator[int])
+    def not_iterator():
+        return [1]
+
+    with pytest.raises(TypeError):
+        not_iterator()
+
+
 def test_ellipsis():
 
     @function_constraints(Ellipsis)